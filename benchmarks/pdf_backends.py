@@ -0,0 +1,65 @@
+"""
+Compara o tempo de leitura dos extratos em PDF com os backends "tabula" e "text".
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.pdf_backends [pasta_base]
+"""
+
+import shutil
+import sys
+import time
+
+from src.etl.extract.application_account_statement import (
+    extract_pdf_application_account_statement_data,
+)
+from src.etl.extract.current_account_statement import (
+    extract_pdf_current_account_statement_data,
+)
+from src.utils.cache import set_extract_cache_enabled
+from src.utils.file_paths import list_files_by_prefix_suffix
+
+
+def time_call(func, *args, **kwargs) -> tuple[float, object]:
+    """
+    Executa a função e retorna o tempo decorrido (s) e o resultado.
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main(base_dir: str = "data/raw") -> None:
+    # Mede a leitura real dos arquivos, não o cache de extração
+    set_extract_cache_enabled(False)
+
+    backends = ["text"]
+    if shutil.which("java"):
+        backends.insert(0, "tabula")
+    else:
+        print("Java não encontrado: apenas o backend 'text' será medido.\n")
+
+    cases = [
+        ("Extrato_Conta_Corrente.pdf", extract_pdf_current_account_statement_data),
+        ("Extrato_Conta_Aplicação.pdf", extract_pdf_application_account_statement_data),
+    ]
+    for suffix, extract in cases:
+        paths = sorted(list_files_by_prefix_suffix(base_dir, suffix=suffix))
+        totals = dict.fromkeys(backends, 0.0)
+        for path in paths:
+            results = {}
+            for backend in backends:
+                elapsed, results[backend] = time_call(extract, path, backend=backend)
+                totals[backend] += elapsed
+            if len(results) > 1 and not results["tabula"].equals(results["text"]):
+                print(f"DIVERGÊNCIA entre backends em {path}")
+
+        print(f"{suffix} ({len(paths)} arquivos)")
+        for backend, total in totals.items():
+            print(
+                f"    {backend:<7} total {total:7.2f} s"
+                f"  | por arquivo {total / max(len(paths), 1):6.3f} s"
+            )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,150 @@
+"""
+Mede transform_pdf_current_account_statement_data em extratos sintéticos de
+10 mil, 100 mil e 1 milhão de linhas e confere o resultado com a versão
+anterior (baseada em df.apply), executada até --legacy-max-rows linhas.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.transform_current_account [--legacy-max-rows N]
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.etl.schema import apply_ledger_schema
+from src.etl.transform.current_account_statement import (
+    APPLICATION_HISTORIES,
+    transform_pdf_current_account_statement_data,
+)
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+HISTORIES = [
+    "Saldo Anterior",
+    "RECEBIMENTO DE ICMS",
+    "FPE/FPM",
+    "Pagamento de Boleto",
+    "TED Transf.Eletr.Disponiv",
+] + APPLICATION_HISTORIES
+
+
+def make_synthetic_statement(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Gera um extrato bruto sintético no formato da extração em PDF, com linhas
+    de detalhe (sem data) e de cabeçalho/rodapé (sem INF) misturadas.
+
+    Parâmetros:
+        n_rows (int): Número de linhas.
+        seed (int, opcional): Semente do gerador aleatório.
+
+    Retorna:
+        pd.DataFrame: Extrato bruto com as colunas da extração em PDF.
+    """
+    rng = np.random.default_rng(seed)
+
+    dates = pd.Timestamp("2020-01-01") + pd.to_timedelta(
+        np.sort(rng.integers(0, 5 * 365, n_rows)), unit="D"
+    )
+    cents = rng.integers(1, 10**10, n_rows)
+    valor = pd.Series(cents / 100).map("{:,.2f}".format)
+    valor = valor.str.replace(",", "_").str.replace(".", ",").str.replace("_", ".")
+
+    df = pd.DataFrame(
+        {
+            "DATA": dates.strftime("%d/%m/%Y"),
+            "AG_O": "0000",
+            "LOTE": "14011",
+            "COD_HIST": rng.integers(100, 999, n_rows).astype(str),
+            "HIST": rng.choice(HISTORIES, n_rows),
+            "DOC": rng.integers(1, 10**6, n_rows).astype(str),
+            "VALOR": valor,
+            "INF": rng.choice(["C", "D", None], n_rows, p=[0.45, 0.45, 0.10]),
+            "SALDO": None,
+        }
+    )
+
+    # Linhas de detalhe: sem data, texto livre em HIST
+    is_detail = rng.random(n_rows) < 0.2
+    df.loc[is_detail, "DATA"] = None
+    df.loc[is_detail, "HIST"] = "DETALHE " + df.loc[is_detail, "DOC"]
+    return df
+
+
+def legacy_transform(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Versão anterior da transformação (linha a linha), mantida como referência.
+    """
+    df = df.loc[(df.INF == "C") | (df.INF == "D")]
+    df.loc[df.DATA.isna(), "DET_HIST"] = df.loc[df.DATA.isna(), "HIST"]
+    df.DET_HIST = df.DET_HIST.shift(-1)
+    df = df.loc[~df.DATA.isna()]
+    df.index = pd.to_datetime(df.DATA, dayfirst=True)
+    df.drop(columns="DATA", inplace=True)
+    df.VALOR = df.VALOR.str.replace(".", "").str.replace(",", ".").astype(float)
+    df = df.loc[df.HIST != "Saldo Anterior"]
+    df.VALOR = df.apply(
+        lambda row: row.VALOR * -1 if row.INF == "D" else row.VALOR, axis=1
+    )
+    df["VALOR_APP"] = df.apply(
+        lambda row: row.VALOR if row.HIST in APPLICATION_HISTORIES else 0, axis=1
+    )
+    df.VALOR = df.apply(
+        lambda row: 0 if row.HIST in APPLICATION_HISTORIES else row.VALOR, axis=1
+    )
+    df = df[
+        [
+            "AG_O",
+            "DOC",
+            "LOTE",
+            "COD_HIST",
+            "HIST",
+            "VALOR_APP",
+            "VALOR",
+            "INF",
+            "SALDO",
+            "DET_HIST",
+        ]
+    ]
+    df.SALDO = 0
+    return df
+
+
+def time_call(func, *args) -> tuple[float, object]:
+    """
+    Executa a função e retorna o tempo decorrido (s) e o resultado.
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(legacy_max_rows: int = 100_000) -> None:
+    print(f"{'linhas':>10} | {'vetorizada':>10} | {'anterior':>10} | ganho")
+    for n_rows in SIZES:
+        raw = make_synthetic_statement(n_rows)
+        elapsed, result = time_call(transform_pdf_current_account_statement_data, raw)
+
+        if n_rows > legacy_max_rows:
+            print(f"{n_rows:>10,} | {elapsed:>9.3f}s | {'-':>10} | -")
+            continue
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            legacy_elapsed, expected = time_call(legacy_transform, raw.copy())
+        # A versão anterior não aplicava o esquema compacto (valores em reais)
+        pd.testing.assert_frame_equal(
+            result, apply_ledger_schema(expected, unit="reais")
+        )
+        print(
+            f"{n_rows:>10,} | {elapsed:>9.3f}s | {legacy_elapsed:>9.3f}s"
+            f" | {legacy_elapsed / elapsed:5.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--legacy-max-rows", type=int, default=100_000)
+    main(parser.parse_args().legacy_max_rows)
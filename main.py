@@ -1,6 +1,328 @@
-def main():
-    print("Hello from cacs-fundeb-analysis!")
+"""
+Linha de comando dos pipelines do projeto, para execuções sem notebook
+(ex.: agendadas no cron).
+
+Uso (a partir da raiz do projeto):
+    python main.py bank --year 2025 --opening-balance 16545059.40 --jobs 2
+    python main.py bank --year 2025 --opening-balance 16545059.40 --incremental
+    python main.py bank --year 2025 --month 8
+    python main.py fnde --file <planilha.xls> --uf AP --year 2025
+    python main.py creditor --year 2025 --bimester 4 --incremental
+    python main.py monthly --year 2025 --bimester 4
+    python main.py re --year 2025 --profile
+
+Os módulos dos pipelines (pandas, pyarrow e, na extração, tabula) só são
+importados depois da leitura dos argumentos, dentro de cada comando: --help e
+erros de uso respondem de imediato.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+
+# --- COMANDOS ---
+def run_bank(args: argparse.Namespace) -> None:
+    """
+    Extrato bancário. Com --bimester/--month, fecha os meses no extrato
+    incremental (processed/extrato_bancário/); senão processa o ano inteiro,
+    pelo executor incremental (--incremental) ou do zero.
+    """
+    months = _selected_months(args)
+    if months:
+        from src.etl.pipeline.bank_statement import (
+            run_bank_statement_incremental_pipeline,
+        )
+
+        for month in months:
+            period = run_bank_statement_incremental_pipeline(
+                year=args.year,
+                month=month,
+                opening_balance=args.opening_balance,
+                base_dir=args.base_dir,
+            )
+            print(f"{args.year}-{month:02d}: {len(period)} lançamentos")
+    elif args.incremental:
+        _run_flow(
+            args,
+            "bank",
+            opening_balance=_required(args, "opening_balance"),
+            year=args.year,
+            jobs=args.jobs,
+        )
+    else:
+        from src.etl.pipeline.bank_statement import run_bank_statement_pipeline
+
+        bank_statement = run_bank_statement_pipeline(
+            opening_balance=_required(args, "opening_balance"),
+            year=args.year,
+            base_dir=args.base_dir,
+            jobs=args.jobs,
+        )
+        print(f"Extrato bancário: {len(bank_statement)} lançamentos")
+
+
+def run_fnde(args: argparse.Namespace) -> None:
+    """
+    Transferências do FNDE de uma UF.
+    """
+    _run_flow(
+        args,
+        "fnde",
+        file_path=args.file,
+        state_level=args.state_level,
+        uf=args.uf,
+        adjust=args.adjust,
+        year=args.year,
+    )
+
+
+def run_creditor(args: argparse.Namespace) -> None:
+    """
+    Execução financeira por credor, um fluxo por bimestre.
+    """
+    _run_bimesters(args, "creditor")
+
+
+def run_monthly(args: argparse.Namespace) -> None:
+    """
+    Execução financeira por mês, um fluxo por bimestre.
+    """
+    _run_bimesters(args, "monthly")
+
+
+def run_re(args: argparse.Namespace) -> None:
+    """
+    Relatórios de RE do ano.
+    """
+    _run_flow(args, "re", year=args.year, jobs=args.jobs)
+
+
+# --- AUXILIARES ---
+def _run_flow(args: argparse.Namespace, flow: str, **params) -> None:
+    """
+    Executa um fluxo de src.etl.pipeline.flows; sem --incremental, todas as
+    etapas são refeitas.
+    """
+    from src.etl.pipeline.flows import run_flow
+
+    report = run_flow(
+        flow, base_dir=args.base_dir, force=not args.incremental, **params
+    )
+    for stage, reason in report.items():
+        print(f"{stage}: {reason or 'reaproveitada'}")
+
+
+# Tipo do relatório bruto de cada fluxo bimestral (src.utils.file_catalog)
+BIMESTER_REPORT_KINDS = {
+    "creditor": "execução_por_credor",
+    "monthly": "execução_mensal",
+}
+
+
+def _run_bimesters(args: argparse.Namespace, flow: str) -> None:
+    """
+    Executa um fluxo bimestral no bimestre de --bimester ou, na falta dele, em
+    todos os bimestres do ano cujo relatório já está em raw/ (consultados no
+    catálogo de arquivos). Erros da execução não são ignorados.
+    """
+    if args.bimester is not None:
+        _run_flow(args, flow, year=args.year, bi=args.bimester)
+        return
+
+    from src.utils.file_catalog import find_files
+
+    raw_dir = os.path.join(args.base_dir, "raw")
+    bimesters = [
+        bi
+        for bi in range(1, 7)
+        if find_files(
+            raw_dir, year=args.year, bimester=bi, kind=BIMESTER_REPORT_KINDS[flow]
+        )
+    ]
+    if not bimesters:
+        args.parser.error(
+            f"nenhum relatório de {args.year} em {raw_dir} para '{flow}'; "
+            "use --bimester"
+        )
+    for bi in bimesters:
+        _run_flow(args, flow, year=args.year, bi=bi)
+
+
+def _required(args: argparse.Namespace, name: str):
+    """
+    Valor de uma opção obrigatória apenas em alguns modos do comando.
+    """
+    value = getattr(args, name)
+    if value is None:
+        args.parser.error(f"--{name.replace('_', '-')} é obrigatório neste modo")
+    return value
+
+
+def _selected_months(args: argparse.Namespace) -> list[int]:
+    """
+    Meses selecionados no extrato bancário por --month ou --bimester.
+    """
+    if args.month is not None:
+        return [args.month]
+    if args.bimester is not None:
+        return [2 * args.bimester - 1, 2 * args.bimester]
+    return []
+
+
+def _print_profile(base_dir: str, started_at: float, elapsed: float) -> None:
+    """
+    Mostra as etapas dos manifestos gravados nesta execução
+    (src.utils.run_manifest) e o tempo total.
+    """
+    import pandas as pd
+
+    from src.utils.io import load_json
+
+    manifests = [
+        path
+        for path in glob.glob(os.path.join(base_dir, "manifests", "*.json"))
+        if os.path.getmtime(path) >= started_at
+    ]
+    for path in sorted(manifests, key=os.path.getmtime):
+        stages = pd.DataFrame(load_json(path)["stages"]).set_index("name")
+        columns = [
+            "status",
+            "wall_time_s",
+            "cpu_time_s",
+            "rows_in",
+            "rows_out",
+            "peak_memory_bytes",
+            "rss_growth_bytes",
+            "max_rss_bytes",
+            "child_max_rss_bytes",
+        ]
+        with pd.option_context(
+            "display.width", 200, "display.max_rows", None, "display.max_columns", None
+        ):
+            print(f"\n{path}")
+            print(stages.reindex(columns=columns))
+    print(f"\nTempo total: {elapsed:.2f} s")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Monta o parser da linha de comando.
+
+    Retorna:
+        argparse.ArgumentParser: Parser com um subcomando por pipeline.
+    """
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--base-dir",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"),
+        help="Diretório base dos dados (padrão: data/ do projeto).",
+    )
+    common.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Processos para ler os arquivos (0 usa todos os núcleos).",
+    )
+    common.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Refaz apenas as etapas cujas entradas, código ou parâmetros mudaram.",
+    )
+    common.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignora o cache de extração (relê todos os arquivos brutos).",
+    )
+    common.add_argument(
+        "--profile",
+        action="store_true",
+        help="Mede a memória de cada etapa e mostra o manifesto da execução.",
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Executa os pipelines de dados do CACS-FUNDEB."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bank = commands.add_parser(
+        "bank", parents=[common], help="Extrato bancário consolidado."
+    )
+    bank.add_argument("--year", type=int, required=True)
+    bank.add_argument(
+        "--opening-balance",
+        type=float,
+        help="Saldo inicial, em reais (obrigatório ao processar o ano inteiro "
+        "ou ao criar o extrato incremental).",
+    )
+    period = bank.add_mutually_exclusive_group()
+    period.add_argument(
+        "--bimester",
+        type=int,
+        choices=range(1, 7),
+        help="Fecha os dois meses do bimestre no extrato incremental.",
+    )
+    period.add_argument(
+        "--month",
+        type=int,
+        choices=range(1, 13),
+        help="Fecha o mês no extrato incremental.",
+    )
+    bank.set_defaults(handler=run_bank)
+
+    fnde = commands.add_parser(
+        "fnde", parents=[common], help="Transferências do FNDE de uma UF."
+    )
+    fnde.add_argument("--file", required=True, help="Planilha do FNDE.")
+    fnde.add_argument("--year", type=int, required=True)
+    fnde.add_argument("--uf", default="AP")
+    fnde.add_argument("--state-level", default="E", choices=["E", "M"])
+    fnde.add_argument("--adjust", action="store_true", help="Lê o bloco de ajustes.")
+    fnde.set_defaults(handler=run_fnde)
+
+    for name, handler, description in [
+        ("creditor", run_creditor, "Execução financeira por credor."),
+        ("monthly", run_monthly, "Execução financeira por mês."),
+    ]:
+        command = commands.add_parser(name, parents=[common], help=description)
+        command.add_argument("--year", type=int, required=True)
+        command.add_argument(
+            "--bimester",
+            type=int,
+            choices=range(1, 7),
+            help="Bimestre (padrão: todos os bimestres com relatório no ano).",
+        )
+        command.set_defaults(handler=handler)
+
+    res = commands.add_parser("re", parents=[common], help="Relatórios de RE do ano.")
+    res.add_argument("--year", type=int, required=True)
+    res.set_defaults(handler=run_re)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    args.parser = parser
+
+    # Lidas na importação dos módulos: precisam vir antes dos imports tardios
+    if args.profile:
+        os.environ["CACS_TRACE_MEMORY"] = "1"
+    if args.no_cache:
+        os.environ["CACS_EXTRACT_CACHE"] = "0"
+
+    started_at = time.time()
+    start = time.perf_counter()
+    args.handler(args)
+    elapsed = time.perf_counter() - start
+
+    if args.profile:
+        _print_profile(args.base_dir, started_at, elapsed)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""
+Previsão mensal dos repasses do FUNDEB (próximos 12 meses) com modelos
+sazonais de referência, ajustados em lote: as séries de todas as UFs (e
+origens do recurso) formam uma matriz série x mês e cada modelo opera sobre a
+matriz inteira com numpy, sem um laço Python por série.
+
+Modelos (FORECAST_MODELS):
+    - sazonal_ingênuo: repete o valor do mesmo mês do último ano.
+    - holt_winters: suavização exponencial aditiva (nível, tendência e
+      sazonalidade), com os parâmetros escolhidos por série em uma grade.
+    - linear_sazonal: regressão com tendência linear e um indicador por mês.
+
+Uso:
+    national_data = pd.concat([extract_fnde_national_data(path, year), ...])
+    series = fnde_series_matrix(national_data)
+    forecasts = forecast_fnde_series(series, horizon=12)
+    backtest = backtest_fnde_forecasts(series, horizon=12)
+"""
+
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+
+# Período sazonal das séries mensais
+SEASON_LENGTH = 12
+
+# Grade dos parâmetros de suavização (alfa, beta, gama) do Holt-Winters
+HOLT_WINTERS_GRID = list(
+    itertools.product([0.1, 0.3, 0.5, 0.8], [0.0, 0.05, 0.2], [0.05, 0.2, 0.5])
+)
+
+
+def fnde_series_matrix(
+    national_data: pd.DataFrame,
+    state_level: str = "E",
+    value_type: str = "LÍQUIDO",
+    by_source: bool = True,
+) -> pd.DataFrame:
+    """
+    Monta a matriz das séries mensais dos repasses a partir da tabela nacional
+    do FNDE (extract_fnde_national_data de um ou mais anos, ou
+    src.etl.pipeline.public_transfers.read_fnde_history).
+
+    Os meses ainda sem repasse no fim do período são descartados; meses sem
+    valor dentro do período contam como zero.
+
+    Parâmetros:
+        national_data (pd.DataFrame): Tabela nacional no formato longo.
+        state_level (str, opcional): Esfera ("E" estadual, "M" municipal).
+        value_type (str, opcional): "LÍQUIDO" ou "AJUSTE". Padrão: "LÍQUIDO".
+        by_source (bool, opcional): Se True, uma série por (UF, ORIGEM); se
+            False, uma por UF (soma das origens).
+
+    Retorna:
+        pd.DataFrame: Meses (pd.Period, sem lacunas) nas linhas e séries nas
+            colunas.
+    """
+    data = national_data.loc[
+        (national_data["ESFERA"] == state_level.upper())
+        & (national_data["TIPO"] == value_type)
+    ]
+    keys = ["UF", "ORIGEM"] if by_source else ["UF"]
+    series = (
+        data.groupby(["MÊS", *keys], observed=True)["VALOR"]
+        .sum(min_count=1)
+        .unstack(keys)
+    )
+
+    # Meses sem nenhum valor no fim do período: repasses ainda não feitos
+    filled = series.notna().any(axis=1)
+    if not filled.any():
+        raise ValueError("Nenhum repasse na tabela para a seleção informada.")
+    series = series.loc[: filled[filled].index[-1]]
+
+    months = pd.period_range(series.index.min(), series.index.max(), freq="M")
+    series = series.reindex(months, fill_value=np.nan).fillna(0.0)
+    series.index.name = "MÊS"
+    return series
+
+
+def _seasonal_naive(values: np.ndarray, horizon: int, start_month: int) -> np.ndarray:
+    """
+    Sazonal ingênuo: o valor do mesmo mês do último ano.
+    """
+    steps = np.arange(horizon) % SEASON_LENGTH
+    return values[:, values.shape[1] - SEASON_LENGTH + steps]
+
+
+def _seasonal_linear(values: np.ndarray, horizon: int, start_month: int) -> np.ndarray:
+    """
+    Regressão com intercepto, tendência linear e indicadores dos meses,
+    resolvida para todas as séries em um único mínimos quadrados.
+    """
+    n_obs = values.shape[1]
+    t = np.arange(n_obs + horizon)
+    month = (start_month - 1 + t) % SEASON_LENGTH
+    design = np.column_stack(
+        [np.ones_like(t), t, month[:, None] == np.arange(1, SEASON_LENGTH)]
+    ).astype(float)
+    coefficients = np.linalg.lstsq(design[:n_obs], values.T, rcond=None)[0]
+    return (design[n_obs:] @ coefficients).T
+
+
+def _holt_winters(values: np.ndarray, horizon: int, start_month: int) -> np.ndarray:
+    """
+    Holt-Winters aditivo. Cada série é filtrada com todos os parâmetros de
+    HOLT_WINTERS_GRID de uma vez (matriz de parâmetros x séries) e a previsão
+    usa os parâmetros de menor erro quadrático um passo à frente, medido após
+    o primeiro ano (usado na inicialização).
+    """
+    n_series, n_obs = values.shape
+    m = SEASON_LENGTH
+    alpha, beta, gamma = (
+        np.array(parameter)[:, None] for parameter in zip(*HOLT_WINTERS_GRID)
+    )
+
+    # Estado inicial pelo primeiro ano (e pelo segundo, para a tendência)
+    first_year = values[:, :m].mean(axis=1)
+    trend = np.zeros(n_series)
+    if n_obs >= 2 * m:
+        trend = (values[:, m : 2 * m].mean(axis=1) - first_year) / m
+    shape = (len(HOLT_WINTERS_GRID), n_series)
+    level = np.broadcast_to(first_year - trend * (m + 1) / 2, shape).copy()
+    trend = np.broadcast_to(trend, shape).copy()
+    season = np.broadcast_to(
+        (values[:, :m] - first_year[:, None]).T[:, None], (m, *shape)
+    ).copy()
+
+    sse = np.zeros(shape)
+    for t in range(n_obs):
+        slot = t % m
+        observed = values[:, t]
+        if t >= m:
+            sse += (observed - (level + trend + season[slot])) ** 2
+        new_level = alpha * (observed - season[slot]) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        season[slot] = gamma * (observed - new_level) + (1 - gamma) * season[slot]
+        level = new_level
+
+    best = sse.argmin(axis=0)
+    columns = np.arange(n_series)
+    steps = np.arange(1, horizon + 1)
+    slots = (n_obs + steps - 1) % m
+    return (
+        level[best, columns][:, None]
+        + trend[best, columns][:, None] * steps
+        + season[slots][:, best, columns].T
+    )
+
+
+# Modelos disponíveis: nome -> função (valores, horizonte, mês inicial)
+FORECAST_MODELS = {
+    "sazonal_ingênuo": _seasonal_naive,
+    "holt_winters": _holt_winters,
+    "linear_sazonal": _seasonal_linear,
+}
+
+
+def _forecast_values(
+    values: np.ndarray, horizon: int, start_month: int, model: str
+) -> np.ndarray:
+    """
+    Previsão de um modelo para a matriz série x mês; séries sem valores
+    negativos no histórico têm a previsão limitada a zero.
+    """
+    if values.shape[1] <= SEASON_LENGTH:
+        raise ValueError(
+            f"São necessários ao menos {SEASON_LENGTH + 1} meses de histórico "
+            f"(recebidos {values.shape[1]})."
+        )
+    forecast = FORECAST_MODELS[model](values, horizon, start_month)
+    nonnegative = (values >= 0).all(axis=1)
+    forecast[nonnegative] = np.maximum(forecast[nonnegative], 0.0)
+    return forecast
+
+
+def _check_models(models: list[str] | None) -> list[str]:
+    models = list(FORECAST_MODELS) if models is None else models
+    unknown = set(models) - set(FORECAST_MODELS)
+    if unknown:
+        raise ValueError(f"Modelos desconhecidos: {sorted(unknown)}")
+    return models
+
+
+def forecast_fnde_series(
+    series: pd.DataFrame,
+    horizon: int = 12,
+    models: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Prevê os próximos meses de todas as séries, com cada modelo ajustado em
+    lote sobre a matriz inteira.
+
+    Parâmetros:
+        series (pd.DataFrame): Matriz de fnde_series_matrix (meses nas linhas).
+        horizon (int, opcional): Meses previstos. Padrão: 12.
+        models (list[str], opcional): Modelos de FORECAST_MODELS. Padrão:
+            todos.
+
+    Retorna:
+        pd.DataFrame: Meses previstos (pd.Period) nas linhas e colunas
+            (MODELO, *séries), ex.: forecasts["holt_winters"]["AP"].
+
+    Levanta:
+        ValueError: Se o histórico tiver até 12 meses ou o modelo não existir.
+    """
+    models = _check_models(models)
+    values = series.to_numpy(dtype=float).T
+    start_month = series.index[0].month
+    months = pd.period_range(series.index[-1] + 1, periods=horizon, freq="M")
+
+    forecasts = {
+        model: pd.DataFrame(
+            _forecast_values(values, horizon, start_month, model).T,
+            index=pd.PeriodIndex(months, name="MÊS"),
+            columns=series.columns,
+        )
+        for model in models
+    }
+    return pd.concat(forecasts, axis=1, names=["MODELO"])
+
+
+def backtest_fnde_forecasts(
+    series: pd.DataFrame,
+    horizon: int = 12,
+    models: list[str] | None = None,
+    min_train: int = SEASON_LENGTH + 1,
+    step: int = 1,
+) -> pd.DataFrame:
+    """
+    Avalia os modelos por origem móvel: para cada mês de corte, ajusta com o
+    histórico até ele e compara a previsão dos meses seguintes (até horizon)
+    com os valores observados.
+
+    Parâmetros:
+        series (pd.DataFrame): Matriz de fnde_series_matrix (meses nas linhas).
+        horizon (int, opcional): Meses previstos em cada origem. Padrão: 12.
+        models (list[str], opcional): Modelos de FORECAST_MODELS. Padrão:
+            todos.
+        min_train (int, opcional): Meses de histórico da primeira origem.
+            Padrão: 13.
+        step (int, opcional): Meses entre origens consecutivas. Padrão: 1.
+
+    Retorna:
+        pd.DataFrame: Uma linha por modelo, ordenada pelo RMSE, com as colunas:
+            - RMSE (todas as séries e horizontes)
+            - RMSE_PERCENTUAL (média, entre as séries, do RMSE sobre o valor
+              médio observado da série)
+            - MAE
+            - ORIGENS e PREVISOES (pontos comparados)
+            - TEMPO_S (ajuste e previsão em todas as origens)
+
+    Levanta:
+        ValueError: Se não houver origem com min_train meses e ao menos um mês
+            observado depois dela.
+    """
+    models = _check_models(models)
+    values = series.to_numpy(dtype=float).T
+    start_month = series.index[0].month
+    origins = range(max(min_train, SEASON_LENGTH + 1), values.shape[1], step)
+    if not origins:
+        raise ValueError(
+            f"Histórico de {values.shape[1]} meses insuficiente para o backtest "
+            f"com min_train={min_train}."
+        )
+
+    rows = []
+    for model in models:
+        errors, actuals, elapsed = [], [], 0.0
+        for origin in origins:
+            actual = values[:, origin : origin + horizon]
+            start = time.perf_counter()
+            forecast = _forecast_values(
+                values[:, :origin], actual.shape[1], start_month, model
+            )
+            elapsed += time.perf_counter() - start
+            errors.append(forecast - actual)
+            actuals.append(actual)
+
+        errors = np.concatenate(errors, axis=1)
+        actuals = np.concatenate(actuals, axis=1)
+        # Erro relativo por série (séries sempre nulas ficam de fora)
+        scale = np.abs(actuals).mean(axis=1)
+        relative_rmse = np.sqrt((errors**2).mean(axis=1))[scale > 0] / scale[scale > 0]
+        rows.append(
+            {
+                "MODELO": model,
+                "RMSE": np.sqrt((errors**2).mean()),
+                "RMSE_PERCENTUAL": 100 * relative_rmse.mean(),
+                "MAE": np.abs(errors).mean(),
+                "ORIGENS": len(origins),
+                "PREVISOES": errors.size,
+                "TEMPO_S": round(elapsed, 4),
+            }
+        )
+
+    return pd.DataFrame(rows).set_index("MODELO").sort_values("RMSE")
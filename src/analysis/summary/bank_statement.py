@@ -1,10 +1,23 @@
 import calendar
+import json
+from pathlib import Path
 
 import pandas as pd
 
+from src.etl.schema import apply_ledger_schema
+from src.utils.config import get_config
+
+# Taxonomia histórico -> categoria do resumo (pode ser trocada no .env)
+BANK_STATEMENT_TAXONOMY_PATH = Path(
+    get_config(
+        "CACS_BANK_TAXONOMY_PATH",
+        Path(__file__).with_name("bank_statement_taxonomy.json"),
+    )
+)
+
 
 def bank_statement_movement_summary(
-    bank_statement_data: pd.DataFrame, moviment: str
+    bank_statement_data: pd.DataFrame, moviment: str, unit: str = "centavos"
 ) -> pd.Series:
     """
     Gera um resumo das entradas (créditos) no extrato bancário,
@@ -13,11 +26,15 @@ def bank_statement_movement_summary(
     Parâmetros:
         bank_statement_data (pd.DataFrame): DataFrame do extrato bancário,
             contendo pelo menos as colunas 'INF', 'HIST' e 'VALOR'.
+        moviment (str): "C" (créditos) ou "D" (débitos).
+        unit (str, opcional): Unidade dos valores monetários do extrato:
+            "centavos" (padrão) ou "reais" (ex.: extrato lido do Excel).
 
     Retorna:
         pd.DataFrame: Dataframe com o valor total por histórico bancário e um campo 'TOTAL'
                    com a soma geral.
     """
+    bank_statement_data = apply_ledger_schema(bank_statement_data, unit)
     moviment = moviment.upper()
     if moviment == "C":
         bank_history_exclude = "Resgate Automático"
@@ -32,7 +49,7 @@ def bank_statement_movement_summary(
     ]
 
     # Agrupa por histórico e soma os valores
-    grouped_credits = credits.groupby("HIST")["VALOR"].sum()
+    grouped_credits = credits.groupby("HIST", observed=True)["VALOR"].sum()
 
     # Transforma em dataframe
     grouped_credits = grouped_credits.to_frame().reset_index()
@@ -50,173 +67,137 @@ def bank_statement_movement_summary(
         "VALOR_ACUMULADO"
     ].sum()
 
+    # Somas exatas em centavos; exibe em reais
+    grouped_credits["VALOR_ACUMULADO"] = grouped_credits["VALOR_ACUMULADO"] / 100
+
     return grouped_credits
 
 
-def banks_statement_summary(
-    bank_statement_data: pd.DataFrame, year: int, month: int = 12
-) -> pd.Series:
+def load_bank_statement_taxonomy(
+    path: str | Path = BANK_STATEMENT_TAXONOMY_PATH,
+) -> dict:
     """
-    Gera um resumo detalhado do extrato bancário para um período específico.
+    Lê a taxonomia histórico bancário (HIST) -> categoria do resumo.
 
     Parâmetros:
-        bank_statement_data (pd.DataFrame): DataFrame contendo o extrato bancário,
-            com colunas obrigatórias: 'INF', 'HIST', 'VALOR', 'VALOR_APP', 'SALDO'.
-        year (int): Ano de referência.
-        month (int, opcional): Mês final do período (1-12). Padrão: 12.
+        path (str | Path, opcional): Caminho do arquivo JSON da taxonomia.
 
     Retorna:
-        pd.Series: Série com totais e subtotais organizados por categorias.
+        dict: Taxonomia, com as categorias em "categories".
     """
-    # --- FILTRO POR PERÍODO ---
-    last_day = calendar.monthrange(year, month)[1]
-    bank_statement_data = bank_statement_data.loc[
-        bank_statement_data.index <= f"{year}-{month:02d}-{last_day}"
-    ]
-
-    # --- SALDO INICIAL ---
-    saldo_inicial = bank_statement_data["SALDO"].iloc[0]
-
-    # --- ENTRADAS ---
-    total_aplicado = bank_statement_data.loc[
-        bank_statement_data["HIST"] == "BB-APLIC C.PRZ-APL.AUT", "VALOR_APP"
-    ].sum()
-
-    total_resgatado = bank_statement_data.loc[
-        bank_statement_data["HIST"] == "Resgate Automático", "VALOR_APP"
-    ].sum()
-
-    rendimentos = (
-        bank_statement_data.loc[bank_statement_data["HIST"] == "RENDIMENTOS", "VALOR"]
-        .sum()
-        .round(2)
-    )
-
-    total_entradas = (
-        bank_statement_data.loc[bank_statement_data["INF"] == "C", "VALOR"]
-        .sum()
-        .round(2)
-    )
-
-    repasses_fnde = (
-        bank_statement_data.loc[
-            bank_statement_data["HIST"].isin(
-                [
-                    "IPVA",
-                    "IPI/EXPORTACAO",
-                    "FPE/FPM",
-                    "RECEBIMENTO DE ICMS",
-                    "ITR",
-                    "ITCMD",
-                ]
-            ),
-            "VALOR",
-        ]
-        .sum()
-        .round(2)
-    )
-
-    repasses_uniao_vaaf = (
-        bank_statement_data.loc[
-            bank_statement_data["HIST"] == "VAAF Complemento FUNDEB", "VALOR"
-        ]
-        .sum()
-        .round(2)
-    )
-
-    repasses_uniao_vaat = (
-        bank_statement_data.loc[
-            bank_statement_data["HIST"] == "VAAT Complemento FUNDEB", "VALOR"
-        ]
-        .sum()
-        .round(2)
-    )
-
-    repasses_uniao_vaar = (
-        bank_statement_data.loc[
-            bank_statement_data["HIST"] == "VAAR Complemento FUNDEB", "VALOR"
-        ]
-        .sum()
-        .round(2)
-    )
-
-    ajuste_repasses_uniao_vaar = (
-        bank_statement_data.loc[
-            bank_statement_data["HIST"] == "Ajuste Complemento VAAR", "VALOR"
-        ]
-        .sum()
-        .round(2)
-    )
+    with open(path, encoding="utf-8") as file:
+        taxonomy = json.load(file)
+
+    # Um histórico só pode pertencer a uma categoria
+    seen = {}
+    for name, category in taxonomy["categories"].items():
+        for history in category["histories"]:
+            if history in seen:
+                raise ValueError(
+                    f"Histórico '{history}' em duas categorias: "
+                    f"'{seen[history]}' e '{name}'"
+                )
+            seen[history] = name
+    return taxonomy
+
+
+def bank_statement_category_totals(
+    bank_statement_data: pd.DataFrame,
+    by: pd.Series | None = None,
+    taxonomy: dict | None = None,
+) -> pd.DataFrame:
+    """
+    Soma, em uma única passagem (um groupby), o valor de cada categoria da
+    taxonomia e o total de créditos ("total_entradas") e débitos
+    ("total_saidas").
 
-    # --- OUTRAS ENTRADAS ---
-    ordens_canceladas = (
-        bank_statement_data.loc[
-            bank_statement_data["HIST"] == "ORDEM BANC CANCELADA", "VALOR"
-        ]
-        .sum()
-        .round(2)
-    )
+    Parâmetros:
+        bank_statement_data (pd.DataFrame): Extrato no esquema de src.etl.schema.
+        by (pd.Series, opcional): Chave adicional de agrupamento (ex.: mês de
+            cada lançamento). Sem ela, há uma única coluna de totais.
+        taxonomy (dict, opcional): Taxonomia; padrão: load_bank_statement_taxonomy().
 
-    transferencias_recebidas = (
-        bank_statement_data.loc[
-            bank_statement_data["HIST"].isin(
-                [
-                    "Devolução",
-                    "Dep Cheque BB Liquidado",
-                    "Transferência recebida",
-                    "TED Devolvida",
-                    "TED-Crédito em Conta",
-                    "Transferido da poupança",
-                ]
-            ),
-            "VALOR",
-        ]
-        .sum()
-        .round(2)
-    )
+    Retorna:
+        pd.DataFrame: Totais em centavos, com uma linha por categoria e uma
+            coluna por valor de by.
+    """
+    taxonomy = taxonomy or load_bank_statement_taxonomy()
+    categories = taxonomy["categories"]
+    history_category = {
+        history: name
+        for name, category in categories.items()
+        for history in category["histories"]
+    }
 
-    outras_entradas = (
-        bank_statement_data.loc[
-            bank_statement_data["HIST"] == "COTA DAF-DEBITO", "VALOR"
-        ]
-        .sum()
-        .round(2)
-    )
+    if by is None:
+        by = pd.Series("TOTAL", index=bank_statement_data.index)
+    category = bank_statement_data["HIST"].map(history_category).rename("CATEGORIA")
+
+    # Única passagem sobre o extrato: soma por (período, categoria, INF)
+    grouped = bank_statement_data.groupby(
+        [by.rename("PERÍODO"), category, bank_statement_data["INF"]],
+        observed=True,
+        dropna=False,
+    )[["VALOR", "VALOR_APP"]].sum()
+
+    periods = grouped.index.get_level_values("PERÍODO").unique()
+    by_category = grouped.groupby(level=["CATEGORIA", "PERÍODO"], dropna=False).sum()
+    by_inf = grouped["VALOR"].groupby(level=["INF", "PERÍODO"], dropna=False).sum()
+
+    totals = {}
+    for name, spec in categories.items():
+        column = spec.get("column", "VALOR")
+        if name in by_category.index.get_level_values("CATEGORIA"):
+            totals[name] = by_category.loc[name, column]
+        else:
+            totals[name] = pd.Series(0, index=periods)
+    for name, inf in [("total_entradas", "C"), ("total_saidas", "D")]:
+        if inf in by_inf.index.get_level_values("INF"):
+            totals[name] = by_inf.loc[inf]
+        else:
+            totals[name] = pd.Series(0, index=periods)
+
+    return pd.DataFrame(totals).reindex(periods).fillna(0).astype("int64").T
+
+
+def build_bank_statement_summary(
+    saldo_inicial: int | pd.Series, totals: pd.Series | pd.DataFrame
+) -> dict:
+    """
+    Monta as linhas do resumo do extrato a partir dos totais por categoria.
 
-    # --- SAÍDAS ---
-    total_saidas = (
-        bank_statement_data.loc[bank_statement_data["INF"] == "D", "VALOR"]
-        .sum()
-        .round(2)
-    )
+    Funciona tanto para um período (totais escalares) quanto para vários
+    (uma coluna de totais por período), pois as linhas são somas e subtrações
+    elemento a elemento.
 
-    despesas = (
-        bank_statement_data.loc[
-            bank_statement_data["HIST"].isin(
-                [
-                    "TED Transf.Eletr.Disponiv",
-                    "Folha de Pagamento",
-                    "Pagamentos Diversos",
-                    "Emissão Ordem Bancária",
-                    "Impostos",
-                    "Tar Lib/Ant Float Pg Div",
-                    "Tarif ORBAN-Crédito Conta",
-                    "Pagto via Auto-Atend.BB",
-                ]
-            ),
-            "VALOR",
-        ]
-        .sum()
-        .round(2)
-    )
+    Parâmetros:
+        saldo_inicial (int | pd.Series): Saldo inicial, em centavos.
+        totals (pd.Series | pd.DataFrame): Totais em centavos, indexados pelo
+            nome da categoria (ver bank_statement_category_totals).
 
+    Retorna:
+        dict: Linha do resumo -> valor (ou "" nas linhas separadoras).
+    """
+    total_entradas = totals.loc["total_entradas"]
+    total_saidas = totals.loc["total_saidas"]
+    total_aplicado = totals.loc["total_aplicado"]
+    total_resgatado = totals.loc["total_resgatado"]
+    rendimentos = totals.loc["rendimentos"]
+    repasses_fnde = totals.loc["repasses_fnde"]
+    repasses_uniao_vaaf = totals.loc["repasses_uniao_vaaf"]
+    repasses_uniao_vaat = totals.loc["repasses_uniao_vaat"]
+    repasses_uniao_vaar = totals.loc["repasses_uniao_vaar"]
+    ajuste_repasses_uniao_vaar = totals.loc["ajuste_repasses_uniao_vaar"]
+    ordens_canceladas = totals.loc["ordens_canceladas"]
+    transferencias_recebidas = totals.loc["transferencias_recebidas"]
+    outras_entradas = totals.loc["outras_entradas"]
     outras_saidas = outras_entradas
 
     # --- SALDO FINAL ---
     saldo_final = saldo_inicial + total_entradas + total_saidas
 
     # --- DICIONÁRIO DE RESUMO ---
-    summary = {
+    return {
         "1. SALDO INICIAL": saldo_inicial,
         "": "",
         "2. TOTAL DE ENTRADAS": total_entradas,
@@ -274,4 +255,143 @@ def banks_statement_summary(
         "6. TOTAL RESGATADO": total_resgatado,
     }
 
+
+def banks_statement_summary(
+    bank_statement_data: pd.DataFrame,
+    year: int,
+    month: int = 12,
+    unit: str = "centavos",
+) -> pd.Series:
+    """
+    Gera um resumo detalhado do extrato bancário para um período específico.
+
+    Os lançamentos são classificados pela taxonomia de históricos
+    (bank_statement_taxonomy.json) e todos os totais saem de um único groupby.
+
+    Parâmetros:
+        bank_statement_data (pd.DataFrame): DataFrame contendo o extrato bancário,
+            com colunas obrigatórias: 'INF', 'HIST', 'VALOR', 'VALOR_APP', 'SALDO'.
+        year (int): Ano de referência.
+        month (int, opcional): Mês final do período (1-12). Padrão: 12.
+        unit (str, opcional): Unidade dos valores monetários do extrato:
+            "centavos" (padrão) ou "reais" (ex.: extrato lido do Excel).
+
+    Retorna:
+        pd.Series: Série com totais e subtotais organizados por categorias.
+    """
+    bank_statement_data = apply_ledger_schema(bank_statement_data, unit)
+
+    # --- FILTRO POR PERÍODO ---
+    last_day = calendar.monthrange(year, month)[1]
+    bank_statement_data = bank_statement_data.loc[
+        bank_statement_data.index <= f"{year}-{month:02d}-{last_day}"
+    ]
+
+    # --- SALDO INICIAL E TOTAIS POR CATEGORIA ---
+    saldo_inicial = bank_statement_data["SALDO"].iloc[0]
+    totals = bank_statement_category_totals(bank_statement_data)["TOTAL"]
+
+    summary = build_bank_statement_summary(saldo_inicial, totals)
+
+    # Totais calculados em centavos (somas exatas); exibe em reais
+    summary = {
+        key: value if isinstance(value, str) else value / 100
+        for key, value in summary.items()
+    }
+
     return pd.Series(summary, name="TOTAIS")
+
+
+def _summary_frame(summary: dict, columns: pd.Index) -> pd.DataFrame:
+    """
+    Converte o resumo de build_bank_statement_summary (valores por período, em
+    centavos) em um DataFrame linhas do resumo x períodos, em reais.
+    """
+    return pd.DataFrame(
+        {
+            key: (
+                pd.Series("", index=columns)
+                if isinstance(value, str)
+                else value.reindex(columns) / 100
+            )
+            for key, value in summary.items()
+        }
+    ).T
+
+
+def banks_statement_summary_matrix(
+    bank_statement_data: pd.DataFrame,
+    year: int,
+    month: int = 12,
+    unit: str = "centavos",
+) -> pd.DataFrame:
+    """
+    Gera, de uma só vez, o resumo do extrato bancário de cada mês, de cada
+    bimestre e acumulado no ano até cada mês.
+
+    Os totais por categoria são calculados uma única vez, por mês; bimestres e
+    acumulados saem de somas desses totais mensais e os saldos iniciais, da
+    soma acumulada do saldo do período. A coluna ("ACUMULADO", m) é igual a
+    banks_statement_summary(bank_statement_data, year, m).
+
+    Parâmetros:
+        bank_statement_data (pd.DataFrame): Extrato bancário consolidado do ano,
+            com o lançamento de saldo inicial.
+        year (int): Ano de referência.
+        month (int, opcional): Último mês do resumo (1-12). Padrão: 12.
+        unit (str, opcional): Unidade dos valores monetários do extrato:
+            "centavos" (padrão) ou "reais" (ex.: extrato lido do Excel).
+
+    Retorna:
+        pd.DataFrame: Linhas do resumo x períodos, com colunas
+            (CORTE, PERÍODO), CORTE em "MÊS", "BIMESTRE" e "ACUMULADO".
+    """
+    bank_statement_data = apply_ledger_schema(bank_statement_data, unit)
+
+    # --- FILTRO POR PERÍODO ---
+    last_day = calendar.monthrange(year, month)[1]
+    bank_statement_data = bank_statement_data.loc[
+        bank_statement_data.index <= f"{year}-{month:02d}-{last_day}"
+    ]
+
+    # Lançamentos anteriores ao ano (saldo inicial) entram no primeiro mês,
+    # como em banks_statement_summary
+    index = bank_statement_data.index
+    months = pd.Series(
+        index.month.where(index >= f"{year}-01-01", 1), index=index, name="MÊS"
+    )
+
+    # --- TOTAIS MENSAIS (UMA PASSAGEM) ---
+    months_range = pd.RangeIndex(1, month + 1, name="PERÍODO")
+    monthly = bank_statement_category_totals(bank_statement_data, by=months)
+    monthly = monthly.reindex(columns=months_range, fill_value=0)
+
+    # Saldo inicial de cada mês: abertura + saldo dos meses anteriores
+    saldo_abertura = bank_statement_data["SALDO"].iloc[0]
+    flow = monthly.loc["total_entradas"] + monthly.loc["total_saidas"]
+    saldo_inicial_mensal = saldo_abertura + flow.cumsum().shift(1, fill_value=0)
+
+    # --- BIMESTRES E ACUMULADOS ---
+    bimesters = (months_range - 1) // 2 + 1
+    bimestral = monthly.T.groupby(bimesters).sum().T
+    bimestral.columns.name = "PERÍODO"
+    saldo_inicial_bimestral = saldo_inicial_mensal.groupby(bimesters).first()
+
+    accumulated = monthly.cumsum(axis=1)
+    saldo_inicial_acumulado = pd.Series(saldo_abertura, index=months_range)
+
+    cuts = {
+        "MÊS": (saldo_inicial_mensal, monthly),
+        "BIMESTRE": (saldo_inicial_bimestral, bimestral),
+        "ACUMULADO": (saldo_inicial_acumulado, accumulated),
+    }
+    return pd.concat(
+        {
+            cut: _summary_frame(
+                build_bank_statement_summary(saldo_inicial, totals), totals.columns
+            )
+            for cut, (saldo_inicial, totals) in cuts.items()
+        },
+        axis=1,
+        names=["CORTE", "PERÍODO"],
+    )
@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+
+from src.analysis.summary.bank_statement import (
+    build_bank_statement_summary,
+    load_bank_statement_taxonomy,
+)
+from src.etl.schema import apply_ledger_schema
+
+# Totais por natureza do lançamento (INF), além das categorias da taxonomia
+INF_TOTALS = {"total_entradas": "C", "total_saidas": "D"}
+
+
+def _index_rows(bank_statement_data: pd.DataFrame, taxonomy: dict) -> np.ndarray:
+    """
+    Monta a matriz lançamentos x colunas do índice (categorias e totais por
+    INF), em centavos, com a contribuição de cada lançamento.
+    """
+    categories = taxonomy["categories"]
+    n_rows = len(bank_statement_data)
+    rows = np.zeros((n_rows, len(categories) + len(INF_TOTALS)), dtype="int64")
+
+    valor = bank_statement_data["VALOR"].to_numpy()
+    hist = bank_statement_data["HIST"]
+    for position, spec in enumerate(categories.values()):
+        is_category = hist.isin(spec["histories"]).to_numpy()
+        values = bank_statement_data[spec.get("column", "VALOR")].to_numpy()
+        rows[is_category, position] = values[is_category]
+
+    inf = bank_statement_data["INF"]
+    for position, code in enumerate(INF_TOTALS.values(), start=len(categories)):
+        is_inf = (inf == code).fillna(False).to_numpy()
+        rows[is_inf, position] = valor[is_inf]
+
+    return rows
+
+
+def build_bank_statement_index(
+    bank_statement_data: pd.DataFrame,
+    taxonomy: dict | None = None,
+    unit: str = "centavos",
+) -> dict:
+    """
+    Pré-calcula as somas acumuladas, em centavos, de cada categoria da
+    taxonomia e dos créditos/débitos, na ordem das datas do extrato.
+    O total de qualquer intervalo de datas sai de duas buscas binárias e uma
+    subtração (bank_statement_range_totals), sem percorrer os lançamentos.
+
+    Parâmetros:
+        bank_statement_data (pd.DataFrame): Extrato bancário consolidado.
+        taxonomy (dict, opcional): Taxonomia; padrão: load_bank_statement_taxonomy().
+        unit (str, opcional): Unidade dos valores monetários do extrato:
+            "centavos" (padrão) ou "reais" (ex.: extrato lido do Excel).
+
+    Retorna:
+        dict: Índice com o saldo de abertura ("opening_balance", SALDO do
+            primeiro lançamento), as datas ("dates"), os nomes das colunas
+            ("columns"), as somas acumuladas ("cumsum", com uma linha de zeros
+            no início) e a taxonomia usada.
+    """
+    taxonomy = taxonomy or load_bank_statement_taxonomy()
+    bank_statement_data = apply_ledger_schema(bank_statement_data, unit)
+    bank_statement_data = bank_statement_data.sort_index(kind="stable")
+
+    rows = _index_rows(bank_statement_data, taxonomy)
+    cumsum = np.zeros((len(rows) + 1, rows.shape[1]), dtype="int64")
+    np.cumsum(rows, axis=0, out=cumsum[1:])
+
+    return {
+        "opening_balance": int(bank_statement_data["SALDO"].iloc[0]),
+        "dates": bank_statement_data.index.to_numpy(dtype="datetime64[ns]"),
+        "columns": list(taxonomy["categories"]) + list(INF_TOTALS),
+        "cumsum": cumsum,
+        "taxonomy": taxonomy,
+    }
+
+
+def append_bank_statement_index(
+    index: dict, new_rows: pd.DataFrame, unit: str = "centavos"
+) -> dict:
+    """
+    Atualiza o índice com novos lançamentos, sem recalcular os anteriores:
+    as somas acumuladas novas partem da última linha do índice.
+
+    Parâmetros:
+        index (dict): Índice de build_bank_statement_index.
+        new_rows (pd.DataFrame): Lançamentos a incluir, com datas iguais ou
+            posteriores à última data do índice.
+        unit (str, opcional): Unidade dos valores monetários de new_rows:
+            "centavos" (padrão) ou "reais".
+
+    Retorna:
+        dict: Novo índice.
+
+    Levanta:
+        ValueError: Se algum lançamento novo for anterior à última data do índice.
+    """
+    new_rows = apply_ledger_schema(new_rows, unit).sort_index(kind="stable")
+    new_dates = new_rows.index.to_numpy(dtype="datetime64[ns]")
+    if len(index["dates"]) and len(new_dates) and new_dates[0] < index["dates"][-1]:
+        raise ValueError(
+            f"Lançamentos de {pd.Timestamp(new_dates[0]):%d/%m/%Y} são anteriores "
+            f"ao fim do índice ({pd.Timestamp(index['dates'][-1]):%d/%m/%Y})"
+        )
+
+    rows = _index_rows(new_rows, index["taxonomy"])
+    appended = index["cumsum"][-1] + np.cumsum(rows, axis=0)
+
+    return {
+        **index,
+        "dates": np.concatenate([index["dates"], new_dates]),
+        "cumsum": np.concatenate([index["cumsum"], appended]),
+    }
+
+
+def _position(index: dict, date, side: str) -> int:
+    """
+    Posição (busca binária) de uma data na linha de somas acumuladas.
+    """
+    return int(np.searchsorted(index["dates"], np.datetime64(date, "ns"), side=side))
+
+
+def bank_statement_range_totals(index: dict, start=None, end=None) -> pd.Series:
+    """
+    Totais, em centavos, dos lançamentos com data em [start, end].
+
+    Parâmetros:
+        index (dict): Índice de build_bank_statement_index.
+        start (str | pd.Timestamp, opcional): Data inicial (inclusive). Padrão:
+            início do extrato.
+        end (str | pd.Timestamp, opcional): Data final (inclusive). Padrão: fim
+            do extrato.
+
+    Retorna:
+        pd.Series: Total de cada categoria, de "total_entradas" e de
+            "total_saidas" no intervalo.
+    """
+    cumsum = index["cumsum"]
+    first = 0 if start is None else _position(index, pd.Timestamp(start), "left")
+    last = (
+        len(cumsum) - 1 if end is None else _position(index, pd.Timestamp(end), "right")
+    )
+    last = max(first, last)
+    return pd.Series(cumsum[last] - cumsum[first], index=index["columns"])
+
+
+def bank_statement_range_summary(index: dict, start=None, end=None) -> pd.Series:
+    """
+    Resumo do extrato bancário (mesmas linhas de banks_statement_summary) para
+    os lançamentos com data em [start, end], consultado no índice.
+
+    O saldo inicial é o saldo de abertura do extrato somado às entradas e
+    saídas anteriores a start.
+
+    Parâmetros:
+        index (dict): Índice de build_bank_statement_index.
+        start (str | pd.Timestamp, opcional): Data inicial (inclusive).
+        end (str | pd.Timestamp, opcional): Data final (inclusive).
+
+    Retorna:
+        pd.Series: Série com totais e subtotais organizados por categorias.
+    """
+    saldo_inicial = index["opening_balance"]
+    if start is not None:
+        first = _position(index, pd.Timestamp(start), "left")
+        before = dict(zip(index["columns"], index["cumsum"][first]))
+        saldo_inicial += before["total_entradas"] + before["total_saidas"]
+
+    summary = build_bank_statement_summary(
+        saldo_inicial, bank_statement_range_totals(index, start, end)
+    )
+
+    # Totais calculados em centavos (somas exatas); exibe em reais
+    summary = {
+        key: value if isinstance(value, str) else value / 100
+        for key, value in summary.items()
+    }
+
+    return pd.Series(summary, name="TOTAIS")
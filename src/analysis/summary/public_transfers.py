@@ -55,3 +55,97 @@ def uf_fnde_table_summary(
     ]
 
     return summary
+
+
+def fnde_states_benchmark(
+    national_data: pd.DataFrame,
+    state_level: str = "E",
+    until_month: int | None = None,
+) -> pd.DataFrame:
+    """
+    Compara os repasses do FNDE entre as UFs, a partir da tabela nacional
+    (src.etl.extract.public_transfers.extract_fnde_national_data).
+
+    Parâmetros:
+        national_data (pd.DataFrame): Tabela nacional no formato longo.
+        state_level (str, opcional): Esfera ("E" estadual, "M" municipal).
+        until_month (int, opcional): Considera apenas os meses até este
+            (acumulado no ano). Padrão: todos.
+
+    Retorna:
+        pd.DataFrame: Uma linha por UF, ordenada pelo total líquido, com as
+            colunas:
+            - TOTAL_BRUTO_REPASSES
+            - TOTAL_AJUSTES
+            - TOTAL_LIQUIDO_REPASSES
+            - PARTICIPACAO (% do total líquido nacional)
+            - POSICAO (1 = maior total líquido)
+    """
+    data = national_data.loc[national_data["ESFERA"] == state_level.upper()]
+    if until_month is not None:
+        data = data.loc[data["MÊS"].dt.month <= until_month]
+
+    totals = data.pivot_table(
+        index="UF", columns="TIPO", values="VALOR", aggfunc="sum", observed=True
+    ).reindex(columns=["LÍQUIDO", "AJUSTE"], fill_value=0.0)
+    benchmark = pd.DataFrame(
+        {
+            "TOTAL_LIQUIDO_REPASSES": totals["LÍQUIDO"],
+            "TOTAL_AJUSTES": totals["AJUSTE"],
+        }
+    )
+    benchmark["TOTAL_BRUTO_REPASSES"] = (
+        benchmark["TOTAL_LIQUIDO_REPASSES"] - benchmark["TOTAL_AJUSTES"]
+    )
+    benchmark["PARTICIPACAO"] = (
+        100
+        * benchmark["TOTAL_LIQUIDO_REPASSES"]
+        / benchmark["TOTAL_LIQUIDO_REPASSES"].sum()
+    )
+    benchmark["POSICAO"] = (
+        benchmark["TOTAL_LIQUIDO_REPASSES"]
+        .rank(ascending=False, method="min")
+        .astype(int)
+    )
+
+    benchmark = benchmark.sort_values("POSICAO")
+    return benchmark[
+        [
+            "TOTAL_BRUTO_REPASSES",
+            "TOTAL_AJUSTES",
+            "TOTAL_LIQUIDO_REPASSES",
+            "PARTICIPACAO",
+            "POSICAO",
+        ]
+    ]
+
+
+def fnde_states_monthly(
+    national_data: pd.DataFrame,
+    state_level: str = "E",
+    value_type: str = "LÍQUIDO",
+    by_source: bool = False,
+) -> pd.DataFrame:
+    """
+    Matriz UF x mês dos repasses do FNDE (ex.: mapa de calor entre estados).
+
+    Parâmetros:
+        national_data (pd.DataFrame): Tabela nacional no formato longo.
+        state_level (str, opcional): Esfera ("E" estadual, "M" municipal).
+        value_type (str, opcional): "LÍQUIDO" ou "AJUSTE". Padrão: "LÍQUIDO".
+        by_source (bool, opcional): Se True, as linhas são (UF, ORIGEM).
+
+    Retorna:
+        pd.DataFrame: Valores somados, com os meses (pd.Period) nas colunas.
+    """
+    data = national_data.loc[
+        (national_data["ESFERA"] == state_level.upper())
+        & (national_data["TIPO"] == value_type)
+    ]
+    return data.pivot_table(
+        index=["UF", "ORIGEM"] if by_source else "UF",
+        columns="MÊS",
+        values="VALOR",
+        aggfunc="sum",
+        observed=True,
+    )
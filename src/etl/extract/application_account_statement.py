@@ -2,9 +2,15 @@
 Módulo para ingestão de dados de extratos de aplicações financeiras.
 """
 
+import os
+
 import pandas as pd
 
-from utils.file_paths import list_files_by_prefix_suffix
+from src.etl.schema import apply_ledger_schema
+from src.utils.cache import cache_extract
+from src.utils.file_paths import list_files_by_prefix_suffix
+from src.utils.parallel import map_files
+from src.utils.pdf import read_pdf_text_lines
 
 
 def extract_manual_applications_account_statement_data(year: int) -> pd.DataFrame:
@@ -16,9 +22,10 @@ def extract_manual_applications_account_statement_data(year: int) -> pd.DataFram
         year (int): Ano de referência (ex.: 2025).
 
     Retorna:
-        pd.DataFrame: Dados no formato padronizado do projeto.
+        pd.DataFrame: Dados no formato padronizado do projeto, com os tipos do
+            extrato (src.etl.schema) e valores em centavos.
     """
-    # Dados manuais de rendimento por mês
+    # Dados manuais de rendimento por mês, em reais
     data = [
         (f"01/{year}", 235913.62),
         (f"02/{year}", 457431.56),
@@ -52,9 +59,10 @@ def extract_manual_applications_account_statement_data(year: int) -> pd.DataFram
             "COD_HIST": ["000"] * applications.shape[0],
             "HIST": ["RENDIMENTOS"] * applications.shape[0],
             "DOC": ["0"] * applications.shape[0],
+            "VALOR_APP": [0.0] * applications.shape[0],
             "VALOR": applications["RENDIMENTO"],
             "INF": ["C"] * applications.shape[0],
-            "SALDO": [np.nan] * applications.shape[0],
+            "SALDO": [0.0] * applications.shape[0],
             "DET_HIST": ["RENDIMENTOS"] * applications.shape[0],
         }
     )
@@ -63,20 +71,38 @@ def extract_manual_applications_account_statement_data(year: int) -> pd.DataFram
     applications.index = pd.to_datetime(applications["DATA"], format="%m/%Y")
     applications.drop(columns="DATA", inplace=True)
 
-    return applications
+    # Valores digitados em reais: convertidos aqui, na entrada, para centavos
+    return apply_ledger_schema(applications, unit="reais")
 
 
-def extract_pdf_application_account_statement_data(path_file: str) -> pd.Series:
+@cache_extract(version=1)
+def extract_pdf_application_account_statement_data(
+    path_file: str, backend: str = "tabula"
+) -> pd.Series:
     """
     Lê um único PDF de aplicação financeira e retorna o valor de rendimento.
 
     Parâmetros:
         path (str): Caminho da pasta onde está o arquivo.
         file (str): Nome do arquivo PDF.
+        backend (str, opcional): "tabula" (JVM) ou "text" (camada de texto do PDF,
+            sem JVM).
 
     Retorna:
         pd.Series: Série com período e rendimento extraído.
     """
+    # Extrai o período do nome do arquivo
+    period = os.path.basename(path_file)[:5]
+
+    if backend == "text":
+        # Linha "RENDIMENTO LÍQUIDO" do resumo do mês
+        for line in read_pdf_text_lines(path_file, area=[0, 0, 842, 595]):
+            if line.startswith("RENDIMENTO LÍQUIDO"):
+                return pd.Series({"PERÍODO": period, "RENDIMENTO": line.split()[-1]})
+        raise ValueError(f"Rendimento não encontrado no PDF: {path_file}")
+    if backend != "tabula":
+        raise ValueError(f"Backend de leitura de PDF desconhecido: {backend}")
+
     import tabula as tb
 
     df_list = tb.read_pdf(
@@ -89,14 +115,11 @@ def extract_pdf_application_account_statement_data(path_file: str) -> pd.Series:
 
     # Extrai o valor da penúltima linha (ajustar conforme layout real)
     valor = df_list[0][-12:-11]["Unnamed: 1"].values
-
-    # Extrai o período do nome do arquivo
-    period = path_file.split("\\")[-1][:5]
     return pd.Series({"PERÍODO": period, "RENDIMENTO": valor[0]})
 
 
 def extract_all_pdf_application_account_statement_data(
-    path_base: str, suffix: str
+    path_base: str, suffix: str, backend: str = "tabula", jobs: int = 1
 ) -> pd.DataFrame:
     """
     Lê todos os PDFs de aplicações financeiras em uma pasta.
@@ -104,6 +127,9 @@ def extract_all_pdf_application_account_statement_data(
     Parâmetros:
         path_base (str): Caminho da pasta contendo os PDFs.
         Sufixo que o arquivo deve ter (ex.: 'Extrato_Conta_Aplicações.pdf').
+        backend (str, opcional): Leitor de PDF ("tabula" ou "text").
+        jobs (int, opcional): Número de processos para ler os arquivos em paralelo
+            (None ou <= 0 usa todos os núcleos). Padrão: 1.
 
     Retorna:
         pd.DataFrame: DataFrame com períodos e rendimentos brutos.
@@ -113,11 +139,152 @@ def extract_all_pdf_application_account_statement_data(
     if not path_list:
         raise FileNotFoundError(f"Nenhum arquivo PDF encontrado em {path_base}")
 
-    records = []
-    for path in path_list:
-        income = extract_pdf_application_account_statement_data(path)
-        records.append(income)
+    records = map_files(
+        extract_pdf_application_account_statement_data,
+        path_list,
+        jobs=jobs,
+        backend=backend,
+    )
 
     df = pd.DataFrame(records)
     df["PERÍODO"] = df["PERÍODO"].str.replace("_", "/")
     return df
+
+
+# Cabeçalho da tabela de movimentos do extrato de investimentos (TXT do BB)
+TXT_APPLICATION_HEADER = (
+    "Data     Histórico                            Valor      Valor IR   Prej. Comp."
+    "   Valor IOF        Quantidade cotas       Valor cota             Saldo cotas"
+)
+
+# Colunas de largura fixa: (nome, início, fim) de cada campo na linha
+TXT_APPLICATION_COLUMNS = [
+    ("DATA", 0, 10),
+    ("HIST", 10, 40),
+    ("VALOR", 40, 54),
+    ("VALOR_IR", 54, 68),
+    ("PREJ_COMP", 68, 82),
+    ("VALOR_IOF", 82, 94),
+    ("QTD_COTAS", 94, 118),
+    ("VALOR_COTA", 118, 135),
+    ("SALDO_COTAS", 135, 159),
+]
+
+# Colunas numéricas no formato brasileiro (1.234,56)
+TXT_APPLICATION_NUMERIC_COLUMNS = [name for name, _, _ in TXT_APPLICATION_COLUMNS[2:]]
+
+
+def parse_brazilian_number(text: str) -> float:
+    """
+    Converte um número no formato brasileiro (ex.: "1.234,56") em float.
+
+    Parâmetros:
+        text (str): Texto do campo; vazio resulta em NaN.
+
+    Retorna:
+        float: Valor numérico.
+    """
+    text = text.strip()
+    if not text:
+        return float("nan")
+    return float(text.replace(".", "").replace(",", "."))
+
+
+def iter_txt_application_account_statement_records(path: str):
+    """
+    Percorre, linha a linha, a tabela de movimentos de um extrato de
+    investimentos do BB em TXT e gera um registro por linha.
+
+    As sublinhas "Aplicação dd/mm/aaaa" de um RESGATE indicam de qual aplicação
+    saíram as cotas resgatadas: recebem a data do resgate em DATA, HIST
+    "Aplicação" e a data de origem em DATA_APLICACAO.
+
+    Parâmetros:
+        path (str): Caminho completo do arquivo TXT.
+
+    Retorna:
+        Iterator[dict]: Registros com as colunas de TXT_APPLICATION_COLUMNS e
+            DATA_APLICACAO.
+    """
+    with open(path, encoding="ISO-8859-1") as file:
+        # Avança até o cabeçalho da tabela
+        for line in file:
+            if line.strip() == TXT_APPLICATION_HEADER:
+                break
+        else:
+            raise ValueError(f"Tabela de movimentos não encontrada no TXT: {path}")
+
+        date = None
+        for line in file:
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                break  # a tabela termina na primeira linha em branco
+
+            fields = {
+                name: line[start:end] for name, start, end in TXT_APPLICATION_COLUMNS
+            }
+            record = {
+                name: parse_brazilian_number(fields[name])
+                for name in TXT_APPLICATION_NUMERIC_COLUMNS
+            }
+
+            hist = fields["HIST"].strip()
+            if fields["DATA"].strip():
+                date = fields["DATA"].strip()
+                record["HIST"] = hist
+                record["DATA_APLICACAO"] = None
+            elif hist.startswith("Aplicação") and date is not None:
+                record["HIST"] = "Aplicação"
+                record["DATA_APLICACAO"] = hist.split()[-1]
+            else:
+                raise ValueError(f"Linha inesperada no TXT {path}: {line!r}")
+
+            record["DATA"] = date
+            yield record
+
+
+@cache_extract(version=1)
+def extract_txt_application_account_statement_data(path: str) -> pd.DataFrame:
+    """
+    Lê a tabela de movimentos (APLICAÇÃO, RESGATE, saldos, cotas, IR e IOF)
+    de um extrato de investimentos do BB em TXT, em uma única passagem.
+
+    Parâmetros:
+        path (str): Caminho completo do arquivo TXT.
+
+    Retorna:
+        pd.DataFrame: Um movimento por linha, com datas em datetime e valores,
+            cotas e valor da cota numéricos.
+    """
+    df = pd.DataFrame(
+        iter_txt_application_account_statement_records(path),
+        columns=["DATA", "HIST", "DATA_APLICACAO"] + TXT_APPLICATION_NUMERIC_COLUMNS,
+    )
+    df["DATA"] = pd.to_datetime(df["DATA"], format="%d/%m/%Y")
+    df["DATA_APLICACAO"] = pd.to_datetime(df["DATA_APLICACAO"], format="%d/%m/%Y")
+    return df
+
+
+def extract_all_txt_application_account_statement_data(
+    path_base: str, suffix: str = "Extrato_Conta_Aplicação.txt", jobs: int = 1
+) -> pd.DataFrame:
+    """
+    Lê todos os extratos de investimentos em TXT de uma pasta.
+
+    Parâmetros:
+        path_base (str): Caminho da pasta contendo os TXT.
+        suffix (str, opcional): Sufixo que o arquivo deve ter.
+        jobs (int, opcional): Número de processos para ler os arquivos em paralelo
+            (None ou <= 0 usa todos os núcleos). Padrão: 1.
+
+    Retorna:
+        pd.DataFrame: Movimentos de todos os arquivos, na ordem dos arquivos.
+    """
+    path_list = list_files_by_prefix_suffix(path_base, suffix=suffix)
+    if not path_list:
+        raise FileNotFoundError(f"Nenhum arquivo TXT encontrado em {path_base}")
+
+    dfs = map_files(
+        extract_txt_application_account_statement_data, path_list, jobs=jobs
+    )
+    return pd.concat(dfs, ignore_index=True)
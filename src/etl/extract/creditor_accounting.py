@@ -7,7 +7,16 @@ from pathlib import Path
 
 import pandas as pd
 
-from utils.file_paths import list_files_by_prefix_suffix
+from src.utils.cache import cache_extract
+from src.utils.file_paths import list_files_by_prefix_suffix
+
+
+@cache_extract(version=1)
+def read_excel_creditor_accounting_file(file_path: str | Path) -> pd.DataFrame:
+    """
+    Lê a planilha bruta de execução financeira por credor.
+    """
+    return pd.read_excel(file_path, sheet_name="Planilha 1", skiprows=4)
 
 
 def extract_excel_creditor_accounting_data(
@@ -21,5 +30,5 @@ def extract_excel_creditor_accounting_data(
         prefix="Demonstrativo da Execução Financeira por Credor",
         suffix=f"{bi}B.xls",
     )[0]
-    df = pd.read_excel(file_path, sheet_name="Planilha 1", skiprows=4)
+    df = read_excel_creditor_accounting_file(file_path)
     return df
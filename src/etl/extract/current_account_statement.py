@@ -2,15 +2,38 @@
 Módulo para ingestão de dados de extratos bancários da conta corrente.
 """
 
+import csv
+import json
 import os
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from src.utils.cache import cache_extract
+from src.utils.config import CACHE_DIR
 from src.utils.file_paths import list_files_by_prefix_suffix
+from src.utils.io import file_lock
+from src.utils.parallel import map_files
+from src.utils.pdf import find_words_positions, read_pdf_text_table
 
+# Nomes das colunas do extrato da conta corrente em PDF
+PDF_CURRENT_ACCOUNT_COLUMNS = [
+    "DATA",
+    "AG_O",
+    "LOTE",
+    "COD_HIST",
+    "HIST",
+    "DOC",
+    "VALOR",
+    "INF",
+    "SALDO",
+]
 
+
+@cache_extract(version=1)
 def extract_pdf_current_account_statement_data(
-    path: str, column_areas: list[int] | None = None
+    path: str, column_areas: list[int] | None = None, backend: str = "tabula"
 ) -> pd.DataFrame:
     """
     Lê um PDF de extrato bancário e retorna o DataFrame bruto.
@@ -18,14 +41,27 @@ def extract_pdf_current_account_statement_data(
     Parâmetros:
         path (str): Caminho para a pasta onde o arquivo está.
         column_areas (list): Lista python com as posições, em pontos, das colunas no PDF.
+        backend (str, opcional): "tabula" (JVM) ou "text" (camada de texto do PDF,
+            sem JVM). Ambos retornam o mesmo DataFrame.
 
     Retorna:
         pd.DataFrame: Dados brutos extraídos do PDF.
     """
-    import tabula as tb
-
     if column_areas is None:
         column_areas = [177, 222, 244, 260, 380, 458, 511, 522, 595]
+
+    if backend == "text":
+        return read_pdf_text_table(
+            path,
+            columns=column_areas,
+            names=PDF_CURRENT_ACCOUNT_COLUMNS,
+            area=[0, 0, 842, 595],
+        )
+    if backend != "tabula":
+        raise ValueError(f"Backend de leitura de PDF desconhecido: {backend}")
+
+    import tabula as tb
+
     df_list = tb.read_pdf(
         input_path=path,
         pages="all",
@@ -33,19 +69,7 @@ def extract_pdf_current_account_statement_data(
         area=[0, 0, 842, 595],
         columns=column_areas,
         multiple_tables=False,
-        pandas_options={
-            "names": [
-                "DATA",
-                "AG_O",
-                "LOTE",
-                "COD_HIST",
-                "HIST",
-                "DOC",
-                "VALOR",
-                "INF",
-                "SALDO",
-            ]
-        },
+        pandas_options={"names": PDF_CURRENT_ACCOUNT_COLUMNS},
         encoding="ISO-8859-1",
     )
     result = df_list[0]
@@ -54,6 +78,78 @@ def extract_pdf_current_account_statement_data(
     return result  # Retorna DataFrame bruto
 
 
+# Históricos que, no extrato, informam apenas o saldo (não são lançamentos)
+CSV_BALANCE_HISTORIES = ("Saldo Anterior", "S A L D O")
+
+
+@cache_extract(version=1)
+def extract_csv_current_account_statement_data(path: str) -> pd.DataFrame:
+    """
+    Lê um CSV de extrato da conta corrente exportado pelo Banco do Brasil
+    (separado por ';', codificação ISO-8859-1) em uma única passada.
+
+    O resultado segue o mesmo esquema de colunas do DataFrame bruto do PDF,
+    inclusive com o detalhamento do histórico em uma linha própria sem data,
+    para que possa ser tratado por transform_pdf_current_account_statement_data.
+
+    Parâmetros:
+        path (str): Caminho completo do arquivo CSV.
+
+    Retorna:
+        pd.DataFrame: Dados brutos com DATA em datetime, VALOR e SALDO em float.
+    """
+    records = []
+    with open(path, encoding="ISO-8859-1", newline="") as file:
+        for row in csv.reader(file, delimiter=";"):
+            if len(row) < 12:
+                continue
+
+            # Agência; Conta; Observação; Dt. balancete; Dt. movimento;
+            # Ag. origem; Lote; Documento; Cód. histórico; Histórico;
+            # Valor; C/D; Detalhamento do histórico
+            row = [field.strip() for field in row]
+            data = row[3].replace(".", "/")
+            hist = row[9]
+            valor = float(row[10].replace(".", "").replace(",", "."))
+            inf = row[11].upper()
+            detail = row[12] if len(row) > 12 else ""
+
+            # Mesmo formato do documento no PDF (ex.: '00000000000001972' -> '1.972')
+            doc = f"{int(row[7]):,}".replace(",", ".") if row[7].isdigit() else row[7]
+
+            # Linhas de saldo não são lançamentos: valor vai para a coluna SALDO
+            if hist in CSV_BALANCE_HISTORIES:
+                saldo = valor if inf == "C" else -valor
+                records.append(
+                    (data, row[5], row[6], row[8], hist, None, None, None, saldo)
+                )
+                continue
+
+            records.append((data, row[5], row[6], row[8], hist, doc, valor, inf, None))
+            if detail:
+                records.append((None, None, None, None, detail, None, None, None, None))
+
+    df = pd.DataFrame.from_records(
+        records,
+        columns=[
+            "DATA",
+            "AG_O",
+            "LOTE",
+            "COD_HIST",
+            "HIST",
+            "DOC",
+            "VALOR",
+            "INF",
+            "SALDO",
+        ],
+    )
+    df["DATA"] = pd.to_datetime(df["DATA"], format="%d/%m/%Y")
+    df["VALOR"] = df["VALOR"].astype("float64")
+    df["SALDO"] = df["SALDO"].astype("float64")
+    return df
+
+
+@cache_extract(version=1)
 def extract_excel_bank_current_account_data(file_path: str) -> pd.DataFrame:
     """
     Lê um único arquivo Excel de extrato bancário e retorna um DataFrame bruto.
@@ -70,8 +166,161 @@ def extract_excel_bank_current_account_data(file_path: str) -> pd.DataFrame:
     return df
 
 
+# Palavras do cabeçalho da página 1 usadas para reconhecer o layout das colunas
+PDF_CURRENT_ACCOUNT_HEADER_WORDS = [
+    "origem",
+    "Lote",
+    "Histórico",
+    "Documento",
+    "Valor",
+    "Saldo",
+]
+
+# Layouts conhecidos: posição (pt) das palavras do cabeçalho e das colunas
+PDF_CURRENT_ACCOUNT_LAYOUTS = [
+    {
+        "header": [194.4, 226.7, 248.6, 412.7, 488.0, 525.3],
+        "columns": [177, 222, 244, 260, 380, 458, 511, 522, 595],
+    },
+]
+
+# Diferença máxima (pt) entre cabeçalhos de um mesmo layout
+PDF_LAYOUT_TOLERANCE = 4.0
+
+# Registro em disco das colunas já definidas para cada layout (fingerprint)
+PDF_LAYOUT_REGISTRY_PATH = CACHE_DIR / "pdf_layouts.json"
+
+
+def load_pdf_layout_registry(
+    registry_path: str | Path = PDF_LAYOUT_REGISTRY_PATH,
+) -> dict[str, list[float]]:
+    """
+    Lê o registro de layouts de PDF (fingerprint -> posições das colunas).
+
+    Parâmetros:
+        registry_path (str | Path, opcional): Caminho do arquivo JSON do registro.
+
+    Retorna:
+        dict: Registro de layouts; vazio se o arquivo não existir.
+    """
+    registry_path = Path(registry_path)
+    if not registry_path.exists():
+        return {}
+    with open(registry_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_pdf_layout_registry(
+    registry: dict[str, list[float]],
+    registry_path: str | Path = PDF_LAYOUT_REGISTRY_PATH,
+) -> None:
+    """
+    Grava o registro de layouts de PDF de forma atômica.
+
+    Parâmetros:
+        registry (dict): Registro de layouts (fingerprint -> posições das colunas).
+        registry_path (str | Path, opcional): Caminho do arquivo JSON do registro.
+    """
+    registry_path = Path(registry_path)
+    registry_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = registry_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(registry, file, indent=4, sort_keys=True)
+    os.replace(tmp_path, registry_path)
+
+
+def derive_pdf_current_account_columns(header: list[float]) -> list[float]:
+    """
+    Define as posições das colunas a partir das posições do cabeçalho.
+
+    Se o cabeçalho coincidir (dentro de PDF_LAYOUT_TOLERANCE) com um layout
+    conhecido, usa as colunas dele; caso contrário, ajusta uma transformação
+    linear (deslocamento e escala) entre o cabeçalho do primeiro layout conhecido
+    e o cabeçalho lido, e a aplica às colunas desse layout.
+
+    Parâmetros:
+        header (list[float]): Posições de PDF_CURRENT_ACCOUNT_HEADER_WORDS.
+
+    Retorna:
+        list[float]: Posições das colunas.
+    """
+    for layout in PDF_CURRENT_ACCOUNT_LAYOUTS:
+        distance = max(abs(x - ref) for x, ref in zip(header, layout["header"]))
+        if distance <= PDF_LAYOUT_TOLERANCE:
+            return list(layout["columns"])
+
+    reference = PDF_CURRENT_ACCOUNT_LAYOUTS[0]
+    scale, offset = np.polyfit(reference["header"], header, deg=1)
+    residual = np.abs(scale * np.array(reference["header"]) + offset - header).max()
+    if residual > PDF_LAYOUT_TOLERANCE:
+        raise ValueError(f"Layout de colunas do PDF não reconhecido: {header}")
+
+    # A última fronteira é a borda da página e não se desloca
+    columns = [float(round(scale * x + offset, 1)) for x in reference["columns"][:-1]]
+    return columns + [reference["columns"][-1]]
+
+
+def detect_pdf_current_account_layout(
+    path: str, registry_path: str | Path = PDF_LAYOUT_REGISTRY_PATH
+) -> list[float]:
+    """
+    Identifica as posições das colunas de um extrato em PDF lendo apenas o
+    cabeçalho da página 1. O resultado fica salvo no registro de layouts, por
+    fingerprint (posições do cabeçalho arredondadas), para as próximas leituras;
+    a atualização do registro é protegida por src.utils.io.file_lock.
+
+    Parâmetros:
+        path (str): Caminho completo do arquivo PDF.
+        registry_path (str | Path, opcional): Caminho do arquivo JSON do registro.
+
+    Retorna:
+        list[float]: Posições das colunas a serem usadas na extração.
+    """
+    positions = find_words_positions(path, PDF_CURRENT_ACCOUNT_HEADER_WORDS)
+    if positions is None:
+        raise ValueError(f"Cabeçalho do extrato não encontrado no PDF: {path}")
+
+    header = [positions[word] for word in PDF_CURRENT_ACCOUNT_HEADER_WORDS]
+    fingerprint = "-".join(f"{x:.0f}" for x in header)
+
+    registry = load_pdf_layout_registry(registry_path)
+    if fingerprint in registry:
+        return registry[fingerprint]
+
+    # Leitura, alteração e gravação sob trava: outros processos de leitura
+    # podem estar registrando layouts novos ao mesmo tempo
+    columns = derive_pdf_current_account_columns(header)
+    with file_lock(str(registry_path)):
+        registry = load_pdf_layout_registry(registry_path)
+        registry.setdefault(fingerprint, columns)
+        save_pdf_layout_registry(registry, registry_path)
+    return registry[fingerprint]
+
+
+def extract_pdf_current_account_statement_data_auto_layout(
+    path: str, backend: str = "tabula"
+) -> pd.DataFrame:
+    """
+    Lê um PDF de extrato bancário com as colunas detectadas pelo cabeçalho
+    (detect_pdf_current_account_layout), em uma única leitura do arquivo.
+    O cache fica na leitura (extract_pdf_current_account_statement_data),
+    chaveada pelas colunas detectadas: cada PDF ocupa uma única entrada.
+
+    Parâmetros:
+        path (str): Caminho completo do arquivo PDF.
+        backend (str, opcional): Leitor de PDF ("tabula" ou "text").
+
+    Retorna:
+        pd.DataFrame: Dados brutos extraídos do PDF.
+    """
+    column_areas = detect_pdf_current_account_layout(path)
+    return extract_pdf_current_account_statement_data(
+        path=path, column_areas=column_areas, backend=backend
+    )
+
+
 def extract_all_pdf_current_account_statement_data(
-    path_base: str, suffix: str
+    path_base: str, suffix: str, backend: str = "tabula", jobs: int = 1
 ) -> pd.DataFrame:
     """
     Lê todos os arquivos PDF de extratos bancários da conta corrente em uma pasta.
@@ -79,48 +328,66 @@ def extract_all_pdf_current_account_statement_data(
     Parâmetros:
         path_base (str): Caminho da pasta contendo os PDFs.
         suffix (str): Sufixo que o arquivo deve ter (ex.: 'Extrato_Conta_Corrente.pdf').
+        backend (str, opcional): Leitor de PDF ("tabula" ou "text").
+        jobs (int, opcional): Número de processos para ler os arquivos em paralelo
+            (None ou <= 0 usa todos os núcleos). Padrão: 1.
 
     Retorna:
-        pd.DataFrame: Dados concatenados de todos os PDFs.
+        pd.DataFrame: Dados concatenados de todos os PDFs, na ordem dos arquivos.
     """
 
     path_list = list_files_by_prefix_suffix(path_base, suffix=suffix)
-    area_columns = [
-        [177, 222, 244, 260, 380, 458, 511, 522, 595],  # fev/mar/abr
-        [176, 225, 250, 269, 398, 451, 511.8, 519.4, 595],  # jan
-    ]
+    if not path_list:
+        raise FileNotFoundError(f"Nenhum arquivo PDF encontrado em {path_base}")
 
-    dfs = []
-    for path in path_list:
-        try:
-            df = extract_pdf_current_account_statement_data(
-                path=path, column_areas=area_columns[0]
-            )
-        except Exception:
-            df = extract_pdf_current_account_statement_data(
-                path=path, column_areas=area_columns[1]
-            )
-        dfs.append(df)
-
-    if not dfs:
-        raise FileNotFoundError(f"Nenhum arquivo PDF encontrado em {path}")
+    dfs = map_files(
+        extract_pdf_current_account_statement_data_auto_layout,
+        path_list,
+        jobs=jobs,
+        backend=backend,
+    )
+    return pd.concat(dfs, axis=0)
+
+
+def extract_all_csv_current_account_statement_data(
+    path_base: str, suffix: str = "Extrato_Conta_Corrente.csv"
+) -> pd.DataFrame:
+    """
+    Lê todos os arquivos CSV de extratos bancários da conta corrente em uma pasta.
 
+    Parâmetros:
+        path_base (str): Caminho da pasta contendo os CSVs.
+        suffix (str): Sufixo que o arquivo deve ter (ex.: 'Extrato_Conta_Corrente.csv').
+
+    Retorna:
+        pd.DataFrame: Dados concatenados de todos os CSVs.
+    """
+    path_list = list_files_by_prefix_suffix(path_base, suffix=suffix)
+    if not path_list:
+        raise FileNotFoundError(f"Nenhum arquivo CSV encontrado em {path_base}")
+
+    dfs = [extract_csv_current_account_statement_data(path) for path in path_list]
     return pd.concat(dfs, axis=0)
 
 
-def extract_all_excel_banks_current_account_data(folder_path: str) -> pd.DataFrame:
+def extract_all_excel_banks_current_account_data(
+    folder_path: str, jobs: int = 1
+) -> pd.DataFrame:
     """
     Lê todos os arquivos .xlsx de uma pasta usando load_excel_bank e concatena.
-    """
-    list_dfs = []
-    for file in os.listdir(folder_path):
-        if file.lower().endswith(".xlsx"):
-            df = extract_excel_bank_current_account_data(
-                os.path.join(folder_path, file)
-            )
-            list_dfs.append(df)
 
-    if not list_dfs:
+    Parâmetros:
+        folder_path (str): Caminho da pasta contendo os arquivos .xlsx.
+        jobs (int, opcional): Número de processos para ler os arquivos em paralelo
+            (None ou <= 0 usa todos os núcleos). Padrão: 1.
+    """
+    file_paths = [
+        os.path.join(folder_path, file)
+        for file in os.listdir(folder_path)
+        if file.lower().endswith(".xlsx")
+    ]
+    if not file_paths:
         raise FileNotFoundError(f"Nenhum arquivo .xlsx encontrado em {folder_path}")
 
+    list_dfs = map_files(extract_excel_bank_current_account_data, file_paths, jobs=jobs)
     return pd.concat(list_dfs, axis="rows")
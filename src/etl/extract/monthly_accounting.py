@@ -2,7 +2,16 @@ from pathlib import Path
 
 import pandas as pd
 
-from utils.file_paths import list_files_by_prefix_suffix
+from src.utils.cache import cache_extract
+from src.utils.file_paths import list_files_by_prefix_suffix
+
+
+@cache_extract(version=1)
+def read_excel_monthly_accounting_file(file_path: str | Path) -> pd.DataFrame:
+    """
+    Lê a planilha bruta de execução financeira por mês.
+    """
+    return pd.read_excel(io=file_path, sheet_name="Planilha 1", skiprows=4)
 
 
 def extract_excel_monthly_accounting_data(
@@ -18,7 +27,5 @@ def extract_excel_monthly_accounting_data(
         suffix=f"{bi}B.xls",
     )[0]
     # Leitura
-    monthly_accounting_data = pd.read_excel(
-        io=file_path, sheet_name="Planilha 1", skiprows=4
-    )
+    monthly_accounting_data = read_excel_monthly_accounting_file(file_path)
     return monthly_accounting_data
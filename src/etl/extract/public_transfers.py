@@ -4,11 +4,78 @@ Módulo de ingestão de dados do FNDE.
 
 import pandas as pd
 
-from src.etl.transform.public_transfers import (
-    filter_uf_fnde_sheet_data,
-    transform_fnde_sheet_data,
-)
-from src.utils.excel import filter_sheet_names
+from src.etl.transform.public_transfers import fnde_sheets_long_format
+from src.utils.cache import cache_extract
+
+# Blocos de cada planilha do FNDE: ajuste -> linha do cabeçalho (skiprows)
+FNDE_BLOCKS = {False: 7, True: 46}
+
+# Linhas lidas abaixo do cabeçalho de cada bloco
+FNDE_BLOCK_ROWS = 38
+
+# Planilhas de totalização, ignoradas na extração
+FNDE_TOTAL_SHEETS = ["Tot1_U", "Tot2_E", "TOTAL"]
+
+# Esferas (prefixo das planilhas) e tipos de valor da tabela nacional
+FNDE_STATE_LEVELS = ["E", "M"]
+FNDE_VALUE_TYPES = {False: "LÍQUIDO", True: "AJUSTE"}
+
+
+def fnde_sheet_names(sheet_names: list[str], state_level: str) -> list[str]:
+    """
+    Seleciona as planilhas de uma esfera (por origem do recurso), sem as
+    planilhas de totalização.
+
+    Parâmetros:
+        sheet_names (list[str]): Planilhas do arquivo do FNDE.
+        state_level (str): Esfera ("E" estadual, "M" municipal).
+
+    Retorna:
+        list[str]: Planilhas selecionadas, na ordem do arquivo.
+    """
+    totals = {f"{state_level}_{name}" for name in FNDE_TOTAL_SHEETS}
+    return [
+        name
+        for name in sheet_names
+        if name.startswith(state_level) and name not in totals
+    ]
+
+
+def _fnde_block(grid: pd.DataFrame, skiprows: int) -> pd.DataFrame:
+    """
+    Recorta um bloco de uma planilha do FNDE lida sem cabeçalho, com o mesmo
+    resultado de pd.read_excel(skiprows=skiprows, index_col="UF", nrows=38).
+    """
+    block = grid.iloc[skiprows : skiprows + FNDE_BLOCK_ROWS + 1]
+    header = [
+        name if pd.notna(name) else f"Unnamed: {position}"
+        for position, name in enumerate(block.iloc[0])
+    ]
+    data = block.iloc[1:].set_axis(header, axis=1)
+    return data.set_index("UF").infer_objects()
+
+
+@cache_extract(version=1)
+def extract_fnde_workbook_data(file_path: str) -> dict[bool, dict[str, pd.DataFrame]]:
+    """
+    Lê o arquivo Excel do FNDE uma única vez e recorta, de cada planilha das
+    duas esferas, o bloco dos valores líquidos e o bloco de ajustes.
+
+    Parâmetros:
+        file_path (str): Caminho completo do arquivo Excel.
+
+    Retorna:
+        dict: Ajuste (False: valores líquidos, True: ajustes) -> nome da
+            planilha -> DataFrame bruto do bloco, indexado pela UF.
+    """
+    blocks = {adjust: {} for adjust in FNDE_BLOCKS}
+    with pd.ExcelFile(file_path) as workbook:
+        for state_level in FNDE_STATE_LEVELS:
+            for name in fnde_sheet_names(workbook.sheet_names, state_level):
+                grid = workbook.parse(name, header=None)
+                for adjust, skiprows in FNDE_BLOCKS.items():
+                    blocks[adjust][name] = _fnde_block(grid, skiprows)
+    return blocks
 
 
 def extract_fnde_sheet_data(
@@ -22,26 +89,17 @@ def extract_fnde_sheet_data(
     Parâmetros:
         file_path (str): Caminho completo do arquivo Excel.
         sheet_name (str): Nome da planilha a ser lida. Padrão: "E_TOTAL".
-        skiprows (int, opcional): Número de linhas a serem puladas no início. Padrão: 7.
-        index_col (str, opcional): Coluna a ser usada como índice. Padrão: "UF".
+        adjust (bool, opcional): Se True, lê o bloco de ajustes. Padrão: False.
 
     Retorna:
         pd.DataFrame: DataFrame com os dados brutos da planilha.
                       Retorna DataFrame vazio se ocorrer erro na leitura.
     """
-    skiprows = 46 if adjust else 7
     try:
-        df = pd.read_excel(
-            io=file_path,
-            sheet_name=sheet_name,
-            skiprows=skiprows,
-            index_col="UF",
-            nrows=38,
-        )
-        return df
+        return extract_fnde_workbook_data(file_path)[adjust][sheet_name]
     except FileNotFoundError:
         print(f"Arquivo não encontrado: {file_path}")
-    except ValueError as e:
+    except (KeyError, ValueError) as e:
         print(f"Erro ao ler a planilha '{sheet_name}' em {file_path}: {e}")
     except Exception as e:
         print(f"Erro inesperado ao carregar dados do FNDE: {e}")
@@ -49,31 +107,100 @@ def extract_fnde_sheet_data(
     return pd.DataFrame()
 
 
+@cache_extract(version=1)
+def extract_fnde_national_data(file_path: str, year: int = 2025) -> pd.DataFrame:
+    """
+    Tabela nacional dos repasses do FNDE no formato longo: todas as UFs, as
+    duas esferas, todas as origens do recurso e os dois blocos (valores
+    líquidos e ajustes), lidos de uma só vez do arquivo.
+
+    Recortes por UF, esfera ou origem são filtros sobre esta tabela (as
+    colunas de texto são categóricas).
+
+    Parâmetros:
+        file_path (str): Caminho completo do arquivo Excel.
+        year (int, opcional): Ano de referência do arquivo. Padrão: 2025.
+
+    Retorna:
+        pd.DataFrame: Colunas "ANO", "MÊS" (pd.Period mensal), "UF", "ESFERA"
+            ("E" ou "M"), "ORIGEM" (ex.: "FPE", "COUN_VAAF"), "TIPO" ("LÍQUIDO"
+            ou "AJUSTE") e "VALOR" (reais).
+    """
+    blocks = extract_fnde_workbook_data(file_path)
+    national = pd.concat(
+        [
+            fnde_sheets_long_format(sheets, year).assign(TIPO=value_type)
+            for adjust, value_type in FNDE_VALUE_TYPES.items()
+            for sheets in [blocks[adjust]]
+        ],
+        ignore_index=True,
+    )
+
+    # "E_COUN_VAAF" -> esfera "E", origem "COUN_VAAF" (ordem das planilhas)
+    sheet_names = pd.unique(national["PLANILHA"])
+    level_and_source = pd.Series(sheet_names).str.split("_", n=1, expand=True)
+    sources = pd.unique(level_and_source[1])
+    levels = dict(zip(sheet_names, level_and_source[0]))
+    source_of = dict(zip(sheet_names, level_and_source[1]))
+
+    national["ANO"] = year
+    national["ESFERA"] = pd.Categorical(
+        national["PLANILHA"].map(levels), categories=FNDE_STATE_LEVELS
+    )
+    national["ORIGEM"] = pd.Categorical(
+        national["PLANILHA"].map(source_of), categories=sources
+    )
+    national["UF"] = national["UF"].astype("category")
+    national["TIPO"] = pd.Categorical(
+        national["TIPO"], categories=list(FNDE_VALUE_TYPES.values())
+    )
+    return national[["ANO", "MÊS", "UF", "ESFERA", "ORIGEM", "TIPO", "VALOR"]]
+
+
 def extract_all_fnde_sheet_data(
     file_path: str, state_level: str, uf: str, adjust: bool = False, year: int = 2025
 ) -> pd.DataFrame:
+    """
+    Tabela mensal dos repasses do FNDE a uma UF, uma coluna por origem do
+    recurso (planilha), com as colunas e a linha "TOTAL".
+
+    É um recorte da tabela nacional (extract_fnde_national_data), girado uma
+    única vez.
+
+    Parâmetros:
+        file_path (str): Caminho completo do arquivo Excel.
+        state_level (str): Esfera ("E" estadual, "M" municipal).
+        uf (str): Sigla da UF.
+        adjust (bool, opcional): Se True, lê o bloco de ajustes (colunas com o
+            sufixo "_AJUSTES"). Padrão: False.
+        year (int, opcional): Ano de referência. Padrão: 2025.
+
+    Retorna:
+        pd.DataFrame: Valores por mês ("MM/AAAA") e planilha.
+
+    Levanta:
+        ValueError: Se a UF não estiver nas planilhas.
+    """
     uf = uf.upper()
     state_level = state_level.upper()
-    filtered_sheet_names = filter_sheet_names(file_path, state_level)
-    filtered_sheet_names_copy = filtered_sheet_names.copy()
-    for name in filtered_sheet_names_copy:
-        if name in [
-            f"{state_level}_Tot1_U",
-            f"{state_level}_Tot2_E",
-            f"{state_level}_TOTAL",
-        ]:
-            filtered_sheet_names.remove(name)
-
-    df_base = pd.DataFrame(columns=["MÊS"])
-    for name in filtered_sheet_names:
-        raw_df_new = extract_fnde_sheet_data(file_path, name, adjust)
-        clean_df_new = transform_fnde_sheet_data(raw_df_new)
-        filtered_df_new = filter_uf_fnde_sheet_data(
-            clean_df_new, name, uf, adjusts=adjust, year=year
-        )
-        df_base = pd.merge(df_base, filtered_df_new, on="MÊS", how="outer")
+    national = extract_fnde_national_data(file_path, year)
+    selected = national.loc[
+        (national["UF"] == uf)
+        & (national["ESFERA"] == state_level)
+        & (national["TIPO"] == FNDE_VALUE_TYPES[adjust])
+    ]
+    if selected.empty:
+        raise ValueError(f"UF {uf} não encontrada no DataFrame.")
+
+    df_base = selected.pivot(index="MÊS", columns="ORIGEM", values="VALOR")
+    df_base = df_base.loc[:, selected["ORIGEM"].unique()]
+    df_base.columns = [
+        f"{state_level}_{source}" + ("_AJUSTES" if adjust else "")
+        for source in df_base.columns
+    ]
+    df_base.index = df_base.index.strftime("%m/%Y").rename("MÊS")
+
     # Adição de Totalização
-    df_base.set_index("MÊS", inplace=True)
     df_base["TOTAL"] = df_base.sum(axis=1)
     df_base.loc["TOTAL", :] = df_base.sum(axis=0)
     return df_base
@@ -3,9 +3,12 @@ from pathlib import Path
 import pandas as pd
 
 from src.etl.transform.re import transform_excel_re_data
+from src.utils.cache import cache_extract
 from src.utils.file_paths import list_files_by_prefix_suffix
+from src.utils.parallel import map_files
 
 
+@cache_extract(version=1)
 def extract_excel_re_data(
     file_path: str, sheet_name: str = "Planilha 1", skiprows: int = 7
 ) -> pd.DataFrame:
@@ -27,12 +30,30 @@ def extract_excel_re_data(
     return pd.read_excel(file, sheet_name=sheet_name, skiprows=skiprows)
 
 
-def extract_all_excel_res_data(base_dir: str, prefix: str = "2025RE") -> pd.DataFrame:
+def extract_and_transform_excel_re_data(file_path: str) -> pd.DataFrame:
+    """
+    Lê e limpa um único arquivo de RE em Excel.
+
+    Parâmetros:
+        file_path (str): Caminho completo do arquivo Excel.
+
+    Retorna:
+        pd.DataFrame: DataFrame limpo.
+    """
+    raw_df = extract_excel_re_data(file_path)
+    return transform_excel_re_data(raw_df)
+
+
+def extract_all_excel_res_data(
+    base_dir: str, prefix: str = "2025RE", jobs: int = 1
+) -> pd.DataFrame:
     """
     Consolida todos os relatórios Excel de um diretório em um único DataFrame.
 
     Parâmetros:
         path (str): Caminho para o diretório contendo os arquivos Excel.
+        jobs (int, opcional): Número de processos para ler os arquivos em paralelo
+            (None ou <= 0 usa todos os núcleos). Padrão: 1.
 
     Retorna:
         pd.DataFrame: DataFrame consolidado com coluna 'RE' indicando a origem.
@@ -46,15 +67,8 @@ def extract_all_excel_res_data(base_dir: str, prefix: str = "2025RE") -> pd.Data
     if not excel_files:
         raise FileNotFoundError(f"Nenhum arquivo Excel encontrado em {base_dir}")
 
-    dfs = []
-    keys = []
-
-    for file in excel_files:
-        file_path = Path(file)
-        raw_df = extract_excel_re_data(file)
-        clean_df = transform_excel_re_data(raw_df)
-        dfs.append(clean_df)
-        keys.append(file_path.stem)
+    dfs = map_files(extract_and_transform_excel_re_data, excel_files, jobs=jobs)
+    keys = [Path(file).stem for file in excel_files]
 
     consolidated_df = pd.concat(dfs, axis=0, keys=keys)
     consolidated_df = consolidated_df.reset_index(level=0).rename(
@@ -1,4 +1,8 @@
 # SYSTEM IMPORTS
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
 import pandas as pd
 
 from src.etl.extract.application_account_statement import (
@@ -9,16 +13,95 @@ from src.etl.extract.current_account_statement import (
     extract_all_excel_banks_current_account_data,
     extract_all_pdf_current_account_statement_data,
 )
+from src.etl.pipeline.runner import code_fingerprint
+from src.etl.schema import apply_ledger_schema, ledger_to_reais, to_cents
 from src.etl.transform.application_account_statement import (
     transform_pdf_applications_account_statemet_data,
 )
 from src.etl.transform.bank_statement import (
+    bank_statement_append,
     bank_statement_consolidation,
+    bank_statement_opening_checkpoint,
+    check_bank_statement_period,
+    opening_balance_entry,
 )
 from src.etl.transform.current_account_statement import (
     transform_pdf_current_account_statement_data,
 )
-from src.utils.io import save_dataframe_to_excel
+from src.utils.cache import file_content_hash
+from src.utils.file_paths import list_files_by_prefix_suffix
+from src.utils.io import (
+    append_ledger_partition,
+    load_json,
+    read_ledger,
+    read_ledger_checkpoint,
+    save_dataframe,
+    save_dataframe_to_excel,
+    save_json,
+)
+from src.utils.run_manifest import manifest_stage, new_run_manifest, record_run
+
+
+def bank_statement_branch(
+    account: str,
+    extract: Callable[..., pd.DataFrame],
+    transform: Callable[[pd.DataFrame], pd.DataFrame],
+    raw_dir: str,
+    base_dir: str,
+    suffix: str,
+    manifest: dict,
+    jobs: int = 1,
+) -> pd.DataFrame:
+    """
+    Ramo de uma conta no pipeline do extrato: extrai os arquivos brutos, grava
+    o extrato bruto em interin/, limpa e grava o extrato limpo em processed/.
+
+    Parâmetros:
+        account (str): Nome da conta (ex.: 'conta_corrente'), usado nos nomes
+            dos arquivos e das etapas do manifesto.
+        extract (Callable): Função de extração (path_base, suffix, jobs=...).
+        transform (Callable): Função de limpeza do extrato bruto.
+        raw_dir (str): Pasta dos arquivos brutos (ex.: raw/<ano>).
+        base_dir (str): Diretório base dos dados (interin/ e processed/).
+        suffix (str): Sufixo dos arquivos brutos da conta.
+        manifest (dict): Manifesto da execução.
+        jobs (int, opcional): Número de processos para ler os arquivos.
+
+    Retorna:
+        pd.DataFrame: Extrato limpo da conta.
+    """
+    with manifest_stage(manifest, f"extrair_{account}") as stage:
+        stage["files_read"] = list_files_by_prefix_suffix(raw_dir, suffix=suffix)
+        raw_data = extract(raw_dir, suffix, jobs=jobs)
+        stage["rows_out"] = len(raw_data)
+
+    with manifest_stage(manifest, f"salvar_interin_{account}") as stage:
+        stage["rows_in"] = len(raw_data)
+        stage["files_written"] = [
+            save_dataframe(
+                df=raw_data,
+                name=f"extrato_{account}_bruto",
+                folder=os.path.join(base_dir, "interin"),
+            )
+        ]
+
+    with manifest_stage(manifest, f"limpar_{account}") as stage:
+        stage["rows_in"] = len(raw_data)
+        clean_data = transform(raw_data)
+        stage["rows_out"] = len(clean_data)
+
+    with manifest_stage(manifest, f"salvar_processed_{account}") as stage:
+        stage["rows_in"] = len(clean_data)
+        stage["files_written"] = [
+            save_dataframe(
+                df=clean_data,
+                name=f"extrato_{account}_limpo",
+                folder=os.path.join(base_dir, "processed"),
+                partition=True,
+            )
+        ]
+
+    return clean_data
 
 
 def run_bank_statement_pipeline(
@@ -27,76 +110,414 @@ def run_bank_statement_pipeline(
     base_dir: str = "..\\data",
     current_account_statement_suffix: str = "Extrato_Conta_Corrente.pdf",
     application_account_statement_suffix: str = "Extrato_Conta_Aplicação.pdf",
+    manifest_dir: str | None = None,
+    jobs: int = 1,
 ) -> pd.DataFrame:
     """
     Lê, limpa, consolida e exporta em excel os extratos da conta corrente e da conta de aplicações.
 
+    Os dados intermediários são salvos em Parquet (interin/ e processed/, este
+    particionado por ano/bimestre); só o extrato final é exportado em Excel.
+    Cada etapa é medida (tempo, linhas, bytes e memória) no manifesto da
+    execução (src.utils.run_manifest).
+
+    Com jobs != 1, os ramos da conta corrente e da conta de aplicações
+    (bank_statement_branch) correm em threads paralelas, e os arquivos de cada
+    ramo são lidos no pool de processos compartilhado (src.utils.parallel); a
+    consolidação espera apenas pelos dois extratos limpos. Nesse modo, as
+    etapas dos dois ramos são marcadas como simultâneas no manifesto
+    ("overlapped"): o tempo de CPU e a memória delas se sobrepõem, e o pico
+    de memória alocada (tracemalloc) não é medido nelas.
+
     Parâmetros:
         opening_balance (float): Saldo inicial a ser inserido no extrato consolidado.
-        year (int): Ano de referência para o saldo inicial.
-        base_dir (str, opcional): Diretório base onde estão os arquivos brutos.
+        year (int): Ano dos extratos (lidos de raw/<ano>) e do saldo inicial.
+        base_dir (str, opcional): Diretório base dos dados.
         current_account_statement_suffix (str, opcional): Sufixo do nome do arquivo da conta corrente (ex.: 'Extrato_Conta_Corrente.xls').
         application_account_statement_suffix (str, opcional): Sufixo do arquivo da conta de aplicações (ex.: 'Extrato_Conta_aplicações.xls').
+        manifest_dir (str, opcional): Pasta do manifesto da execução. Padrão:
+            <base_dir>/manifests.
+        jobs (int, opcional): Número de processos para ler os arquivos (None ou
+            <= 0 usa todos os núcleos). Padrão: 1 (tudo em sequência).
 
     Retorna:
-        pd.DataFrame: DataFrame consolidado com todas as transações e saldo acumulado.
+        pd.DataFrame: DataFrame consolidado com todas as transações e saldo acumulado,
+            com valores em centavos (os arquivos Excel são salvos em reais).
     """
-    # 1. Leitura dos dados brutos
-    raw_current_account_statement = extract_all_pdf_current_account_statement_data(
-        base_dir, current_account_statement_suffix
-    )
-    raw_application_account_statement = (
-        extract_all_pdf_application_account_statement_data(
-            base_dir, application_account_statement_suffix
-        )
+    manifest = new_run_manifest(
+        "extrato_bancário",
+        {"year": year, "opening_balance": opening_balance, "jobs": jobs},
     )
+    # O manifesto é gravado ao fim, mesmo se alguma etapa falhar
+    with record_run(manifest, manifest_dir or os.path.join(base_dir, "manifests")):
+        raw_dir = os.path.join(base_dir, "raw", str(year))
+        branches = {
+            "conta_corrente": (
+                extract_all_pdf_current_account_statement_data,
+                transform_pdf_current_account_statement_data,
+                current_account_statement_suffix,
+            ),
+            "conta_aplicação": (
+                extract_all_pdf_application_account_statement_data,
+                transform_pdf_applications_account_statemet_data,
+                application_account_statement_suffix,
+            ),
+        }
 
-    # 2. Salvar dados brutos em interin/
-    save_dataframe_to_excel(
-        df=raw_current_account_statement,
-        file_name="extrato_conta_corrente_bruto.xlsx",
-        folder=base_dir + "\\interin\\",
-    )
-    save_dataframe_to_excel(
-        df=raw_application_account_statement,
-        file_name="extrato_conta_aplicação_bruto.xlsx",
-        folder=base_dir + "\\interin\\",
+        # 1-4. Extração, gravação em interin/, limpeza e gravação em processed/:
+        # as duas contas são independentes e correm em paralelo se jobs != 1
+        with ThreadPoolExecutor(max_workers=1 if jobs == 1 else len(branches)) as pool:
+            futures = {
+                account: pool.submit(
+                    bank_statement_branch,
+                    account,
+                    extract,
+                    transform,
+                    raw_dir,
+                    base_dir,
+                    suffix,
+                    manifest,
+                    jobs,
+                )
+                for account, (extract, transform, suffix) in branches.items()
+            }
+            clean_current_account_statement = futures["conta_corrente"].result()
+            clean_application_account_statement = futures["conta_aplicação"].result()
+
+        # 5. Consolidação
+        with manifest_stage(manifest, "consolidar") as stage:
+            stage["rows_in"] = len(clean_current_account_statement) + len(
+                clean_application_account_statement
+            )
+            bank_statement = bank_statement_consolidation(
+                clean_application_account_statement,
+                clean_current_account_statement,
+                opening_balance,
+                year,
+            )
+            stage["rows_out"] = len(bank_statement)
+
+        # 6. Exportação do arquivo final para output/
+        with manifest_stage(manifest, "exportar_excel") as stage:
+            stage["rows_in"] = len(bank_statement)
+            stage["files_written"] = [
+                save_dataframe_to_excel(
+                    df=ledger_to_reais(bank_statement),
+                    file_name="extrato_bancário.xlsx",
+                    folder=os.path.join(base_dir, "output", "files"),
+                )
+            ]
+
+    return bank_statement
+
+
+def run_bank_statement_incremental_pipeline(
+    year: int,
+    month: int,
+    opening_balance: float | None = None,
+    base_dir: str = "..\\data",
+    current_account_statement_suffix: str = "Extrato_Conta_Corrente.pdf",
+    application_account_statement_suffix: str = "Extrato_Conta_Aplicação.pdf",
+    manifest_dir: str | None = None,
+) -> pd.DataFrame:
+    """
+    Fecha um único mês no extrato consolidado incremental: lê e limpa apenas os
+    extratos do mês e os acrescenta ao extrato já consolidado, calculando o
+    SALDO a partir do último checkpoint.
+
+    O extrato incremental fica em processed/extrato_bancário/, uma parte
+    Parquet por mês. Na primeira execução ele é criado com o saldo inicial,
+    em 31/12 do ano anterior. Os meses são incluídos em sequência, sem
+    lacunas: o extrato novo começa por janeiro, e cada mês deve ser o seguinte
+    ao último consolidado (verificado antes de ler os arquivos do mês). Cada
+    etapa é medida no manifesto da execução (src.utils.run_manifest).
+
+    Parâmetros:
+        year (int): Ano do mês a ser fechado.
+        month (int): Mês a ser fechado (1-12); deve ser o seguinte ao último
+            mês consolidado.
+        opening_balance (float, opcional): Saldo inicial, em reais. Obrigatório
+            apenas na criação do extrato.
+        base_dir (str, opcional): Diretório base dos dados.
+        current_account_statement_suffix (str, opcional): Sufixo do arquivo da
+            conta corrente.
+        application_account_statement_suffix (str, opcional): Sufixo do arquivo
+            da conta de aplicações.
+        manifest_dir (str, opcional): Pasta do manifesto da execução. Padrão:
+            <base_dir>/manifests.
+
+    Retorna:
+        pd.DataFrame: Lançamentos do mês, com valores em centavos.
+
+    Levanta:
+        ValueError: Se o mês já estiver consolidado ou deixar uma lacuna após o
+            último mês consolidado.
+    """
+    ledger_folder = os.path.join(base_dir, "processed", "extrato_bancário")
+
+    period_start = pd.Timestamp(year, month, 1)
+    period_end = period_start + pd.offsets.MonthEnd(0)
+
+    manifest = new_run_manifest(
+        "extrato_bancário_incremental", {"year": year, "month": month}
     )
+    # O manifesto é gravado ao fim, mesmo se alguma etapa falhar
+    with record_run(manifest, manifest_dir or os.path.join(base_dir, "manifests")):
+        # 1. Checkpoint do extrato consolidado (cria o extrato se necessário),
+        # só depois de verificar que o mês é o seguinte ao último consolidado
+        with manifest_stage(manifest, "checkpoint") as stage:
+            checkpoint = read_ledger_checkpoint(ledger_folder)
+            new_ledger = checkpoint is None
+            if new_ledger:
+                if opening_balance is None:
+                    raise ValueError("Informe opening_balance para criar o extrato.")
+                checkpoint = bank_statement_opening_checkpoint(opening_balance, year)
+            check_bank_statement_period(checkpoint, period_start, period_end)
+            if new_ledger:
+                stage["files_written"] = [
+                    append_ledger_partition(
+                        df=apply_ledger_schema(
+                            opening_balance_entry(opening_balance, year)
+                        ),
+                        checkpoint=checkpoint,
+                        folder=ledger_folder,
+                        name=f"{year - 1}-12-saldo_inicial",
+                    )
+                ]
+
+        # 2. Leitura e limpeza apenas dos extratos do mês
+        month_dir = os.path.join(
+            base_dir,
+            "raw",
+            str(year),
+            f"Bimestre_{(month + 1) // 2:02d}",
+            f"{month:02d}",
+        )
+        with manifest_stage(manifest, "extrair_e_limpar") as stage:
+            stage["files_read"] = [
+                path
+                for suffix in [
+                    current_account_statement_suffix,
+                    application_account_statement_suffix,
+                ]
+                for path in list_files_by_prefix_suffix(month_dir, suffix=suffix)
+            ]
+            clean_current_account_statement, clean_application_account_statement = (
+                extract_and_transform_bank_statements(
+                    month_dir,
+                    current_account_statement_suffix,
+                    application_account_statement_suffix,
+                )
+            )
+            stage["rows_out"] = len(clean_current_account_statement) + len(
+                clean_application_account_statement
+            )
+
+        # 3. Consolidação do mês a partir do checkpoint e gravação da nova parte
+        with manifest_stage(manifest, "consolidar") as stage:
+            stage["rows_in"] = len(clean_current_account_statement) + len(
+                clean_application_account_statement
+            )
+            period, checkpoint = bank_statement_append(
+                checkpoint,
+                clean_application_account_statement,
+                clean_current_account_statement,
+                period_end=period_end,
+                period_start=period_start,
+            )
+            stage["rows_out"] = len(period)
+
+        with manifest_stage(manifest, "salvar_parte") as stage:
+            stage["rows_in"] = len(period)
+            stage["files_written"] = [
+                append_ledger_partition(
+                    df=period,
+                    checkpoint=checkpoint,
+                    folder=ledger_folder,
+                    name=f"{year}-{month:02d}",
+                )
+            ]
+
+    return period
+
+
+def load_incremental_bank_statement(base_dir: str = "..\\data") -> pd.DataFrame:
+    """
+    Lê o extrato consolidado incremental completo.
+
+    Parâmetros:
+        base_dir (str, opcional): Diretório base dos dados.
+
+    Retorna:
+        pd.DataFrame: Extrato consolidado, com valores em centavos.
+    """
+    ledger_folder = os.path.join(base_dir, "processed", "extrato_bancário")
+    return apply_ledger_schema(read_ledger(ledger_folder))
+
+
+def extract_and_transform_bank_statements(
+    path_base: str,
+    current_account_statement_suffix: str = "Extrato_Conta_Corrente.pdf",
+    application_account_statement_suffix: str = "Extrato_Conta_Aplicação.pdf",
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Lê e limpa os extratos da conta corrente e da conta de aplicações de uma
+    pasta (mês, ano ou toda a base).
 
-    # 3. Limpeza e padronização
+    Parâmetros:
+        path_base (str): Pasta com os arquivos brutos.
+        current_account_statement_suffix (str, opcional): Sufixo do arquivo da
+            conta corrente.
+        application_account_statement_suffix (str, opcional): Sufixo do arquivo
+            da conta de aplicações.
+
+    Retorna:
+        tuple[pd.DataFrame, pd.DataFrame]: Extratos limpos da conta corrente e
+            da conta de aplicações.
+    """
     clean_current_account_statement = transform_pdf_current_account_statement_data(
-        raw_current_account_statement
+        extract_all_pdf_current_account_statement_data(
+            path_base, current_account_statement_suffix
+        )
     )
     clean_application_account_statement = (
         transform_pdf_applications_account_statemet_data(
-            raw_application_account_statement
+            extract_all_pdf_application_account_statement_data(
+                path_base, application_account_statement_suffix
+            )
         )
     )
+    return clean_current_account_statement, clean_application_account_statement
 
-    # 4. Salva dados limpos em processed/
-    save_dataframe_to_excel(
-        df=clean_current_account_statement,
-        file_name="extrato_conta_corrente_limpo.xlsx",
-        folder=base_dir + "\\processed\\",
-    )
-    save_dataframe_to_excel(
-        df=clean_application_account_statement,
-        file_name="extrato_conta_aplicação_limpo.xlsx",
-        folder=base_dir + "\\processed\\",
-    )
 
-    # 5. Consolidação
-    bank_statement = bank_statement_consolidation(
-        clean_application_account_statement,
-        clean_current_account_statement,
-        opening_balance,
-        year,
+def list_raw_years(base_dir: str = "..\\data") -> list[int]:
+    """
+    Lista, em ordem, os anos com dados brutos (pastas raw/<ano>).
+
+    Parâmetros:
+        base_dir (str, opcional): Diretório base dos dados.
+
+    Retorna:
+        list[int]: Anos disponíveis.
+    """
+    raw_dir = os.path.join(base_dir, "raw")
+    return sorted(
+        int(entry.name)
+        for entry in os.scandir(raw_dir)
+        if entry.is_dir() and entry.name.isdigit()
     )
-    # 6. Exportação do arquivo final para output/
-    save_dataframe_to_excel(
-        df=bank_statement,
-        file_name="extrato_bancário.xlsx",
-        folder=base_dir + "\\output\\files",
+
+
+def bank_statement_inputs_fingerprint(path_base: str, suffixes: list[str]) -> dict:
+    """
+    Identifica os arquivos brutos de extratos de uma pasta pelo hash do conteúdo.
+
+    Parâmetros:
+        path_base (str): Pasta com os arquivos brutos.
+        suffixes (list[str]): Sufixos dos arquivos considerados.
+
+    Retorna:
+        dict: Caminho relativo (com "/") -> hash SHA-256 do arquivo.
+    """
+    fingerprint = {}
+    for suffix in suffixes:
+        for path in list_files_by_prefix_suffix(path_base, suffix=suffix):
+            relative_path = os.path.relpath(path, path_base).replace(os.sep, "/")
+            fingerprint[relative_path] = file_content_hash(path)
+    return dict(sorted(fingerprint.items()))
+
+
+def run_multi_year_bank_statement_pipeline(
+    opening_balance: float,
+    base_dir: str = "..\\data",
+    years: list[int] | None = None,
+    current_account_statement_suffix: str = "Extrato_Conta_Corrente.pdf",
+    application_account_statement_suffix: str = "Extrato_Conta_Aplicação.pdf",
+) -> pd.DataFrame:
+    """
+    Consolida vários anos em um único extrato contínuo, encadeando os saldos:
+    o saldo inicial de cada ano é o SALDO final do ano anterior.
+
+    Cada ano é gravado em processed/extrato_bancário_anual/<ano>.parquet, junto
+    com um <ano>.json com os saldos de abertura e fechamento (centavos), o hash
+    dos arquivos brutos e o do código da extração e da consolidação
+    (src.etl.pipeline.runner.code_fingerprint). Um ano só é reprocessado se
+    seus arquivos, seu saldo de abertura ou esse código mudarem; nesse caso,
+    os anos seguintes também são refeitos (pois o saldo de abertura deles
+    pode mudar).
+
+    Parâmetros:
+        opening_balance (float): Saldo inicial, em reais, do primeiro ano.
+        base_dir (str, opcional): Diretório base dos dados.
+        years (list[int], opcional): Anos consecutivos a consolidar. Padrão:
+            todos os anos em raw/.
+        current_account_statement_suffix (str, opcional): Sufixo do arquivo da
+            conta corrente.
+        application_account_statement_suffix (str, opcional): Sufixo do arquivo
+            da conta de aplicações.
+
+    Retorna:
+        pd.DataFrame: Extrato contínuo de todos os anos, com valores em
+            centavos. Cada ano começa com o lançamento "SALDO INICIAL", que
+            repete o saldo e não é uma movimentação.
+    """
+    years = sorted(years) if years is not None else list_raw_years(base_dir)
+    if not years:
+        raise FileNotFoundError(f"Nenhum ano encontrado em {base_dir}")
+    if years != list(range(years[0], years[-1] + 1)):
+        raise ValueError(f"Os anos precisam ser consecutivos: {years}")
+
+    suffixes = [current_account_statement_suffix, application_account_statement_suffix]
+    ledger_folder = os.path.join(base_dir, "processed", "extrato_bancário_anual")
+
+    code = code_fingerprint(
+        extract_and_transform_bank_statements, bank_statement_consolidation
     )
+    balance = to_cents(opening_balance)
+    ledgers = []
+    for year in years:
+        year_dir = os.path.join(base_dir, "raw", str(year))
+        inputs = bank_statement_inputs_fingerprint(year_dir, suffixes)
+        ledger_path = os.path.join(ledger_folder, f"{year}.parquet")
+        state_path = os.path.join(ledger_folder, f"{year}.json")
 
-    return bank_statement
+        # Reaproveita o ano já consolidado se nada mudou
+        state = load_json(state_path)
+        if (
+            state is not None
+            and state["opening_balance"] == balance
+            and state["inputs"] == inputs
+            and state.get("code") == code
+            and os.path.exists(ledger_path)
+        ):
+            ledgers.append(pd.read_parquet(ledger_path))
+            balance = state["closing_balance"]
+            continue
+
+        clean_current_account_statement, clean_application_account_statement = (
+            extract_and_transform_bank_statements(year_dir, *suffixes)
+        )
+        ledger = bank_statement_consolidation(
+            clean_application_account_statement,
+            clean_current_account_statement,
+            balance / 100,
+            year,
+        )
+
+        save_dataframe(ledger, str(year), ledger_folder)
+        closing_balance = int(ledger["SALDO"].iloc[-1])
+        save_json(
+            {
+                "year": year,
+                "opening_balance": balance,
+                "closing_balance": closing_balance,
+                "inputs": inputs,
+                "code": code,
+            },
+            state_path,
+        )
+
+        ledgers.append(ledger)
+        balance = closing_balance
+
+    return apply_ledger_schema(pd.concat(ledgers))
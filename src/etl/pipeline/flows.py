@@ -0,0 +1,513 @@
+"""
+Fluxos do projeto (extrato bancário, FNDE, execução por credor, execução
+mensal e REs) declarados como etapas do executor incremental
+(src.etl.pipeline.runner): uma nova execução refaz apenas o que mudou.
+
+Os dados intermediários são gravados em interin/ e processed/ (Parquet), no
+mesmo formato de run_bank_statement_pipeline (os extratos limpos,
+particionados por ano/bimestre); o Excel é gerado apenas para os arquivos
+finais, em output/files/.
+"""
+
+import os
+
+import pandas as pd
+
+from src.etl.extract.application_account_statement import (
+    extract_all_pdf_application_account_statement_data,
+)
+from src.etl.extract.creditor_accounting import read_excel_creditor_accounting_file
+from src.etl.extract.current_account_statement import (
+    extract_all_pdf_current_account_statement_data,
+)
+from src.etl.extract.monthly_accounting import read_excel_monthly_accounting_file
+from src.etl.extract.public_transfers import extract_all_fnde_sheet_data
+from src.etl.extract.re import extract_all_excel_res_data
+from src.etl.pipeline.runner import make_stage, run_pipeline
+from src.etl.schema import ledger_to_reais
+from src.etl.transform.application_account_statement import (
+    transform_pdf_applications_account_statemet_data,
+)
+from src.etl.transform.bank_statement import bank_statement_consolidation
+from src.etl.transform.creditor_accounting import transform_creditor_accounting_data
+from src.etl.transform.current_account_statement import (
+    transform_pdf_current_account_statement_data,
+)
+from src.etl.transform.monthly_accounting import transform_monthly_accounting_data
+from src.utils.file_paths import list_files_by_prefix_suffix
+from src.utils.io import load_dataframe, save_dataframe, save_dataframe_to_excel
+from src.utils.run_manifest import new_run_manifest, record_run
+
+
+# --- FUNÇÕES DAS ETAPAS ---
+def _save_stage_output(df: pd.DataFrame, output: str, partition: bool = False) -> None:
+    """
+    Grava a saída de uma etapa em Parquet (save_dataframe) no caminho declarado:
+    '<pasta>/<nome>.parquet' ou, com partition=True, a pasta '<pasta>/<nome>'.
+    """
+    name = os.path.splitext(os.path.basename(output))[0]
+    save_dataframe(df, name, os.path.dirname(output), partition=partition)
+
+
+def _load_stage_input(path: str) -> pd.DataFrame:
+    """
+    Lê a saída Parquet de outra etapa (arquivo ou pasta particionada) com
+    load_dataframe.
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    return load_dataframe(name, os.path.dirname(path))
+
+
+def extract_current_account_stage(
+    raw_dir: str, suffix: str, output: str, jobs: int = 1
+) -> None:
+    """
+    Extrai os PDFs da conta corrente para interin/.
+    """
+    _save_stage_output(
+        extract_all_pdf_current_account_statement_data(raw_dir, suffix, jobs=jobs),
+        output,
+    )
+
+
+def extract_application_account_stage(
+    raw_dir: str, suffix: str, output: str, jobs: int = 1
+) -> None:
+    """
+    Extrai os PDFs da conta de aplicações para interin/.
+    """
+    _save_stage_output(
+        extract_all_pdf_application_account_statement_data(raw_dir, suffix, jobs=jobs),
+        output,
+    )
+
+
+def transform_current_account_stage(input: str, output: str) -> None:
+    """
+    Limpa o extrato bruto da conta corrente.
+    """
+    _save_stage_output(
+        transform_pdf_current_account_statement_data(_load_stage_input(input)),
+        output,
+        partition=True,
+    )
+
+
+def transform_application_account_stage(input: str, output: str) -> None:
+    """
+    Limpa o extrato bruto da conta de aplicações.
+    """
+    _save_stage_output(
+        transform_pdf_applications_account_statemet_data(_load_stage_input(input)),
+        output,
+        partition=True,
+    )
+
+
+def consolidate_bank_statement_stage(
+    application: str, current: str, opening_balance: float, year: int, output: str
+) -> None:
+    """
+    Consolida os extratos limpos das duas contas.
+    """
+    bank_statement = bank_statement_consolidation(
+        _load_stage_input(application),
+        _load_stage_input(current),
+        opening_balance,
+        year,
+    )
+    _save_stage_output(bank_statement, output)
+
+
+def export_ledger_stage(input: str, output: str) -> None:
+    """
+    Exporta um extrato (centavos) para Excel, em reais.
+    """
+    save_dataframe_to_excel(
+        df=ledger_to_reais(_load_stage_input(input)),
+        file_name=os.path.basename(output),
+        folder=os.path.dirname(output),
+    )
+
+
+def export_excel_stage(input: str, output: str, index: bool = True) -> None:
+    """
+    Exporta um arquivo intermediário para Excel.
+    """
+    df = pd.read_pickle(input) if input.endswith(".pkl") else _load_stage_input(input)
+    save_dataframe_to_excel(
+        df=df,
+        file_name=os.path.basename(output),
+        folder=os.path.dirname(output),
+        index=index,
+    )
+
+
+def fnde_stage(
+    file_path: str,
+    state_level: str,
+    uf: str,
+    adjust: bool,
+    year: int,
+    output: str,
+) -> None:
+    """
+    Extrai e filtra as transferências do FNDE de uma UF.
+    """
+    fnde_data = extract_all_fnde_sheet_data(
+        file_path, state_level, uf, adjust=adjust, year=year
+    )
+    _save_stage_output(fnde_data, output)
+
+
+def creditor_accounting_stage(input: str, output: str) -> None:
+    """
+    Lê e limpa a execução financeira por credor de um bimestre.
+    """
+    _save_stage_output(
+        transform_creditor_accounting_data(read_excel_creditor_accounting_file(input)),
+        output,
+    )
+
+
+def monthly_accounting_stage(input: str, output: str) -> None:
+    """
+    Lê e limpa a execução financeira por mês de um bimestre.
+    """
+    _save_stage_output(
+        transform_monthly_accounting_data(read_excel_monthly_accounting_file(input)),
+        output,
+    )
+
+
+def re_stage(raw_dir: str, prefix: str, output: str, jobs: int = 1) -> None:
+    """
+    Consolida os relatórios de RE. Gravado em pickle: as colunas dos REs
+    misturam textos e números, o que o Parquet não aceita.
+    """
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    extract_all_excel_res_data(raw_dir, prefix=prefix, jobs=jobs).to_pickle(output)
+
+
+# --- DECLARAÇÃO DOS FLUXOS ---
+def _single_input(base_dir: str, prefix: str, suffix: str) -> str:
+    """
+    Localiza o único arquivo bruto de um relatório.
+    """
+    paths = list_files_by_prefix_suffix(base_dir, prefix=prefix, suffix=suffix)
+    if not paths:
+        raise FileNotFoundError(f"Nenhum arquivo '{prefix}*{suffix}' em {base_dir}")
+    return paths[0]
+
+
+def bank_statement_stages(
+    opening_balance: float,
+    year: int,
+    base_dir: str = "..\\data",
+    current_account_statement_suffix: str = "Extrato_Conta_Corrente.pdf",
+    application_account_statement_suffix: str = "Extrato_Conta_Aplicação.pdf",
+    jobs: int = 1,
+) -> list[dict]:
+    """
+    Etapas do extrato bancário: extração das duas contas, limpeza,
+    consolidação e exportação (mesmo fluxo de run_bank_statement_pipeline).
+
+    Parâmetros:
+        opening_balance (float): Saldo inicial, em reais.
+        year (int): Ano de referência (pasta raw/<ano>).
+        base_dir (str, opcional): Diretório base dos dados.
+        current_account_statement_suffix (str, opcional): Sufixo do arquivo da
+            conta corrente.
+        application_account_statement_suffix (str, opcional): Sufixo do arquivo
+            da conta de aplicações.
+        jobs (int, opcional): Número de processos para ler os PDFs (None ou
+            <= 0 usa todos os núcleos). Padrão: 1.
+
+    Retorna:
+        list[dict]: Etapas do fluxo.
+    """
+    raw_dir = os.path.join(base_dir, "raw", str(year))
+    interin = os.path.join(base_dir, "interin")
+    processed = os.path.join(base_dir, "processed")
+
+    raw_current = os.path.join(interin, "extrato_conta_corrente_bruto.parquet")
+    raw_application = os.path.join(interin, "extrato_conta_aplicação_bruto.parquet")
+    # Extratos limpos particionados por ano/bimestre (pastas), como em
+    # run_bank_statement_pipeline
+    clean_current = os.path.join(processed, "extrato_conta_corrente_limpo")
+    clean_application = os.path.join(processed, "extrato_conta_aplicação_limpo")
+    bank_statement = os.path.join(processed, "extrato_bancário.parquet")
+    output = os.path.join(base_dir, "output", "files", "extrato_bancário.xlsx")
+
+    return [
+        make_stage(
+            "extrato_conta_corrente_bruto",
+            extract_current_account_stage,
+            inputs=list_files_by_prefix_suffix(
+                raw_dir, suffix=current_account_statement_suffix
+            ),
+            outputs=[raw_current],
+            params={
+                "raw_dir": raw_dir,
+                "suffix": current_account_statement_suffix,
+                "output": raw_current,
+            },
+            options={"jobs": jobs},
+        ),
+        make_stage(
+            "extrato_conta_aplicação_bruto",
+            extract_application_account_stage,
+            inputs=list_files_by_prefix_suffix(
+                raw_dir, suffix=application_account_statement_suffix
+            ),
+            outputs=[raw_application],
+            params={
+                "raw_dir": raw_dir,
+                "suffix": application_account_statement_suffix,
+                "output": raw_application,
+            },
+            options={"jobs": jobs},
+        ),
+        make_stage(
+            "extrato_conta_corrente_limpo",
+            transform_current_account_stage,
+            inputs=[raw_current],
+            outputs=[clean_current],
+            params={"input": raw_current, "output": clean_current},
+        ),
+        make_stage(
+            "extrato_conta_aplicação_limpo",
+            transform_application_account_stage,
+            inputs=[raw_application],
+            outputs=[clean_application],
+            params={"input": raw_application, "output": clean_application},
+        ),
+        make_stage(
+            "extrato_bancário",
+            consolidate_bank_statement_stage,
+            inputs=[clean_application, clean_current],
+            outputs=[bank_statement],
+            params={
+                "application": clean_application,
+                "current": clean_current,
+                "opening_balance": opening_balance,
+                "year": year,
+                "output": bank_statement,
+            },
+        ),
+        make_stage(
+            "extrato_bancário_excel",
+            export_ledger_stage,
+            inputs=[bank_statement],
+            outputs=[output],
+            params={"input": bank_statement, "output": output},
+        ),
+    ]
+
+
+def fnde_stages(
+    file_path: str,
+    state_level: str = "E",
+    uf: str = "AP",
+    adjust: bool = False,
+    year: int = 2025,
+    base_dir: str = "..\\data",
+) -> list[dict]:
+    """
+    Etapas das transferências do FNDE de uma UF: extração e exportação.
+
+    Parâmetros:
+        file_path (str): Planilha de transferências do FNDE.
+        state_level (str, opcional): Esfera ("E" estadual, "M" municipal).
+        uf (str, opcional): Sigla da UF.
+        adjust (bool, opcional): Se True, lê o bloco de ajustes.
+        year (int, opcional): Ano de referência.
+        base_dir (str, opcional): Diretório base dos dados.
+
+    Retorna:
+        list[dict]: Etapas do fluxo.
+    """
+    name = f"fnde_{state_level}_{uf}_{year}{'_ajustes' if adjust else ''}".lower()
+    processed = os.path.join(base_dir, "processed", f"{name}.parquet")
+    output = os.path.join(base_dir, "output", "files", f"{name}.xlsx")
+    return [
+        make_stage(
+            name,
+            fnde_stage,
+            inputs=[file_path],
+            outputs=[processed],
+            params={
+                "file_path": file_path,
+                "state_level": state_level,
+                "uf": uf,
+                "adjust": adjust,
+                "year": year,
+                "output": processed,
+            },
+            version=2,
+        ),
+        make_stage(
+            f"{name}_excel",
+            export_excel_stage,
+            inputs=[processed],
+            outputs=[output],
+            params={"input": processed, "output": output},
+        ),
+    ]
+
+
+def creditor_accounting_stages(
+    year: int, bi: int, base_dir: str = "..\\data"
+) -> list[dict]:
+    """
+    Etapas da execução financeira por credor de um bimestre.
+
+    Parâmetros:
+        year (int): Ano de referência (pasta raw/<ano>).
+        bi (int): Bimestre (1-6).
+        base_dir (str, opcional): Diretório base dos dados.
+
+    Retorna:
+        list[dict]: Etapas do fluxo.
+    """
+    raw_file = _single_input(
+        os.path.join(base_dir, "raw", str(year)),
+        "Demonstrativo da Execução Financeira por Credor",
+        f"{bi}B.xls",
+    )
+    name = f"execucao_por_credor_{year}_{bi}B"
+    processed = os.path.join(base_dir, "processed", f"{name}.parquet")
+    output = os.path.join(base_dir, "output", "files", f"{name}.xlsx")
+    return [
+        make_stage(
+            name,
+            creditor_accounting_stage,
+            inputs=[raw_file],
+            outputs=[processed],
+            params={"input": raw_file, "output": processed},
+        ),
+        make_stage(
+            f"{name}_excel",
+            export_excel_stage,
+            inputs=[processed],
+            outputs=[output],
+            params={"input": processed, "output": output, "index": False},
+        ),
+    ]
+
+
+def monthly_accounting_stages(
+    year: int, bi: int, base_dir: str = "..\\data"
+) -> list[dict]:
+    """
+    Etapas da execução financeira por mês de um bimestre.
+
+    Parâmetros:
+        year (int): Ano de referência (pasta raw/<ano>).
+        bi (int): Bimestre (1-6).
+        base_dir (str, opcional): Diretório base dos dados.
+
+    Retorna:
+        list[dict]: Etapas do fluxo.
+    """
+    raw_file = _single_input(
+        os.path.join(base_dir, "raw", str(year)),
+        "Demonstrativo da Execução Financeira por Mês",
+        f"{bi}B.xls",
+    )
+    name = f"execucao_mensal_{year}_{bi}B"
+    processed = os.path.join(base_dir, "processed", f"{name}.parquet")
+    output = os.path.join(base_dir, "output", "files", f"{name}.xlsx")
+    return [
+        make_stage(
+            name,
+            monthly_accounting_stage,
+            inputs=[raw_file],
+            outputs=[processed],
+            params={"input": raw_file, "output": processed},
+        ),
+        make_stage(
+            f"{name}_excel",
+            export_excel_stage,
+            inputs=[processed],
+            outputs=[output],
+            params={"input": processed, "output": output, "index": False},
+        ),
+    ]
+
+
+def re_stages(year: int, base_dir: str = "..\\data", jobs: int = 1) -> list[dict]:
+    """
+    Etapas dos relatórios de RE de um ano: consolidação e exportação.
+
+    Parâmetros:
+        year (int): Ano de referência (pasta raw/<ano>, arquivos '<ano>RE*').
+        base_dir (str, opcional): Diretório base dos dados.
+        jobs (int, opcional): Número de processos para ler os relatórios (None
+            ou <= 0 usa todos os núcleos). Padrão: 1.
+
+    Retorna:
+        list[dict]: Etapas do fluxo.
+    """
+    raw_dir = os.path.join(base_dir, "raw", str(year))
+    prefix = f"{year}RE"
+    name = f"res_{year}"
+    processed = os.path.join(base_dir, "processed", f"{name}.pkl")
+    output = os.path.join(base_dir, "output", "files", f"{name}.xlsx")
+    return [
+        make_stage(
+            name,
+            re_stage,
+            inputs=list_files_by_prefix_suffix(raw_dir, prefix=prefix),
+            outputs=[processed],
+            params={
+                "raw_dir": raw_dir,
+                "prefix": prefix,
+                "output": processed,
+            },
+            options={"jobs": jobs},
+        ),
+        make_stage(
+            f"{name}_excel",
+            export_excel_stage,
+            inputs=[processed],
+            outputs=[output],
+            params={"input": processed, "output": output, "index": False},
+        ),
+    ]
+
+
+# Fluxo -> função que declara suas etapas
+FLOWS = {
+    "bank": bank_statement_stages,
+    "fnde": fnde_stages,
+    "creditor": creditor_accounting_stages,
+    "monthly": monthly_accounting_stages,
+    "re": re_stages,
+}
+
+
+def run_flow(
+    flow: str, base_dir: str = "..\\data", force: bool = False, **params
+) -> dict:
+    """
+    Executa um fluxo pelo executor incremental. O estado fica em
+    <base_dir>/cache/pipeline/<fluxo>.json e o manifesto da execução
+    (src.utils.run_manifest), em <base_dir>/manifests/, mesmo se ela falhar.
+
+    Parâmetros:
+        flow (str): Nome do fluxo (chave de FLOWS).
+        base_dir (str, opcional): Diretório base dos dados.
+        force (bool, opcional): Se True, executa todas as etapas.
+        **params: Parâmetros da função que declara as etapas do fluxo.
+
+    Retorna:
+        dict: Nome da etapa -> motivo da execução (None se foi reaproveitada).
+    """
+    if flow not in FLOWS:
+        raise ValueError(f"Fluxo desconhecido: {flow}. Opções: {sorted(FLOWS)}")
+    stages = FLOWS[flow](base_dir=base_dir, **params)
+    state_path = os.path.join(base_dir, "cache", "pipeline", f"{flow}.json")
+    manifest = new_run_manifest(flow, params)
+    with record_run(manifest, os.path.join(base_dir, "manifests")):
+        return run_pipeline(stages, state_path, force=force, manifest=manifest)
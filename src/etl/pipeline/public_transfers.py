@@ -0,0 +1,312 @@
+"""
+Histórico das transferências do FNDE: cada planilha baixada do FNDE (um
+retrato dos repasses do ano em uma data) é incluída uma única vez, guardando
+apenas os valores que mudaram desde o retrato anterior do mesmo ano.
+
+O histórico fica em processed/fnde_histórico/, uma parte Parquet por ano e
+data do retrato (ano=<AAAA>/retrato=<AAAA-MM-DD>.parquet), e um índice JSON
+com os retratos incluídos. A consulta "valor vigente na data D" lê apenas as
+partes, sem reabrir as planilhas.
+"""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from src.etl.extract.public_transfers import extract_fnde_national_data
+from src.utils.cache import file_content_hash
+from src.utils.file_paths import list_files_by_prefix_suffix
+from src.utils.io import load_dataframe, load_json, save_dataframe, save_json
+
+# Campos que identificam um valor da tabela nacional do FNDE
+FNDE_HISTORY_KEYS = ["ANO", "MÊS", "UF", "ESFERA", "ORIGEM", "TIPO"]
+
+# Índice dos retratos incluídos no histórico
+FNDE_HISTORY_FILE = "retratos.json"
+
+# Planilhas do FNDE em external/: '<AAAA>[_MM_DD]_Transferências_Fundeb_FNDE.xls'
+FNDE_SNAPSHOT_SUFFIX = "Transferências_Fundeb_FNDE.xls"
+_SNAPSHOT_NAME_PATTERN = re.compile(r"^(\d{4})(?:_(\d{2})_(\d{2}))?_")
+
+
+class FndeSnapshotOrderError(ValueError):
+    """
+    Retrato com data igual ou anterior à do último retrato do mesmo ano já
+    incluído no histórico (o histórico só recebe retratos em ordem).
+    """
+
+
+def fnde_history_folder(base_dir: str = "..\\data") -> str:
+    """
+    Pasta do histórico das transferências do FNDE.
+    """
+    return os.path.join(base_dir, "processed", "fnde_histórico")
+
+
+def fnde_snapshot_info(
+    file_path: str, snapshot_date: str | pd.Timestamp | None = None
+) -> tuple[int, pd.Timestamp]:
+    """
+    Identifica o ano dos dados e a data de um retrato do FNDE pelo nome do
+    arquivo ('2025_09_22_...' -> 2025, 22/09/2025). Sem data no nome
+    ('2024_...'), o arquivo é a tabela do ano fechado e o retrato recebe a
+    data 31/12 do ano. A data nunca vem do arquivo em disco (data de
+    modificação), que muda a cada cópia.
+
+    Para uma planilha do ano corrente baixada sem data no nome, informe
+    snapshot_date: com 31/12, retratos datados do mesmo ano seriam recusados
+    como anteriores a ela.
+
+    Parâmetros:
+        file_path (str): Planilha do FNDE.
+        snapshot_date (str | pd.Timestamp, opcional): Data do retrato; tem
+            precedência sobre o nome do arquivo.
+
+    Retorna:
+        tuple[int, pd.Timestamp]: Ano dos dados e data do retrato.
+
+    Levanta:
+        ValueError: Se o nome não começar pelo ano.
+    """
+    match = _SNAPSHOT_NAME_PATTERN.match(os.path.basename(file_path))
+    if match is None:
+        raise ValueError(f"Ano não identificado no nome do arquivo: {file_path}")
+    year = int(match.group(1))
+
+    if snapshot_date is not None:
+        date = pd.Timestamp(snapshot_date)
+    elif match.group(2):
+        date = pd.Timestamp(year, int(match.group(2)), int(match.group(3)))
+    else:
+        date = pd.Timestamp(year, 12, 31)
+    return year, date.normalize()
+
+
+def _snapshot_part(folder: str, year: int, date: pd.Timestamp) -> tuple[str, str]:
+    """
+    Nome e pasta da parte de um retrato (save_dataframe/load_dataframe).
+    """
+    return f"retrato={date:%Y-%m-%d}", os.path.join(folder, f"ano={year}")
+
+
+def _changed_rows(current: pd.DataFrame, previous: pd.DataFrame) -> pd.DataFrame:
+    """
+    Linhas de current cujo valor é novo ou mudou em relação a previous (NaN
+    igual a NaN), mais as chaves de previous que sumiram, com VALOR NaN.
+    """
+    keys = FNDE_HISTORY_KEYS
+    merged = current.merge(
+        previous[keys + ["VALOR"]],
+        on=keys,
+        how="outer",
+        suffixes=("", "_ANTERIOR"),
+        indicator=True,
+    )
+    new, old = merged["VALOR"].to_numpy(), merged["VALOR_ANTERIOR"].to_numpy()
+    unchanged = (new == old) | (np.isnan(new) & np.isnan(old))
+    changed = (merged["_merge"] == "left_only") | (
+        (merged["_merge"] == "both") & ~unchanged
+    )
+    removed = merged["_merge"] == "right_only"
+    return merged.loc[changed | removed, keys + ["VALOR"]]
+
+
+def ingest_fnde_snapshot(
+    file_path: str,
+    folder: str,
+    snapshot_date: str | pd.Timestamp | None = None,
+) -> dict | None:
+    """
+    Inclui um retrato do FNDE no histórico, gravando apenas os valores que
+    mudaram desde o retrato anterior do mesmo ano.
+
+    A parte é gravada antes do índice: se o processo for interrompido, a parte
+    órfã é ignorada na leitura e sobrescrita na próxima inclusão.
+
+    Parâmetros:
+        file_path (str): Planilha do FNDE.
+        folder (str): Pasta do histórico (fnde_history_folder).
+        snapshot_date (str | pd.Timestamp, opcional): Data do retrato; padrão:
+            a do nome do arquivo (fnde_snapshot_info).
+
+    Retorna:
+        dict | None: Registro do retrato incluído (arquivo, hash, ano, data e
+            linhas gravadas), ou None se o mesmo conteúdo já foi incluído.
+
+    Levanta:
+        FndeSnapshotOrderError: Se já houver retrato do mesmo ano com data
+            igual ou posterior.
+    """
+    year, date = fnde_snapshot_info(file_path, snapshot_date)
+    digest = file_content_hash(file_path)
+    history = load_json(os.path.join(folder, FNDE_HISTORY_FILE)) or {"snapshots": []}
+    if any(entry["sha256"] == digest for entry in history["snapshots"]):
+        return None
+
+    same_year = [entry for entry in history["snapshots"] if entry["year"] == year]
+    if same_year and pd.Timestamp(same_year[-1]["date"]) >= date:
+        raise FndeSnapshotOrderError(
+            f"Retrato de {date:%d/%m/%Y} não é posterior ao último retrato de "
+            f"{year} no histórico ({pd.Timestamp(same_year[-1]['date']):%d/%m/%Y})"
+        )
+
+    current = extract_fnde_national_data(file_path, year)
+    current = current.astype({key: "object" for key in FNDE_HISTORY_KEYS[2:]})
+    previous = read_fnde_history(folder, years=[year]) if same_year else None
+    if previous is not None:
+        previous = previous.astype({key: "object" for key in FNDE_HISTORY_KEYS[2:]})
+        current = _changed_rows(current, previous)
+
+    save_dataframe(current.reset_index(drop=True), *_snapshot_part(folder, year, date))
+
+    entry = {
+        "file": os.path.basename(file_path),
+        "sha256": digest,
+        "year": year,
+        "date": f"{date:%Y-%m-%d}",
+        "rows": len(current),
+    }
+    history["snapshots"].append(entry)
+    save_json(history, os.path.join(folder, FNDE_HISTORY_FILE))
+    return entry
+
+
+def ingest_fnde_snapshots(
+    base_dir: str = "..\\data",
+    snapshot_dates: dict[str, str | pd.Timestamp] | None = None,
+) -> list[dict]:
+    """
+    Inclui no histórico, em ordem de data, as planilhas do FNDE de external/
+    ainda não incluídas.
+
+    Uma planilha mais antiga que o último retrato do seu ano no histórico
+    (FndeSnapshotOrderError) é ignorada e informada na saída, sem impedir a
+    inclusão das demais.
+
+    Parâmetros:
+        base_dir (str, opcional): Diretório base dos dados.
+        snapshot_dates (dict, opcional): Data do retrato por nome de arquivo
+            (ex.: {"2025_Transferências_Fundeb_FNDE.xls": "2025-10-01"}); tem
+            precedência sobre a data do nome (fnde_snapshot_info).
+
+    Retorna:
+        list[dict]: Registros dos retratos incluídos nesta chamada.
+    """
+    snapshot_dates = snapshot_dates or {}
+    paths = list_files_by_prefix_suffix(
+        os.path.join(base_dir, "external"), suffix=FNDE_SNAPSHOT_SUFFIX
+    )
+    snapshots = sorted(
+        (
+            fnde_snapshot_info(path, snapshot_dates.get(os.path.basename(path)))[::-1]
+            + (path,)
+            for path in paths
+        )
+    )
+
+    folder = fnde_history_folder(base_dir)
+    ingested = []
+    for date, _, path in snapshots:
+        try:
+            entry = ingest_fnde_snapshot(path, folder, snapshot_date=date)
+        except FndeSnapshotOrderError as error:
+            print(f"Retrato ignorado ({os.path.basename(path)}): {error}")
+            continue
+        if entry is not None:
+            ingested.append(entry)
+    return ingested
+
+
+def read_fnde_history(
+    folder: str,
+    as_of: str | pd.Timestamp | None = None,
+    years: list[int] | None = None,
+) -> pd.DataFrame:
+    """
+    Tabela nacional do FNDE com o valor vigente de cada chave na data as_of:
+    o do último retrato, até essa data, em que ele mudou.
+
+    Parâmetros:
+        folder (str): Pasta do histórico (fnde_history_folder).
+        as_of (str | pd.Timestamp, opcional): Data da consulta. Padrão: retrato
+            mais recente.
+        years (list[int], opcional): Anos dos dados. Padrão: todos.
+
+    Retorna:
+        pd.DataFrame: Colunas de extract_fnde_national_data e "RETRATO" (data
+            do retrato em que o valor foi registrado).
+
+    Levanta:
+        FileNotFoundError: Se não houver histórico em folder.
+    """
+    history = load_json(os.path.join(folder, FNDE_HISTORY_FILE))
+    if history is None:
+        raise FileNotFoundError(f"Nenhum histórico do FNDE em {folder}")
+
+    as_of = None if as_of is None else pd.Timestamp(as_of)
+    parts = []
+    for entry in history["snapshots"]:
+        date = pd.Timestamp(entry["date"])
+        if (years is not None and entry["year"] not in years) or (
+            as_of is not None and date > as_of
+        ):
+            continue
+        part = load_dataframe(*_snapshot_part(folder, entry["year"], date))
+        parts.append(part.assign(RETRATO=date))
+
+    columns = FNDE_HISTORY_KEYS + ["VALOR", "RETRATO"]
+    if not parts:
+        return pd.DataFrame(columns=columns)
+
+    # Partes em ordem de data: a última ocorrência de cada chave é a vigente
+    history_data = pd.concat(parts, ignore_index=True)
+    history_data = history_data.astype({key: "object" for key in FNDE_HISTORY_KEYS[2:]})
+    history_data = history_data.drop_duplicates(FNDE_HISTORY_KEYS, keep="last")
+
+    # Mesma ordem da tabela nacional: tipo, esfera, origem, UF e mês
+    history_data = history_data.astype(
+        {
+            key: pd.CategoricalDtype(pd.unique(history_data[key]))
+            for key in FNDE_HISTORY_KEYS[2:]
+        }
+    )
+    history_data = history_data.sort_values(
+        ["ANO", "TIPO", "ESFERA", "ORIGEM", "UF", "MÊS"], kind="stable"
+    )
+    return history_data[columns].reset_index(drop=True)
+
+
+def fnde_history_series(
+    folder: str,
+    uf: str = "AP",
+    state_level: str = "E",
+    value_type: str = "LÍQUIDO",
+    as_of: str | pd.Timestamp | None = None,
+) -> pd.Series:
+    """
+    Série mensal, em todos os anos do histórico, do total repassado a uma UF
+    (soma das origens do recurso), como conhecida na data as_of.
+
+    Parâmetros:
+        folder (str): Pasta do histórico (fnde_history_folder).
+        uf (str, opcional): Sigla da UF. Padrão: "AP".
+        state_level (str, opcional): Esfera ("E" estadual, "M" municipal).
+        value_type (str, opcional): "LÍQUIDO" ou "AJUSTE". Padrão: "LÍQUIDO".
+        as_of (str | pd.Timestamp, opcional): Data da consulta.
+
+    Retorna:
+        pd.Series: Total por mês (pd.Period); meses ainda sem repasse ficam
+            fora da série.
+    """
+    history_data = read_fnde_history(folder, as_of=as_of)
+    selected = history_data.loc[
+        (history_data["UF"] == uf.upper())
+        & (history_data["ESFERA"] == state_level.upper())
+        & (history_data["TIPO"] == value_type)
+        & history_data["VALOR"].notna()
+    ]
+    series = selected.groupby("MÊS")["VALOR"].sum().sort_index()
+    series.name = f"{uf.upper()}_{state_level.upper()}_{value_type}"
+    return series
@@ -0,0 +1,433 @@
+"""
+Executor incremental de pipelines: cada etapa declara os arquivos que lê e
+grava, e só é executada novamente se estiver desatualizada.
+
+Uma etapa está desatualizada quando não há registro de execução anterior,
+quando o código da etapa ou os parâmetros mudaram, quando o conteúdo de alguma entrada mudou ou quando alguma saída
+está ausente ou foi alterada fora do pipeline. O estado de cada pipeline fica
+em um arquivo JSON com o hash SHA-256 de entradas e saídas; um arquivo cujo
+tamanho e data de modificação não mudaram não é lido de novo.
+
+O código de uma etapa (code_fingerprint) inclui o fonte da função da etapa e
+de todos os módulos do projeto de que ela depende, direta ou indiretamente
+(ex.: extração, transformação e src.etl.schema): alterar qualquer um deles
+torna a etapa desatualizada, sem precisar aumentar a versão manualmente.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+from graphlib import TopologicalSorter
+from types import CodeType, FunctionType, ModuleType
+from typing import Callable
+
+from src.utils.cache import file_content_hash
+from src.utils.io import load_json, save_json
+from src.utils.run_manifest import manifest_stage, parquet_rows
+
+
+def make_stage(
+    name: str,
+    func: Callable,
+    inputs: list[str] = (),
+    outputs: list[str] = (),
+    params: dict | None = None,
+    version: int = 1,
+    depends_on: list[Callable | ModuleType] = (),
+    options: dict | None = None,
+) -> dict:
+    """
+    Declara uma etapa do pipeline.
+
+    A etapa é executada como func(**params, **options) e deve gravar todos os
+    arquivos de outputs. Etapas que leem saídas de outras etapas passam a depender delas.
+
+    Parâmetros:
+        name (str): Nome único da etapa.
+        func (Callable): Função da etapa.
+        inputs (list[str], opcional): Arquivos lidos pela etapa.
+        outputs (list[str], opcional): Arquivos gravados pela etapa.
+        params (dict, opcional): Parâmetros da função (serializáveis em JSON).
+        version (int, opcional): Versão da etapa; aumente-a quando o
+            comportamento mudar por algo fora do código do projeto (ex.: a
+            versão de uma biblioteca).
+        depends_on (list, opcional): Funções ou módulos usados pela etapa que
+            não são alcançados a partir de func (ex.: chamados por nome).
+            As dependências de func são encontradas automaticamente.
+        options (dict, opcional): Opções de execução que não alteram o
+            resultado (ex.: jobs, número de processos de leitura). Ficam fora
+            do hash dos parâmetros: mudá-las não torna a etapa desatualizada.
+
+    Retorna:
+        dict: Etapa.
+    """
+    return {
+        "name": name,
+        "func": func,
+        "inputs": [os.path.normpath(path) for path in inputs],
+        "outputs": [os.path.normpath(path) for path in outputs],
+        "params": params or {},
+        "version": version,
+        "depends_on": list(depends_on),
+        "options": options or {},
+    }
+
+
+def _project_package(obj) -> str | None:
+    """
+    Pacote raiz do projeto de uma função, classe ou módulo (ex.: "src").
+    """
+    module = obj.__name__ if isinstance(obj, ModuleType) else obj.__module__
+    return module.split(".")[0] if module else None
+
+
+def _referenced_globals(func: FunctionType, constants: dict) -> list:
+    """
+    Objetos globais usados pelo código de uma função (inclusive em funções
+    internas e compreensões). Constantes do módulo da função (textos, números,
+    listas e dicionários) são registradas em constants pelo repr.
+    """
+    names, pending = set(), [func.__code__]
+    while pending:
+        code = pending.pop()
+        names.update(code.co_names)
+        pending.extend(const for const in code.co_consts if isinstance(const, CodeType))
+
+    objects = []
+    for name in sorted(names & func.__globals__.keys()):
+        value = func.__globals__[name]
+        if isinstance(value, (str, int, float, tuple, list, dict, set)):
+            constants[f"{func.__module__}.{name}"] = repr(value)
+        else:
+            objects.append(value)
+    return objects
+
+
+def _object_source(obj: FunctionType | type) -> str:
+    """
+    Fonte de uma função ou classe; sem arquivo de origem (ex.: definida no
+    interpretador), usa o bytecode e as constantes da função.
+    """
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        code = getattr(obj, "__code__", None)
+        return repr((code.co_code, code.co_consts)) if code else repr(obj)
+
+
+def _module_source(name: str) -> str:
+    """
+    Fonte de um módulo, lido do arquivo (reflete edições feitas após a
+    importação, como em notebooks).
+    """
+    path = getattr(sys.modules[name], "__file__", None)
+    if path is None or not os.path.isfile(path):
+        return ""
+    with open(path, encoding="utf-8") as file:
+        return file.read()
+
+
+def code_fingerprint(*objects: Callable | ModuleType) -> str:
+    """
+    Identifica o código de funções e de tudo de que elas dependem no projeto.
+
+    Funções do mesmo módulo da primeira função entram pelo próprio fonte
+    (alterar outra etapa do módulo não afeta esta). Funções, classes e
+    módulos de outros módulos do projeto entram pelo fonte do módulo inteiro,
+    e os módulos do projeto importados por eles também, até o fim da cadeia.
+    Bibliotecas externas não entram.
+
+    Parâmetros:
+        *objects: Funções ou módulos.
+
+    Retorna:
+        str: Hash hexadecimal.
+    """
+    home = inspect.unwrap(objects[0]) if objects else None
+    home_module = getattr(home, "__module__", None)
+    package = _project_package(objects[0]) if objects else None
+
+    sources, modules = {}, set()
+    pending = list(objects)
+    while pending:
+        obj = inspect.unwrap(pending.pop())
+        if isinstance(obj, ModuleType):
+            if (
+                _project_package(obj) != package
+                or obj.__name__ in modules
+                or obj.__name__ == home_module
+            ):
+                continue
+            modules.add(obj.__name__)
+            pending.extend(vars(obj).values())
+        elif isinstance(obj, (FunctionType, type)) and obj.__module__ == home_module:
+            key = f"{obj.__module__}.{obj.__qualname__}"
+            if key in sources:
+                continue
+            sources[key] = _object_source(obj)
+            if isinstance(obj, FunctionType):
+                pending.extend(_referenced_globals(obj, sources))
+            else:
+                pending.extend(vars(obj).values())
+        elif isinstance(obj, (FunctionType, type)) and _project_package(obj) == package:
+            pending.append(sys.modules[obj.__module__])
+
+    digest = hashlib.sha256()
+    for key in sorted(sources):
+        digest.update(f"{key}\n{sources[key]}".encode())
+    for name in sorted(modules):
+        digest.update(f"{name}\n{_module_source(name)}".encode())
+    return digest.hexdigest()
+
+
+def stage_code_version(stage: dict) -> str:
+    """
+    Identifica o código de uma etapa: a versão declarada e code_fingerprint
+    da função e de depends_on.
+
+    Parâmetros:
+        stage (dict): Etapa de make_stage.
+
+    Retorna:
+        str: Hash hexadecimal.
+    """
+    func = stage["func"]
+    source = f"{func.__module__}.{func.__qualname__}:{stage['version']}\n"
+    source += code_fingerprint(func, *stage.get("depends_on", []))
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def _params_hash(params: dict) -> str:
+    """
+    Hash dos parâmetros de uma etapa.
+    """
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _file_fingerprint(path: str, previous: dict | None = None) -> dict | None:
+    """
+    Identifica um arquivo pelo tamanho, data de modificação e hash do conteúdo.
+    O hash registrado é reaproveitado se tamanho e data não mudaram. Uma pasta
+    (conjunto particionado de save_dataframe) é identificada por todos os seus
+    arquivos (_directory_fingerprint).
+
+    Retorna None se o arquivo não existir.
+    """
+    if os.path.isdir(path):
+        return _directory_fingerprint(path, previous)
+    if not os.path.isfile(path):
+        return None
+    stat = os.stat(path)
+    if (
+        previous is not None
+        and previous["size"] == stat.st_size
+        and previous["mtime_ns"] == stat.st_mtime_ns
+    ):
+        return previous
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": file_content_hash(path),
+    }
+
+
+def _directory_fingerprint(path: str, previous: dict | None = None) -> dict:
+    """
+    Identifica uma pasta pelo tamanho total, pela data de modificação mais
+    recente e pelo número de seus arquivos, e pelo hash dos nomes e conteúdos.
+    O hash registrado é reaproveitado se esses três valores não mudaram.
+    """
+    names = sorted(
+        os.path.relpath(os.path.join(root, name), path).replace(os.sep, "/")
+        for root, _, files in os.walk(path)
+        for name in files
+    )
+    stats = [os.stat(os.path.join(path, name)) for name in names]
+    summary = {
+        "size": sum(stat.st_size for stat in stats),
+        "mtime_ns": max((stat.st_mtime_ns for stat in stats), default=0),
+        "files": len(names),
+    }
+    if previous is not None and all(
+        previous.get(key) == value for key, value in summary.items()
+    ):
+        return previous
+
+    digest = hashlib.sha256()
+    for name in names:
+        digest.update(
+            f"{name}\n{file_content_hash(os.path.join(path, name))}\n".encode()
+        )
+    return {**summary, "sha256": digest.hexdigest()}
+
+
+def _same_content(fingerprints: dict, recorded: dict) -> bool:
+    """
+    Compara arquivos pelo hash do conteúdo.
+    """
+    return fingerprints.keys() == recorded.keys() and all(
+        fingerprint is not None and fingerprint["sha256"] == recorded[path]["sha256"]
+        for path, fingerprint in fingerprints.items()
+    )
+
+
+def stage_order(stages: list[dict]) -> list[dict]:
+    """
+    Ordena as etapas de modo que cada uma venha depois das etapas que gravam
+    seus arquivos de entrada.
+
+    Parâmetros:
+        stages (list[dict]): Etapas do pipeline.
+
+    Retorna:
+        list[dict]: Etapas em ordem de execução.
+
+    Levanta:
+        ValueError: Se houver nomes repetidos, dois produtores para o mesmo
+            arquivo ou dependências circulares.
+    """
+    by_name = {}
+    producers = {}
+    for stage in stages:
+        if stage["name"] in by_name:
+            raise ValueError(f"Etapa repetida: {stage['name']}")
+        by_name[stage["name"]] = stage
+        for path in stage["outputs"]:
+            if path in producers:
+                raise ValueError(
+                    f"{path} é gravado por '{producers[path]}' e '{stage['name']}'"
+                )
+            producers[path] = stage["name"]
+
+    graph = {
+        stage["name"]: {
+            producers[path] for path in stage["inputs"] if path in producers
+        }
+        for stage in stages
+    }
+    return [by_name[name] for name in TopologicalSorter(graph).static_order()]
+
+
+def stale_reason(stage: dict, record: dict | None, inputs: dict) -> str | None:
+    """
+    Indica por que uma etapa precisa ser executada.
+
+    Parâmetros:
+        stage (dict): Etapa de make_stage.
+        record (dict | None): Registro da última execução da etapa.
+        inputs (dict): Identificação atual dos arquivos de entrada.
+
+    Retorna:
+        str | None: Motivo da execução, ou None se a etapa está atualizada.
+    """
+    if record is None:
+        return "sem execução anterior"
+    if record["code"] != stage_code_version(stage):
+        return "código alterado"
+    if record["params"] != _params_hash(stage["params"]):
+        return "parâmetros alterados"
+    if not _same_content(inputs, record["inputs"]):
+        return "entradas alteradas"
+    outputs = {
+        path: _file_fingerprint(path, record["outputs"].get(path))
+        for path in stage["outputs"]
+    }
+    if not _same_content(outputs, record["outputs"]):
+        return "saídas ausentes ou alteradas"
+    return None
+
+
+def _parquet_rows(paths: list[str]) -> int | None:
+    """
+    Soma as linhas dos arquivos Parquet da lista (None se não houver nenhum).
+    """
+    rows = [parquet_rows(path) for path in paths]
+    rows = [count for count in rows if count is not None]
+    return sum(rows) if rows else None
+
+
+def run_pipeline(
+    stages: list[dict],
+    state_path: str,
+    force: bool = False,
+    manifest: dict | None = None,
+) -> dict:
+    """
+    Executa, em ordem de dependência, apenas as etapas desatualizadas.
+
+    Entradas e saídas podem ser arquivos ou pastas de conjuntos particionados
+    (save_dataframe com partition=True).
+
+    O registro de cada etapa é salvo assim que ela termina: se o pipeline for
+    interrompido, a próxima execução retoma da etapa que falhou. Uma etapa cuja
+    entrada foi regravada com o mesmo conteúdo não é executada.
+
+    Parâmetros:
+        stages (list[dict]): Etapas do pipeline (make_stage).
+        state_path (str): Arquivo JSON com o estado do pipeline.
+        force (bool, opcional): Se True, executa todas as etapas.
+        manifest (dict, opcional): Manifesto da execução (new_run_manifest),
+            em que cada etapa executada é medida.
+
+    Retorna:
+        dict: Nome da etapa -> motivo da execução (None se foi reaproveitada).
+
+    Levanta:
+        FileNotFoundError: Se uma entrada não existir ou uma etapa não gravar
+            todas as suas saídas.
+    """
+    state = load_json(state_path) or {}
+    report = {}
+
+    for stage in stage_order(stages):
+        name = stage["name"]
+        record = state.get(name)
+        previous_inputs = record["inputs"] if record else {}
+
+        inputs = {
+            path: _file_fingerprint(path, previous_inputs.get(path))
+            for path in stage["inputs"]
+        }
+        missing = [path for path, fingerprint in inputs.items() if fingerprint is None]
+        if missing:
+            raise FileNotFoundError(f"Entradas da etapa '{name}' ausentes: {missing}")
+
+        reason = "forçada" if force else stale_reason(stage, record, inputs)
+        report[name] = reason
+        if reason is None:
+            # Entradas regravadas com o mesmo conteúdo: atualiza tamanho e data
+            if inputs != record["inputs"]:
+                record["inputs"] = inputs
+                save_json(state, state_path)
+            if manifest is not None:
+                manifest["stages"].append({"name": name, "status": "reaproveitada"})
+            continue
+
+        if manifest is None:
+            stage["func"](**stage["params"], **stage["options"])
+        else:
+            with manifest_stage(manifest, name) as measured:
+                measured["reason"] = reason
+                measured["files_read"] = stage["inputs"]
+                measured["files_written"] = stage["outputs"]
+                measured["rows_in"] = _parquet_rows(stage["inputs"])
+                stage["func"](**stage["params"], **stage["options"])
+                measured["rows_out"] = _parquet_rows(stage["outputs"])
+
+        outputs = {path: _file_fingerprint(path) for path in stage["outputs"]}
+        missing = [path for path, fingerprint in outputs.items() if fingerprint is None]
+        if missing:
+            raise FileNotFoundError(f"A etapa '{name}' não gravou: {missing}")
+
+        state[name] = {
+            "code": stage_code_version(stage),
+            "params": _params_hash(stage["params"]),
+            "inputs": inputs,
+            "outputs": outputs,
+        }
+        save_json(state, state_path)
+
+    return report
@@ -0,0 +1,195 @@
+"""
+Esquema compacto do extrato bancário consolidado (livro-razão).
+
+Compartilhado pelas transformações e pelos resumos: campos de baixa
+cardinalidade viram categóricos, códigos numéricos viram inteiros pequenos
+(anuláveis, pois a linha de saldo inicial não tem código) e INF vira um
+categórico de duas categorias, guardado em int8, que continua sendo comparado
+com "C" e "D".
+
+Valores monetários (VALOR, VALOR_APP e SALDO) são guardados em centavos,
+como int64, para que somas e saldos acumulados sejam exatos. A conversão para
+reais é feita apenas na exibição e na exportação (ledger_to_reais). A
+unidade dos valores de entrada é sempre informada (apply_ledger_schema, unit),
+nunca deduzida do tipo da coluna: valores em reais podem ser inteiros.
+"""
+
+import pandas as pd
+
+# Ordem padrão das colunas do extrato
+LEDGER_COLUMNS = [
+    "AG_O",
+    "DOC",
+    "LOTE",
+    "COD_HIST",
+    "HIST",
+    "VALOR_APP",
+    "VALOR",
+    "INF",
+    "SALDO",
+    "DET_HIST",
+]
+
+# Natureza do lançamento: crédito ou débito (códigos int8)
+INF_DTYPE = pd.CategoricalDtype(["C", "D"])
+
+# Tipos de cada coluna do extrato
+LEDGER_DTYPES = {
+    "AG_O": "Int16",
+    "DOC": "Int64",
+    "LOTE": "Int32",
+    "COD_HIST": "Int16",
+    "HIST": "category",
+    "VALOR_APP": "int64",
+    "VALOR": "int64",
+    "INF": INF_DTYPE,
+    "SALDO": "int64",
+    "DET_HIST": "category",
+}
+
+# Colunas de código, lidas como texto (ex.: "0000", "1.972") nos extratos
+LEDGER_CODE_COLUMNS = ["AG_O", "DOC", "LOTE", "COD_HIST"]
+
+# Colunas monetárias, em centavos
+MONEY_COLUMNS = ["VALOR_APP", "VALOR", "SALDO"]
+
+# Unidades aceitas para os valores monetários de entrada
+MONEY_UNITS = ["centavos", "reais"]
+
+
+def to_cents(values: pd.Series | float) -> pd.Series | int:
+    """
+    Converte valores em reais para centavos inteiros, arredondando ao centavo.
+
+    Parâmetros:
+        values (pd.Series | float): Valores em reais.
+
+    Retorna:
+        pd.Series | int: Valores em centavos (int64).
+    """
+    if isinstance(values, pd.Series):
+        return (values.astype("float64") * 100).round().astype("int64")
+    return int(round(values * 100))
+
+
+def parse_money(text: pd.Series) -> pd.Series:
+    """
+    Converte valores no formato brasileiro (ex.: "1.234,56") em centavos.
+
+    Parâmetros:
+        text (pd.Series): Valores em texto.
+
+    Retorna:
+        pd.Series: Valores em centavos (int64).
+    """
+    return to_cents(pd.to_numeric(text.str.replace(".", "").str.replace(",", ".")))
+
+
+def ledger_to_reais(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte as colunas monetárias do extrato de centavos para reais, para
+    exibição ou exportação.
+
+    Parâmetros:
+        df (pd.DataFrame): Extrato com valores em centavos (apply_ledger_schema).
+
+    Retorna:
+        pd.DataFrame: Cópia do extrato com valores em reais (float).
+    """
+    return df.assign(
+        **{column: df[column] / 100 for column in MONEY_COLUMNS if column in df.columns}
+    )
+
+
+def money_to_cents(column: pd.Series, unit: str) -> pd.Series:
+    """
+    Converte uma coluna monetária na unidade informada para centavos (int64).
+
+    Parâmetros:
+        column (pd.Series): Valores monetários.
+        unit (str): Unidade dos valores ("centavos" ou "reais").
+
+    Retorna:
+        pd.Series: Valores em centavos (int64).
+
+    Levanta:
+        ValueError: Se a unidade for desconhecida ou se valores em centavos
+            tiverem frações (provavelmente estão em reais).
+    """
+    if unit not in MONEY_UNITS:
+        raise ValueError(f"Unidade monetária desconhecida: {unit}")
+    if unit == "reais":
+        return to_cents(column)
+    if pd.api.types.is_integer_dtype(column):
+        return column.astype("int64")
+
+    values = column.astype("float64")
+    if (values != values.round()).any():
+        raise ValueError(
+            f"Coluna {column.name} em centavos com frações de centavo; "
+            "valores em reais devem ser informados com unit='reais'."
+        )
+    return values.astype("int64")
+
+
+def parse_code_column(column: pd.Series, dtype: str) -> pd.Series:
+    """
+    Converte uma coluna de código (texto com zeros à esquerda ou separador de
+    milhar) em inteiro anulável.
+
+    Parâmetros:
+        column (pd.Series): Coluna com os códigos.
+        dtype (str): Tipo inteiro anulável de destino (ex.: "Int16").
+
+    Retorna:
+        pd.Series: Coluna convertida.
+    """
+    if pd.api.types.is_numeric_dtype(column):
+        return column.astype(dtype)
+
+    # Converte apenas os valores distintos (códigos se repetem muito)
+    positions, uniques = pd.factorize(column)
+    text = pd.Series(uniques, dtype=object).astype(str).str.replace(".", "")
+    text = text.str.strip()
+    values = pd.array(pd.to_numeric(text.mask(text == "")), dtype=dtype)
+    return pd.Series(
+        values.take(positions, allow_fill=True), index=column.index, name=column.name
+    )
+
+
+def apply_ledger_schema(df: pd.DataFrame, unit: str = "centavos") -> pd.DataFrame:
+    """
+    Aplica os tipos de LEDGER_DTYPES às colunas do extrato presentes no
+    DataFrame. Colunas já no tipo certo não são copiadas.
+
+    Parâmetros:
+        df (pd.DataFrame): Extrato (conta corrente, aplicações ou consolidado).
+        unit (str, opcional): Unidade das colunas monetárias de df: "centavos"
+            (padrão; extratos já tratados) ou "reais" (ex.: lançamentos
+            manuais ou extrato lido do Excel exportado).
+
+    Retorna:
+        pd.DataFrame: Extrato com os tipos compactos e valores em centavos.
+
+    Levanta:
+        ValueError: Se a unidade for desconhecida ou incompatível com os
+            valores (money_to_cents).
+    """
+    if unit not in MONEY_UNITS:
+        raise ValueError(f"Unidade monetária desconhecida: {unit}")
+
+    converted = {}
+    for column, dtype in LEDGER_DTYPES.items():
+        if column not in df.columns:
+            continue
+        if column in MONEY_COLUMNS:
+            if unit == "reais" or df[column].dtype != dtype:
+                converted[column] = money_to_cents(df[column], unit)
+        elif df[column].dtype == dtype:
+            continue
+        elif column in LEDGER_CODE_COLUMNS:
+            converted[column] = parse_code_column(df[column], dtype)
+        else:
+            converted[column] = df[column].astype(dtype)
+
+    return df.assign(**converted) if converted else df
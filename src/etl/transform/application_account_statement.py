@@ -2,9 +2,10 @@
 Módulo para ingestão de dados de extratos de aplicações financeiras.
 """
 
-import numpy as np
 import pandas as pd
 
+from src.etl.schema import apply_ledger_schema, parse_money, to_cents
+
 
 def transform_pdf_applications_account_statemet_data(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -16,20 +17,20 @@ def transform_pdf_applications_account_statemet_data(df: pd.DataFrame) -> pd.Dat
     df["PERÍODO"] = pd.to_datetime(df["PERÍODO"], format="%y/%m")
     df = df.sort_values(by="PERÍODO")
 
-    # Monta DataFrame padronizado
+    # Monta DataFrame padronizado (campos fixos preenchidos por broadcast)
     df_padrao = pd.DataFrame(
         {
             "DATA": df["PERÍODO"],
-            "AG_O": ["0000"] * df.shape[0],
-            "LOTE": ["00000"] * df.shape[0],
-            "COD_HIST": ["000"] * df.shape[0],
-            "HIST": ["RENDIMENTOS"] * df.shape[0],
-            "DOC": ["0"] * df.shape[0],
-            "VALOR_APP": ["0"] * df.shape[0],
+            "AG_O": 0,
+            "LOTE": 0,
+            "COD_HIST": 0,
+            "HIST": "RENDIMENTOS",
+            "DOC": 0,
+            "VALOR_APP": 0,
             "VALOR": df["RENDIMENTO"],
-            "INF": ["C"] * df.shape[0],
-            "SALDO": [np.nan] * df.shape[0],
-            "DET_HIST": ["RENDIMENTOS"] * df.shape[0],
+            "INF": "C",
+            "SALDO": 0,
+            "DET_HIST": "RENDIMENTOS",
         }
     )
 
@@ -37,9 +38,10 @@ def transform_pdf_applications_account_statemet_data(df: pd.DataFrame) -> pd.Dat
     df_padrao.index = pd.to_datetime(df_padrao["DATA"]) + MonthEnd(0)
     df_padrao.drop(columns="DATA", inplace=True)
 
-    # Converte valores para numérico
-    df_padrao["VALOR"] = pd.to_numeric(
-        df_padrao["VALOR"].astype(str).str.replace(".", "").str.replace(",", ".")
-    )
+    # Converte valores para centavos
+    if pd.api.types.is_numeric_dtype(df_padrao["VALOR"]):
+        df_padrao["VALOR"] = to_cents(df_padrao["VALOR"])
+    else:
+        df_padrao["VALOR"] = parse_money(df_padrao["VALOR"].astype(str))
 
-    return df_padrao
+    return apply_ledger_schema(df_padrao)
@@ -4,6 +4,8 @@ Módulo de consolidação de extratos bancários (conta corrente + conta de apli
 
 import pandas as pd
 
+from src.etl.schema import LEDGER_COLUMNS, apply_ledger_schema, to_cents
+
 
 def bank_statement_consolidation(
     application_account_statement: pd.DataFrame,
@@ -18,27 +20,176 @@ def bank_statement_consolidation(
         application_account_statement (pd.Dataframe): Dataframe da conta de aplicações.
         current_account_statement (pd.Dataframe): Dataframe da conta corrente.
         year (int): Ano de referência para o saldo inicial.
-        opening_balance (float): Saldo inicial a ser inserido no extrato consolidado.
+        opening_balance (float): Saldo inicial, em reais, a ser inserido no extrato
+            consolidado.
 
     Retorna:
-        pd.DataFrame: DataFrame consolidado com todas as transações e saldo acumulado.
+        pd.DataFrame: DataFrame consolidado com todas as transações e saldo acumulado,
+            com valores em centavos (ver src.etl.schema).
     """
-    # Consolida os extratos
+    # Consolida os extratos (valores em centavos)
     extracts_consolidation_data = pd.concat(
-        [current_account_statement, application_account_statement]
+        [
+            apply_ledger_schema(current_account_statement),
+            apply_ledger_schema(application_account_statement),
+        ]
     )
 
     # Adiciona saldo inicial
-    saldo_inicial_data = pd.DataFrame(
-        {"HIST": ["SALDO INICIAL"], "VALOR": [opening_balance]},
-        index=pd.to_datetime([f"{year - 1}-12-31"]),
-    )
     extracts_consolidation_data = pd.concat(
-        [extracts_consolidation_data, saldo_inicial_data]
+        [extracts_consolidation_data, opening_balance_entry(opening_balance, year)]
     )
 
-    # Ordena por data e calcula saldo acumulado
-    extracts_consolidation_data = extracts_consolidation_data.sort_index()
+    # Ordena por data (estável, como no modo incremental) e calcula saldo acumulado
+    extracts_consolidation_data = extracts_consolidation_data.sort_index(kind="stable")
     extracts_consolidation_data["SALDO"] = extracts_consolidation_data["VALOR"].cumsum()
 
-    return extracts_consolidation_data
+    # Categóricos de extratos diferentes viram object no concat: reaplica os tipos
+    return apply_ledger_schema(extracts_consolidation_data)
+
+
+def opening_balance_entry(opening_balance: float, year: int) -> pd.DataFrame:
+    """
+    Monta o lançamento de saldo inicial do extrato consolidado, em 31/12 do ano
+    anterior.
+
+    Parâmetros:
+        opening_balance (float): Saldo inicial, em reais.
+        year (int): Ano de referência.
+
+    Retorna:
+        pd.DataFrame: Lançamento "SALDO INICIAL", com valores em centavos.
+    """
+    cents = to_cents(opening_balance)
+    return pd.DataFrame(
+        {
+            "HIST": ["SALDO INICIAL"],
+            "VALOR_APP": [0],
+            "VALOR": [cents],
+            "SALDO": [cents],
+        },
+        index=pd.to_datetime([f"{year - 1}-12-31"]),
+    ).reindex(columns=LEDGER_COLUMNS)
+
+
+def bank_statement_opening_checkpoint(opening_balance: float, year: int) -> dict:
+    """
+    Cria o checkpoint inicial do modo incremental: saldo de abertura do ano,
+    correspondente ao extrato com apenas o lançamento de opening_balance_entry.
+
+    Parâmetros:
+        opening_balance (float): Saldo inicial, em reais.
+        year (int): Ano de referência.
+
+    Retorna:
+        dict: Checkpoint com "period_end" (ISO), "balance" (centavos) e "rows".
+    """
+    return {
+        "period_end": f"{year - 1}-12-31",
+        "balance": to_cents(opening_balance),
+        "rows": 1,
+    }
+
+
+def check_bank_statement_period(
+    checkpoint: dict,
+    period_start: str | pd.Timestamp,
+    period_end: str | pd.Timestamp,
+) -> None:
+    """
+    Verifica se um novo período pode ser incluído no extrato incremental: ele
+    deve começar no dia seguinte ao fim do último checkpoint. Um período
+    posterior deixaria uma lacuna que não poderia mais ser preenchida (os
+    períodos só são acrescentados em ordem).
+
+    Parâmetros:
+        checkpoint (dict): Último checkpoint ("period_end", "balance", "rows").
+        period_start (str | pd.Timestamp): Primeiro dia do novo período.
+        period_end (str | pd.Timestamp): Último dia do novo período.
+
+    Levanta:
+        ValueError: Se o período terminar até o fim do já consolidado ou
+            começar depois do dia seguinte a ele.
+    """
+    last_end = pd.Timestamp(checkpoint["period_end"])
+    next_start = last_end + pd.Timedelta(days=1)
+    if pd.Timestamp(period_end) <= last_end:
+        raise ValueError(
+            f"Período fora de ordem: termina em {pd.Timestamp(period_end):%d/%m/%Y},"
+            f" mas o extrato já está consolidado até {last_end:%d/%m/%Y}."
+        )
+    if pd.Timestamp(period_start) > next_start:
+        raise ValueError(
+            f"Lacuna no extrato: o período começa em "
+            f"{pd.Timestamp(period_start):%d/%m/%Y}, mas o extrato está "
+            f"consolidado até {last_end:%d/%m/%Y}. Inclua antes o período a "
+            f"partir de {next_start:%d/%m/%Y}."
+        )
+
+
+def bank_statement_append(
+    checkpoint: dict,
+    application_account_statement: pd.DataFrame,
+    current_account_statement: pd.DataFrame,
+    period_end: str | pd.Timestamp | None = None,
+    period_start: str | pd.Timestamp | None = None,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Consolida apenas os lançamentos de um novo período, a partir do saldo do
+    último checkpoint. Custa O(linhas novas): o extrato já consolidado não é
+    lido, reordenado nem somado novamente.
+
+    Parâmetros:
+        checkpoint (dict): Último checkpoint ("period_end", "balance", "rows").
+        application_account_statement (pd.DataFrame): Aplicações do novo período.
+        current_account_statement (pd.DataFrame): Conta corrente do novo período.
+        period_end (str | pd.Timestamp, opcional): Último dia do novo período.
+            Padrão: fim do mês do último lançamento.
+        period_start (str | pd.Timestamp, opcional): Primeiro dia do novo
+            período. Padrão: início do mês do primeiro lançamento.
+
+    Retorna:
+        tuple[pd.DataFrame, dict]: Lançamentos do período, com SALDO acumulado
+            a partir do checkpoint, e o novo checkpoint.
+
+    Levanta:
+        ValueError: Se o período estiver vazio, sobrepuser o período já
+            consolidado, terminar antes dele ou deixar uma lacuna depois dele
+            (check_bank_statement_period).
+    """
+    period = pd.concat(
+        [
+            apply_ledger_schema(current_account_statement),
+            apply_ledger_schema(application_account_statement),
+        ]
+    ).sort_index(kind="stable")
+    if period.empty:
+        raise ValueError("Nenhum lançamento no período a ser incluído.")
+
+    last_end = pd.Timestamp(checkpoint["period_end"])
+    if period_end is None:
+        period_end = period.index.max() + pd.offsets.MonthEnd(0)
+    period_end = pd.Timestamp(period_end)
+    if period_start is None:
+        period_start = period.index.min().to_period("M").to_timestamp()
+
+    if period.index.min() <= last_end:
+        raise ValueError(
+            f"Período sobreposto: lançamento em {period.index.min():%d/%m/%Y}, "
+            f"mas o extrato já está consolidado até {last_end:%d/%m/%Y}."
+        )
+    check_bank_statement_period(checkpoint, period_start, period_end)
+    if period.index.max() > period_end:
+        raise ValueError(
+            f"Lançamento em {period.index.max():%d/%m/%Y} após o fim do período "
+            f"({period_end:%d/%m/%Y})."
+        )
+
+    period["SALDO"] = checkpoint["balance"] + period["VALOR"].cumsum()
+
+    new_checkpoint = {
+        "period_end": period_end.strftime("%Y-%m-%d"),
+        "balance": int(period["SALDO"].iloc[-1]),
+        "rows": checkpoint["rows"] + len(period),
+    }
+    return apply_ledger_schema(period), new_checkpoint
@@ -4,6 +4,16 @@ Módulo para limpeza e transformação de dados de extratos bancários da conta
 
 import pandas as pd
 
+from src.etl.schema import (
+    LEDGER_COLUMNS,
+    apply_ledger_schema,
+    parse_money,
+    to_cents,
+)
+
+# Históricos de aplicação e resgate automáticos, separados em VALOR_APP
+APPLICATION_HISTORIES = ["BB-APLIC C.PRZ-APL.AUT", "Resgate Automático"]
+
 
 def transform_pdf_current_account_statement_data(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -16,55 +26,30 @@ def transform_pdf_current_account_statement_data(df: pd.DataFrame) -> pd.DataFra
         pd.DataFrame: Dados tratados e prontos para análise.
     """
     # Filtra linhas relevantes
-    df = df.loc[(df.INF == "C") | (df.INF == "D")]
-
-    # Conversão de VALORES
-    df.VALOR
+    df = df.loc[df.INF.isin(["C", "D"])]
 
-    # Ajusta coluna de detalhes
-    df.loc[df.DATA.isna(), "DET_HIST"] = df.loc[df.DATA.isna(), "HIST"]
-    df.DET_HIST = df.DET_HIST.shift(-1)
-    df = df.loc[~df.DATA.isna()]
+    # Ajusta coluna de detalhes: o detalhe é a linha sem data logo abaixo
+    is_detail = df.DATA.isna()
+    df = df.assign(DET_HIST=df.HIST.where(is_detail).shift(-1)).loc[~is_detail]
 
     # Ajusta datas e valores
-    df.index = pd.to_datetime(df.DATA, dayfirst=True)
-    df.drop(columns="DATA", inplace=True)
+    df = df.set_index(pd.to_datetime(df.DATA, dayfirst=True)).drop(columns="DATA")
 
-    df.VALOR = df.VALOR.str.replace(".", "").str.replace(",", ".").astype(float)
+    # Valores em centavos (extratos em CSV já chegam com VALOR numérico, em reais)
     df = df.loc[df.HIST != "Saldo Anterior"]
-    df.VALOR = df.apply(
-        lambda row: row.VALOR * -1 if row.INF == "D" else row.VALOR, axis=1
-    )
+    if pd.api.types.is_numeric_dtype(df.VALOR):
+        valor = to_cents(df.VALOR)
+    else:
+        valor = parse_money(df.VALOR)
+    valor = valor.where(df.INF != "D", -valor)
 
     # Coluna de aplicações
-    df["VALOR_APP"] = df.apply(
-        lambda row: row.VALOR
-        if row.HIST in ["BB-APLIC C.PRZ-APL.AUT", "Resgate Automático"]
-        else 0,
-        axis=1,
-    )
-    df.VALOR = df.apply(
-        lambda row: 0
-        if row.HIST in ["BB-APLIC C.PRZ-APL.AUT", "Resgate Automático"]
-        else row.VALOR,
-        axis=1,
+    is_application = df.HIST.isin(APPLICATION_HISTORIES)
+    df = df.assign(
+        VALOR_APP=valor.where(is_application, 0),
+        VALOR=valor.where(~is_application, 0),
+        SALDO=0,
     )
 
-    # Reorganiza colunas
-    df = df[
-        [
-            "AG_O",
-            "DOC",
-            "LOTE",
-            "COD_HIST",
-            "HIST",
-            "VALOR_APP",
-            "VALOR",
-            "INF",
-            "SALDO",
-            "DET_HIST",
-        ]
-    ]
-    df.SALDO = 0
-
-    return df
+    # Reorganiza colunas e aplica os tipos compactos do extrato
+    return apply_ledger_schema(df[LEDGER_COLUMNS])
@@ -2,8 +2,25 @@
 Módulo de limpeza e transformação de dados do FNDE.
 """
 
+import numpy as np
 import pandas as pd
 
+# Número de cada mês no cabeçalho das planilhas do FNDE
+FNDE_MONTHS = {
+    "JANEIRO": 1,
+    "FEVEREIRO": 2,
+    "MARÇO": 3,
+    "ABRIL": 4,
+    "MAIO": 5,
+    "JUNHO": 6,
+    "JULHO": 7,
+    "AGOSTO": 8,
+    "SETEMBRO": 9,
+    "OUTUBRO": 10,
+    "NOVEMBRO": 11,
+    "DEZEMBRO": 12,
+}
+
 
 def transform_fnde_sheet_data(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -65,26 +82,50 @@ def filter_uf_fnde_sheet_data(
     else:
         df_filtered.columns = ["MÊS", f"{sheet_name}"]
 
-    # Transformar mês em valores numéricos
-    months = {
-        "JANEIRO": "1",
-        "FEVEREIRO": "2",
-        "MARÇO": "3",
-        "ABRIL": "4",
-        "MAIO": "5",
-        "JUNHO": "6",
-        "JULHO": "7",
-        "AGOSTO": "8",
-        "SETEMBRO": "9",
-        "OUTUBRO": "10",
-        "NOVEMBRO": "11",
-        "DEZEMBRO": "12",
+    # Transformar mês em "MM/AAAA"
+    month_labels = {
+        name: f"{number:02d}/{year}" for name, number in FNDE_MONTHS.items()
     }
-    df_filtered["MÊS"] = df_filtered["MÊS"].map(months)
-    df_filtered["MÊS"] = df_filtered["MÊS"] + f"/{year}"
-    df_filtered["MÊS"] = pd.to_datetime(
-        df_filtered["MÊS"], format=f"%m/%Y"
-    ).dt.strftime(f"%m/%Y")
+    df_filtered["MÊS"] = df_filtered["MÊS"].map(month_labels)
     df_filtered.set_index("MÊS", inplace=True)
 
     return df_filtered
+
+
+def fnde_sheets_long_format(
+    sheets: dict[str, pd.DataFrame], year: int = 2025
+) -> pd.DataFrame:
+    """
+    Reúne planilhas brutas do FNDE em um único DataFrame no formato longo,
+    com uma linha por planilha, UF e mês.
+
+    Parâmetros:
+        sheets (dict[str, pd.DataFrame]): Nome da planilha -> bloco bruto
+            indexado pela UF (src.etl.extract.public_transfers).
+        year (int, opcional): Ano dos meses das planilhas. Padrão: 2025.
+
+    Retorna:
+        pd.DataFrame: Colunas "PLANILHA", "UF", "MÊS" (pd.Period mensal) e
+            "VALOR"; meses sem valor ficam como NaN.
+    """
+    months = list(FNDE_MONTHS)
+    periods = pd.period_range(f"{year}-01", periods=len(months), freq="M")
+
+    # Linhas na ordem planilha -> UF -> mês; valores montados direto em arrays
+    empty = np.empty(0, dtype=object)
+    names, ufs, values = [empty], [empty], [np.empty(0)]
+    for name, df in sheets.items():
+        block = df.loc[df.index.notna()].reindex(columns=months)
+        names.append(np.full(len(block) * len(months), name, dtype=object))
+        ufs.append(np.repeat(block.index.to_numpy(dtype=object), len(months)))
+        values.append(block.to_numpy(dtype="float64", na_value=np.nan).ravel())
+
+    n_rows = sum(len(uf) for uf in ufs) // len(months)
+    return pd.DataFrame(
+        {
+            "PLANILHA": np.concatenate(names),
+            "UF": np.concatenate(ufs),
+            "MÊS": pd.PeriodIndex(np.tile(periods, n_rows), freq="M"),
+            "VALOR": np.concatenate(values),
+        }
+    )
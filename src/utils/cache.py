@@ -0,0 +1,214 @@
+"""
+Cache em disco, endereçado por conteúdo, para as funções de extração.
+
+A chave de cada resultado combina o hash SHA-256 do arquivo lido, os demais
+parâmetros da função e a versão do extrator. Os DataFrames são gravados em
+pickle (binário, preserva índice e dtypes) e o tamanho total do cache é
+limitado, descartando primeiro as entradas usadas há mais tempo (LRU).
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+from src.utils.config import CACHE_DIR, get_config
+from src.utils.parallel import shutdown_process_pool
+
+# Pasta das entradas do cache de extração
+EXTRACT_CACHE_DIR = CACHE_DIR / "extract"
+
+# Tamanho máximo do cache de extração (bytes); padrão: 512 MB
+EXTRACT_CACHE_MAX_BYTES = int(get_config("CACS_EXTRACT_CACHE_MAX_BYTES", 512 * 2**20))
+
+# Permite desligar o cache pelo .env (CACS_EXTRACT_CACHE=0)
+_cache_enabled = get_config("CACS_EXTRACT_CACHE", "1") != "0"
+
+# Hashes já calculados no processo: (caminho, tamanho, mtime) -> hash
+_file_hashes: dict[tuple[str, int, int], str] = {}
+
+
+def set_extract_cache_enabled(enabled: bool) -> None:
+    """
+    Liga ou desliga o cache de extração no processo atual e nos processos de
+    leitura em paralelo (src.utils.parallel).
+
+    Parâmetros:
+        enabled (bool): True para usar o cache, False para sempre reextrair.
+    """
+    global _cache_enabled
+    if enabled == _cache_enabled:
+        return
+    _cache_enabled = enabled
+
+    # Os processos do pool compartilhado guardam a configuração de quando foram
+    # criados: a variável de ambiente vale para os próximos e o pool é recriado
+    os.environ["CACS_EXTRACT_CACHE"] = "1" if enabled else "0"
+    shutdown_process_pool()
+
+
+def file_content_hash(path: str | Path) -> str:
+    """
+    Calcula o hash SHA-256 do conteúdo de um arquivo.
+
+    Parâmetros:
+        path (str | Path): Caminho do arquivo.
+
+    Retorna:
+        str: Hash hexadecimal do conteúdo.
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(2**20), b""):
+                digest.update(block)
+        _file_hashes[memo_key] = digest.hexdigest()
+    return _file_hashes[memo_key]
+
+
+def function_cache_dir(func: Callable | str) -> Path:
+    """
+    Retorna a pasta do cache de uma função de extração.
+
+    Parâmetros:
+        func (Callable | str): Função de extração ou seu nome qualificado.
+
+    Retorna:
+        Path: Pasta das entradas da função.
+    """
+    if callable(func):
+        func = f"{func.__module__}.{func.__qualname__}"
+    return EXTRACT_CACHE_DIR / func
+
+
+def enforce_extract_cache_size(max_bytes: int = EXTRACT_CACHE_MAX_BYTES) -> int:
+    """
+    Remove as entradas usadas há mais tempo até o cache caber em max_bytes.
+    Entradas removidas ao mesmo tempo por outro processo são ignoradas.
+
+    Parâmetros:
+        max_bytes (int, opcional): Tamanho máximo do cache, em bytes.
+
+    Retorna:
+        int: Número de entradas removidas.
+    """
+    entries = []
+    for entry in EXTRACT_CACHE_DIR.glob("*/*.pkl"):
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue  # removida por outro processo após a listagem
+        entries.append((stat.st_mtime_ns, stat.st_size, entry))
+    total = sum(size for _, size, _ in entries)
+
+    removed = 0
+    for _, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        entry.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+def invalidate_extract_cache(
+    func: Callable | str | None = None, path: str | Path | None = None
+) -> int:
+    """
+    Remove entradas do cache de extração.
+
+    Parâmetros:
+        func (Callable | str, opcional): Remove apenas as entradas desta função.
+        path (str | Path, opcional): Remove apenas as entradas do conteúdo atual
+            deste arquivo.
+
+    Retorna:
+        int: Número de entradas removidas.
+    """
+    folder = "*" if func is None else function_cache_dir(func).name
+    prefix = "" if path is None else file_content_hash(path)[:32]
+
+    removed = 0
+    for entry in EXTRACT_CACHE_DIR.glob(f"{folder}/{prefix}*.pkl"):
+        entry.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+def cache_extract(
+    version: int = 1, path_arg: str | None = None
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorador que guarda em disco o resultado de uma função de extração.
+
+    A chave é formada pelo hash do conteúdo do arquivo lido, pelo nome do
+    arquivo, pelos demais parâmetros (após aplicar os valores padrão) e pela
+    versão do extrator.
+    Altere version sempre que a lógica da extração mudar.
+
+    Parâmetros:
+        version (int, opcional): Versão do extrator. Padrão: 1.
+        path_arg (str, opcional): Nome do parâmetro com o caminho do arquivo.
+            Padrão: primeiro parâmetro da função.
+
+    Retorna:
+        Callable: Decorador.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(func)
+        path_name = path_arg or next(iter(signature.parameters))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            path = bound.arguments[path_name]
+            if not _cache_enabled or not os.path.isfile(path):
+                return func(*args, **kwargs)
+
+            # O nome do arquivo entra na chave: alguns extratores dependem dele
+            params = {
+                name: value
+                for name, value in bound.arguments.items()
+                if name != path_name
+            }
+            params["file_name"] = os.path.basename(path)
+            params_key = json.dumps(
+                {"version": version, "params": params}, sort_keys=True, default=repr
+            )
+            params_hash = hashlib.sha256(params_key.encode()).hexdigest()
+            entry = (
+                function_cache_dir(func)
+                / f"{file_content_hash(path)[:32]}-{params_hash[:16]}.pkl"
+            )
+
+            # A entrada pode ser removida por outro processo (limite de
+            # tamanho) a qualquer momento: nesse caso, é uma ausência no cache
+            try:
+                os.utime(entry)  # marca como usado recentemente (LRU)
+                return pd.read_pickle(entry)
+            except FileNotFoundError:
+                pass
+
+            result = func(*args, **kwargs)
+
+            # Grava de forma atômica para suportar processos em paralelo
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp_entry = entry.with_suffix(f".{os.getpid()}.tmp")
+            pd.to_pickle(result, tmp_entry)
+            os.replace(tmp_entry, entry)
+            enforce_extract_cache_size()
+
+            return result
+
+        return wrapper
+
+    return decorator
@@ -3,10 +3,15 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 # Carrega variáveis de ambiente do arquivo .env
-env_path = Path(__file__).resolve().parents[2] / ".env"
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+env_path = PROJECT_ROOT / ".env"
 if env_path.exists():
     load_dotenv(env_path)
 
+# Pasta de caches locais gerados pelo pipeline (pode ser alterada no .env)
+CACHE_DIR = Path(os.getenv("CACS_CACHE_DIR", PROJECT_ROOT / "data" / "cache"))
+
+
 def get_config(key: str, default=None):
     """
     Retorna o valor de uma configuração a partir das variáveis de ambiente.
@@ -0,0 +1,278 @@
+"""
+Catálogo em memória dos arquivos de um diretório (ex.: data/raw).
+
+O diretório é lido uma vez com os.scandir; cada arquivo recebe os campos
+extraídos do caminho e do nome (ano, bimestre, mês, conta, tipo e formato) e
+entra em um índice campo -> valor -> caminhos, consultado em O(1).
+As atualizações são incrementais: só são relidas as pastas cuja data de
+modificação mudou (arquivos criados, removidos ou renomeados).
+
+Exemplos de nomes reconhecidos:
+    2025/Bimestre_04/08/Extratos/Conta_Corrente/25_08_Extrato_Conta_Corrente.csv
+    2025/Bimestre_01/02/REs/2025RE00014.xls
+    2025/Bimestre_02/Demonstrativo da Execução Financeira por Credor -( FUNDEB ) 2B.xls
+"""
+
+import os
+import re
+import threading
+import unicodedata
+
+# Campos indexados de cada arquivo
+CATALOG_FIELDS = ["year", "bimester", "month", "account", "kind", "format"]
+
+# Tipo do arquivo pelo nome; vale a primeira regra que casar
+FILE_KINDS = [
+    (r"por Credor por m[êe]s", "execução_credor_mês"),
+    (r"por Credor", "execução_por_credor"),
+    (r"por M[êe]s", "execução_mensal"),
+    (r"^\d{4}RE\d+", "re"),
+    (r"Extrato", "extrato"),
+    (r"Folha", "folha"),
+    (r"^RREO", "rreo"),
+    (r"Concilia[çc][ãa]o", "conciliação"),
+]
+
+_KIND_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), kind) for pattern, kind in FILE_KINDS
+]
+_ACCOUNT_PATTERN = re.compile(r"Conta_(Corrente|Aplica[çc][ãa]o)", re.IGNORECASE)
+_DATE_PREFIX_PATTERN = re.compile(r"^(\d{2})_(\d{2})_")
+_RE_PATTERN = re.compile(r"^(\d{4})RE\d+")
+_BIMESTER_PATTERNS = [
+    re.compile(r"^Bimestre_(\d+)$", re.IGNORECASE),
+    re.compile(r"\s(\d)B\.\w+$"),
+    re.compile(r"(\d)\s*[°º]\s*(?:BIM|Bimestre)", re.IGNORECASE),
+]
+
+# Catálogos já montados no processo: raiz -> catálogo
+_catalogs: dict[str, dict] = {}
+_catalogs_lock = threading.RLock()
+
+
+def parse_file_fields(relative_path: str) -> dict:
+    """
+    Extrai os campos de um arquivo a partir do caminho relativo à raiz do
+    catálogo. Campos não identificados ficam como None.
+
+    Parâmetros:
+        relative_path (str): Caminho relativo do arquivo.
+
+    Retorna:
+        dict: Campos de CATALOG_FIELDS.
+    """
+    relative_path = unicodedata.normalize("NFC", relative_path)
+    *folders, name = relative_path.replace("\\", "/").split("/")
+    stem, extension = os.path.splitext(name)
+    fields = dict.fromkeys(CATALOG_FIELDS)
+    fields["format"] = extension[1:].lower() or None
+
+    # Pastas: <ano>/Bimestre_<n>/<mês>/...
+    for folder in folders:
+        if re.fullmatch(r"\d{4}", folder):
+            fields["year"] = int(folder)
+        elif re.fullmatch(r"\d{2}", folder) and fields["bimester"] is not None:
+            fields["month"] = int(folder)
+        else:
+            match = _BIMESTER_PATTERNS[0].match(folder)
+            if match:
+                fields["bimester"] = int(match.group(1))
+
+    # Nome: AA_MM_..., AAAARE..., ... <n>B.xls, <n>° BIM ...
+    match = _DATE_PREFIX_PATTERN.match(name)
+    if match:
+        fields["year"] = 2000 + int(match.group(1))
+        fields["month"] = int(match.group(2))
+    match = _RE_PATTERN.match(name)
+    if match:
+        fields["year"] = int(match.group(1))
+    for pattern in _BIMESTER_PATTERNS[1:]:
+        match = pattern.search(name)
+        if match:
+            fields["bimester"] = int(match.group(1))
+            break
+    if fields["bimester"] is None and fields["month"] is not None:
+        fields["bimester"] = (fields["month"] + 1) // 2
+
+    match = _ACCOUNT_PATTERN.search(stem) or _ACCOUNT_PATTERN.search("/".join(folders))
+    if match:
+        account = match.group(1).lower()
+        fields["account"] = (
+            "conta_corrente" if account == "corrente" else "conta_aplicação"
+        )
+
+    fields["kind"] = next(
+        (kind for pattern, kind in _KIND_PATTERNS if pattern.search(name)), None
+    )
+    return fields
+
+
+def _index_add(catalog: dict, path: str, record: dict) -> None:
+    catalog["files"][path] = record
+    for field in CATALOG_FIELDS:
+        catalog["index"][field].setdefault(record[field], set()).add(path)
+
+
+def _index_remove(catalog: dict, path: str) -> None:
+    record = catalog["files"].pop(path)
+    for field in CATALOG_FIELDS:
+        paths = catalog["index"][field][record[field]]
+        paths.discard(path)
+        if not paths:
+            del catalog["index"][field][record[field]]
+
+
+def _scan_directory(catalog: dict, folder: str, mtime_ns: int) -> list[str]:
+    """
+    Relê uma pasta, substituindo seus arquivos no catálogo. Retorna as subpastas.
+    """
+    for path in catalog["dirs"].get(folder, {}).get("files", []):
+        _index_remove(catalog, path)
+
+    files, subdirs = [], []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                subdirs.append(entry.path)
+            elif entry.is_file():
+                stat = entry.stat()
+                record = {
+                    "path": entry.path,
+                    "name": entry.name,
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    **parse_file_fields(os.path.relpath(entry.path, catalog["root"])),
+                }
+                _index_add(catalog, entry.path, record)
+                files.append(entry.path)
+
+    catalog["dirs"][folder] = {
+        "mtime_ns": mtime_ns,
+        "files": sorted(files),
+        "subdirs": sorted(subdirs),
+    }
+    return catalog["dirs"][folder]["subdirs"]
+
+
+def refresh_file_catalog(catalog: dict) -> int:
+    """
+    Atualiza o catálogo: relê apenas as pastas novas ou com data de
+    modificação diferente e remove as pastas que deixaram de existir.
+
+    Alterações no conteúdo de um arquivo existente não mudam a data da pasta;
+    para elas, use o hash do conteúdo (src.utils.cache.file_content_hash).
+
+    Parâmetros:
+        catalog (dict): Catálogo de get_file_catalog.
+
+    Retorna:
+        int: Número de pastas relidas.
+    """
+    seen = set()
+    scanned = 0
+    pending = [catalog["root"]] if os.path.isdir(catalog["root"]) else []
+    while pending:
+        folder = pending.pop()
+        seen.add(folder)
+        mtime_ns = os.stat(folder).st_mtime_ns
+        known = catalog["dirs"].get(folder)
+        if known is not None and known["mtime_ns"] == mtime_ns:
+            pending.extend(known["subdirs"])
+        else:
+            pending.extend(_scan_directory(catalog, folder, mtime_ns))
+            scanned += 1
+
+    for folder in set(catalog["dirs"]) - seen:
+        for path in catalog["dirs"].pop(folder)["files"]:
+            _index_remove(catalog, path)
+    return scanned
+
+
+def get_file_catalog(root: str, refresh: bool = True) -> dict:
+    """
+    Retorna o catálogo de um diretório, montando-o na primeira chamada.
+
+    Parâmetros:
+        root (str): Diretório raiz (ex.: data/raw).
+        refresh (bool, opcional): Se True, atualiza o catálogo antes de
+            retorná-lo (relendo só as pastas alteradas). Padrão: True.
+
+    Retorna:
+        dict: Catálogo com a raiz ("root"), os arquivos ("files": caminho ->
+            registro com nome, tamanho, data e campos), as pastas lidas
+            ("dirs") e o índice ("index": campo -> valor -> caminhos).
+    """
+    root = os.path.normpath(root)
+    with _catalogs_lock:
+        catalog = _catalogs.get(root)
+        if catalog is None:
+            catalog = {
+                "root": root,
+                "files": {},
+                "dirs": {},
+                "index": {field: {} for field in CATALOG_FIELDS},
+            }
+            _catalogs[root] = catalog
+            refresh_file_catalog(catalog)
+        elif refresh:
+            refresh_file_catalog(catalog)
+    return catalog
+
+
+def find_files(root: str, refresh: bool = True, **fields) -> list[str]:
+    """
+    Busca arquivos do catálogo pelos campos (year, bimester, month, account,
+    kind, format). Cada campo é uma consulta ao índice; com vários campos, os
+    resultados são intersectados a partir do menor.
+
+    Exemplo:
+        find_files("data/raw", year=2025, month=8, account="conta_corrente",
+                   kind="extrato", format="pdf")
+
+    Parâmetros:
+        root (str): Diretório raiz do catálogo.
+        refresh (bool, opcional): Se True, atualiza o catálogo antes da busca.
+        **fields: Valores dos campos procurados.
+
+    Retorna:
+        list[str]: Caminhos encontrados, em ordem alfabética.
+
+    Levanta:
+        ValueError: Se algum campo não for indexado.
+    """
+    unknown = set(fields) - set(CATALOG_FIELDS)
+    if unknown:
+        raise ValueError(f"Campos não indexados: {sorted(unknown)}")
+
+    with _catalogs_lock:
+        catalog = get_file_catalog(root, refresh=refresh)
+        if not fields:
+            return sorted(catalog["files"])
+
+        matches = sorted(
+            (
+                catalog["index"][field].get(value, set())
+                for field, value in fields.items()
+            ),
+            key=len,
+        )
+        return sorted(matches[0].intersection(*matches[1:]))
+
+
+def catalog_records(root: str, refresh: bool = True) -> list[dict]:
+    """
+    Registros de todos os arquivos do catálogo, em ordem alfabética de caminho.
+    A lista é uma cópia: pode ser percorrida enquanto outra thread atualiza o
+    catálogo.
+
+    Parâmetros:
+        root (str): Diretório raiz do catálogo.
+        refresh (bool, opcional): Se True, atualiza o catálogo antes.
+
+    Retorna:
+        list[dict]: Registros com caminho ("path"), nome ("name"), tamanho,
+            data de modificação e os campos de CATALOG_FIELDS.
+    """
+    with _catalogs_lock:
+        files = get_file_catalog(root, refresh=refresh)["files"]
+        return [files[path] for path in sorted(files)]
@@ -1,10 +1,16 @@
 """
 Funções para gerenciar caminhos de arquivos no projeto.
+
+As listagens usam o catálogo de src.utils.file_catalog: cada diretório é lido
+uma vez por processo e, nas chamadas seguintes, só as pastas alteradas são
+relidas.
 """
 
 import os
 from typing import List, Optional
 
+from src.utils.file_catalog import catalog_records
+
 
 def list_all_file_paths(base_path: str) -> List[str]:
     """
@@ -15,32 +21,23 @@ def list_all_file_paths(base_path: str) -> List[str]:
         base_path (str): Caminho do diretório base.
 
     Retorna:
-        List[str]: Lista com caminhos completos dos arquivos.
+        List[str]: Lista com caminhos completos dos arquivos, em ordem alfabética.
     """
-    all_files = []
-    for root, _, files in os.walk(base_path):
-        for file in files:
-            full_path = os.path.join(root, file)
-            all_files.append(full_path)
-    return all_files
+    return [record["path"] for record in catalog_records(base_path)]
 
 
 def list_all_file_names(base_path: str) -> List[str]:
     """
     Percorre recursivamente todos os diretórios dentro de base_path
-    e retorna uma lista com os caminhos completos de todos os arquivos encontrados.
+    e retorna uma lista com os nomes de todos os arquivos encontrados.
 
     Parâmetros:
         base_path (str): Caminho do diretório base.
 
     Retorna:
-        List[str]: Lista com caminhos completos dos arquivos.
+        List[str]: Lista com os nomes dos arquivos.
     """
-    all_files = []
-    for root, _, files in os.walk(base_path):
-        for file in files:
-            all_files.append(file)
-    return all_files
+    return [os.path.basename(path) for path in list_all_file_paths(base_path)]
 
 
 def list_files_by_prefix_suffix(
@@ -57,18 +54,12 @@ def list_files_by_prefix_suffix(
         suffix (str, opcional): Sufixo que o arquivo deve ter (ex.: 'Extrato_Conta_Corrente.pdf').
 
     Retorna:
-        List[str]: Lista com caminhos completos dos arquivos filtrados.
+        List[str]: Lista com caminhos completos dos arquivos filtrados, em ordem
+            alfabética.
     """
-
-    paths = list_all_file_paths(base_path)
-    matched_files = []
-
-    for path in paths:
-        filename = path.split("\\")[-1]  # pega apenas o nome do arquivo
-        if prefix and not filename.startswith(prefix):
-            continue
-        if suffix and not filename.endswith(suffix):
-            continue
-        matched_files.append(path)
-
-    return matched_files
+    return [
+        record["path"]
+        for record in catalog_records(base_path)
+        if (not prefix or record["name"].startswith(prefix))
+        and (not suffix or record["name"].endswith(suffix))
+    ]
@@ -1,5 +1,16 @@
+import json
 import os
+import shutil
+import time
+from contextlib import contextmanager
+
 import pandas as pd
+import pyarrow.parquet as pq
+
+from src.utils.config import get_config
+
+# Compressão dos arquivos Parquet de interin/ e processed/ (pode ser alterada no .env)
+PARQUET_COMPRESSION = get_config("CACS_PARQUET_COMPRESSION", "zstd")
 
 
 def save_dataframe_to_excel(
@@ -27,3 +38,323 @@ def save_dataframe_to_excel(
     df.to_excel(file_path, index=index)
 
     return file_path
+
+
+def dataframe_partitions(df: pd.DataFrame):
+    """
+    Divide um DataFrame indexado por data em partes por ano e bimestre,
+    preservando a ordem das linhas dentro de cada parte.
+
+    Parâmetros:
+        df (pd.DataFrame): DataFrame com índice de datas (DatetimeIndex).
+
+    Retorna:
+        Iterator[tuple[tuple[int, int], pd.DataFrame]]: ((ano, bimestre), parte).
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise TypeError("O particionamento por ano/bimestre exige índice de datas.")
+    keys = [df.index.year, (df.index.month + 1) // 2]
+    for (year, bimester), part in df.groupby(keys, sort=True):
+        yield (int(year), int(bimester)), part
+
+
+def _partition_path(path: str, year: int, bimester: int) -> str:
+    """
+    Caminho do arquivo de uma parte: <path>/ano=<ano>/bimestre=<bimestre>.parquet.
+    """
+    return os.path.join(path, f"ano={year}", f"bimestre={bimester}.parquet")
+
+
+def save_dataframe(
+    df: pd.DataFrame, name: str, folder: str, partition: bool = False
+) -> str:
+    """
+    Salva um DataFrame intermediário (data/interin ou data/processed) em
+    Parquet comprimido, preservando índice e tipos das colunas.
+
+    Com partition=True, o DataFrame (indexado por data) é gravado em uma pasta
+    com um arquivo por ano e bimestre, e as partes que não existem mais nos
+    dados são removidas, assim como um '<name>.parquet' único de uma gravação
+    anterior sem partição (que load_dataframe leria no lugar da pasta). Cada arquivo é gravado de forma atômica. Na leitura
+    (load_dataframe) as partes vêm em ordem de ano/bimestre, mantendo a ordem
+    original das linhas de cada parte.
+
+    Parâmetros:
+        df (pd.DataFrame): DataFrame a ser salvo.
+        name (str): Nome do conjunto de dados (ex.: 'extrato_conta_corrente_limpo').
+        folder (str): Pasta de destino.
+        partition (bool, opcional): Se True, particiona por ano/bimestre.
+
+    Retorna:
+        str: Caminho do arquivo (ou da pasta, se particionado).
+    """
+    if not partition:
+        path = os.path.join(folder, f"{name}.parquet")
+        _write_parquet(df, path)
+        return path
+
+    path = os.path.join(folder, name)
+    written = set()
+    for (year, bimester), part in dataframe_partitions(df):
+        part_path = _partition_path(path, year, bimester)
+        _write_parquet(part, part_path)
+        written.add(os.path.normpath(part_path))
+
+    # Remove o arquivo único antigo, que teria precedência na leitura
+    single_path = os.path.join(folder, f"{name}.parquet")
+    if os.path.isfile(single_path):
+        os.remove(single_path)
+
+    # Remove partes antigas que não foram regravadas
+    for year, bimester in list_partitions(path):
+        part_path = _partition_path(path, year, bimester)
+        if os.path.normpath(part_path) not in written:
+            os.remove(part_path)
+    for entry in os.scandir(path):
+        if entry.is_dir() and not os.listdir(entry.path):
+            shutil.rmtree(entry.path)
+
+    return path
+
+
+def _write_parquet(df: pd.DataFrame, path: str) -> None:
+    """
+    Grava um Parquet comprimido de forma atômica (arquivo temporário + troca).
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, compression=PARQUET_COMPRESSION)
+    os.replace(tmp_path, path)
+
+
+def _read_parquet(path: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Lê um Parquet restaurando as colunas categóricas sem categorias (ex.: uma
+    coluna toda vazia), que o Parquet grava como numéricas.
+    """
+    df = pd.read_parquet(path, columns=columns)
+    metadata = pq.read_schema(path).pandas_metadata or {}
+    for column in metadata.get("columns", []):
+        name = column["name"]
+        if (
+            column["pandas_type"] == "categorical"
+            and name in df.columns
+            and not isinstance(df[name].dtype, pd.CategoricalDtype)
+        ):
+            df[name] = pd.Categorical(df[name].astype(object))
+    return df
+
+
+def list_partitions(path: str) -> list[tuple[int, int]]:
+    """
+    Lista, em ordem, as partes (ano, bimestre) de um conjunto particionado.
+
+    Parâmetros:
+        path (str): Pasta do conjunto de dados.
+
+    Retorna:
+        list[tuple[int, int]]: Partes existentes.
+    """
+    partitions = []
+    if not os.path.isdir(path):
+        return partitions
+    for year_entry in os.scandir(path):
+        if not (year_entry.is_dir() and year_entry.name.startswith("ano=")):
+            continue
+        for part_entry in os.scandir(year_entry.path):
+            stem, extension = os.path.splitext(part_entry.name)
+            if extension == ".parquet" and stem.startswith("bimestre="):
+                partitions.append((int(year_entry.name[4:]), int(stem[9:])))
+    return sorted(partitions)
+
+
+def load_dataframe(
+    name: str,
+    folder: str,
+    years: list[int] | None = None,
+    bimesters: list[int] | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Lê um DataFrame salvo com save_dataframe. Em conjuntos particionados, só
+    os arquivos dos anos/bimestres pedidos são lidos.
+
+    Parâmetros:
+        name (str): Nome do conjunto de dados.
+        folder (str): Pasta onde foi salvo.
+        years (list[int], opcional): Anos a ler. Padrão: todos.
+        bimesters (list[int], opcional): Bimestres a ler (1-6). Padrão: todos.
+        columns (list[str], opcional): Colunas a ler. Padrão: todas.
+
+    Retorna:
+        pd.DataFrame: Dados lidos, com os tipos originais.
+    """
+    file_path = os.path.join(folder, f"{name}.parquet")
+    if os.path.isfile(file_path):
+        return _read_parquet(file_path, columns=columns)
+
+    path = os.path.join(folder, name)
+    partitions = list_partitions(path)
+    if not partitions:
+        raise FileNotFoundError(
+            f"Conjunto de dados '{name}' não encontrado em {folder}"
+        )
+
+    parts = [
+        _read_parquet(_partition_path(path, year, bimester), columns=columns)
+        for year, bimester in partitions
+        if (years is None or year in years)
+        and (bimesters is None or bimester in bimesters)
+    ]
+    if not parts:
+        # Nenhuma parte selecionada: DataFrame vazio com o esquema dos dados
+        year, bimester = partitions[0]
+        return _read_parquet(_partition_path(path, year, bimester), columns).iloc[:0]
+    return pd.concat(parts)
+
+
+def save_json(data: dict, file_path: str) -> str:
+    """
+    Grava um dicionário em JSON de forma atômica (arquivo temporário + troca).
+
+    Parâmetros:
+        data (dict): Dados a serem gravados.
+        file_path (str): Caminho do arquivo JSON.
+
+    Retorna:
+        str: Caminho do arquivo salvo.
+    """
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, file_path)
+    return file_path
+
+
+def load_json(file_path: str) -> dict | None:
+    """
+    Lê um arquivo JSON.
+
+    Parâmetros:
+        file_path (str): Caminho do arquivo JSON.
+
+    Retorna:
+        dict | None: Dados lidos, ou None se o arquivo não existir.
+    """
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+@contextmanager
+def file_lock(path: str, timeout: float = 60.0, stale_after: float = 300.0):
+    """
+    Trava entre processos (ex.: leitores em paralelo de src.utils.parallel)
+    para ler, alterar e gravar um arquivo compartilhado. Usa um arquivo
+    '<path>.lock' criado de forma exclusiva, o que funciona no Windows e no
+    Linux.
+
+    Parâmetros:
+        path (str): Arquivo protegido.
+        timeout (float, opcional): Espera máxima pela trava, em segundos.
+        stale_after (float, opcional): Idade, em segundos, a partir da qual uma
+            trava é considerada abandonada (processo interrompido) e removida.
+
+    Levanta:
+        TimeoutError: Se a trava não for obtida em timeout segundos.
+    """
+    lock_path = f"{path}.lock"
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > stale_after:
+                    os.remove(lock_path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Trava ocupada: {lock_path}")
+            time.sleep(0.01)
+    try:
+        yield
+    finally:
+        os.remove(lock_path)
+
+
+# Arquivo com o último checkpoint de um extrato incremental
+LEDGER_CHECKPOINT_FILE = "checkpoint.json"
+
+
+def read_ledger_checkpoint(folder: str) -> dict | None:
+    """
+    Lê o checkpoint de um extrato gravado em partes (append_ledger_partition).
+
+    Parâmetros:
+        folder (str): Pasta do extrato.
+
+    Retorna:
+        dict | None: Checkpoint, ou None se o extrato ainda não existir.
+    """
+    return load_json(os.path.join(folder, LEDGER_CHECKPOINT_FILE))
+
+
+def append_ledger_partition(
+    df: pd.DataFrame, checkpoint: dict, folder: str, name: str
+) -> str:
+    """
+    Grava os lançamentos de um período como uma nova parte (Parquet) do
+    extrato e atualiza o checkpoint. Só a parte nova é escrita.
+
+    A parte é gravada antes do checkpoint: se o processo for interrompido, a
+    parte órfã é ignorada na leitura e sobrescrita na próxima execução.
+
+    Parâmetros:
+        df (pd.DataFrame): Lançamentos do período.
+        checkpoint (dict): Checkpoint após o período (sem a lista de partes).
+        folder (str): Pasta do extrato.
+        name (str): Nome da parte (ex.: '2025-08').
+
+    Retorna:
+        str: Caminho da parte gravada.
+    """
+    os.makedirs(folder, exist_ok=True)
+    previous = read_ledger_checkpoint(folder) or {"parts": []}
+    if name in previous["parts"]:
+        raise ValueError(f"A parte '{name}' já existe no extrato em {folder}")
+
+    part_path = os.path.join(folder, f"{name}.parquet")
+    df.to_parquet(part_path, compression=PARQUET_COMPRESSION)
+
+    checkpoint = {**checkpoint, "parts": previous["parts"] + [name]}
+    save_json(checkpoint, os.path.join(folder, LEDGER_CHECKPOINT_FILE))
+
+    return part_path
+
+
+def read_ledger(folder: str) -> pd.DataFrame:
+    """
+    Lê todas as partes de um extrato gravado com append_ledger_partition, na
+    ordem em que foram incluídas.
+
+    Parâmetros:
+        folder (str): Pasta do extrato.
+
+    Retorna:
+        pd.DataFrame: Extrato completo.
+    """
+    checkpoint = read_ledger_checkpoint(folder)
+    if checkpoint is None:
+        raise FileNotFoundError(f"Nenhum extrato incremental em {folder}")
+
+    parts = [
+        _read_parquet(os.path.join(folder, f"{name}.parquet"))
+        for name in checkpoint["parts"]
+    ]
+    return pd.concat(parts)
@@ -0,0 +1,214 @@
+"""
+Funções para processar arquivos em paralelo, em um pool de processos compartilhado.
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Callable
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Pool reaproveitado entre chamadas (evita subir processos a cada extração)
+_process_pool: ProcessPoolExecutor | None = None
+_process_pool_workers = 0
+
+# Protege a criação/troca do pool quando chamado de várias threads
+_process_pool_lock = threading.RLock()
+
+# Uso de recursos das tarefas do pool, acumulado por thread (collect_worker_usage)
+_worker_usage = threading.local()
+
+
+class FileProcessingError(Exception):
+    """
+    Erro agregado com as falhas de cada arquivo processado.
+
+    Atributos:
+        errors (dict): Exceção levantada por arquivo, na ordem de processamento.
+    """
+
+    def __init__(self, errors: dict[str, BaseException]):
+        self.errors = errors
+        details = "\n".join(
+            f"    {path}: {type(error).__name__}: {error}"
+            for path, error in errors.items()
+        )
+        super().__init__(f"Falha ao processar {len(errors)} arquivo(s):\n{details}")
+
+
+def resolve_jobs(jobs: int | None) -> int:
+    """
+    Converte o parâmetro jobs no número de processos a utilizar.
+
+    Parâmetros:
+        jobs (int | None): Número de processos. Valores None ou <= 0 usam
+            todos os núcleos disponíveis.
+
+    Retorna:
+        int: Número de processos (mínimo 1).
+    """
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def process_cpu_time() -> float:
+    """
+    Tempo de CPU (usuário + sistema), em segundos, do processo e dos seus
+    subprocessos já encerrados (ex.: a JVM do tabula). No Windows, só o do
+    processo.
+    """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def max_rss_bytes(children: bool = False) -> int | None:
+    """
+    Pico de memória residente (RSS), em bytes, do processo ou, com
+    children=True, do maior subprocesso já encerrado. Retorna None onde não
+    está disponível (Windows).
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    # ru_maxrss: KB no Linux, bytes no macOS
+    max_rss = resource.getrusage(who).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+@contextmanager
+def collect_worker_usage():
+    """
+    Acumula o uso de recursos das tarefas que a thread atual executa no pool
+    de processos (map_files): "cpu_time_s", tempo de CPU das tarefas (com os
+    subprocessos delas), e "max_rss_bytes", maior pico de memória dos
+    processos do pool que as executaram (desde o início de cada processo).
+
+    Retorna:
+        Iterator[dict]: Uso acumulado, atualizado até o fim do bloco.
+    """
+    usage = {"cpu_time_s": 0.0, "max_rss_bytes": None}
+    outer = getattr(_worker_usage, "current", None)
+    _worker_usage.current = usage
+    try:
+        yield usage
+    finally:
+        _worker_usage.current = outer
+        if outer is not None:
+            _add_worker_usage(outer, usage["cpu_time_s"], usage["max_rss_bytes"])
+
+
+def _add_worker_usage(usage: dict, cpu_time_s: float, rss: int | None) -> None:
+    """
+    Soma o uso de uma tarefa do pool ao acumulado de collect_worker_usage.
+    """
+    usage["cpu_time_s"] += cpu_time_s
+    if rss is not None:
+        usage["max_rss_bytes"] = max(usage["max_rss_bytes"] or 0, rss)
+
+
+def _measured_call(func: Callable[..., Any], path: str, **kwargs):
+    """
+    Executa uma tarefa no processo do pool e devolve, junto do resultado, o
+    tempo de CPU gasto nela e o pico de memória do processo.
+    """
+    cpu_start = process_cpu_time()
+    result = func(path, **kwargs)
+    rss = [max_rss_bytes(), max_rss_bytes(children=True)]
+    rss = max((value for value in rss if value is not None), default=None)
+    return result, process_cpu_time() - cpu_start, rss
+
+
+def get_process_pool(jobs: int) -> ProcessPoolExecutor:
+    """
+    Retorna o pool de processos compartilhado, recriando-o se o número de
+    processos solicitado for diferente do atual.
+
+    Parâmetros:
+        jobs (int): Número de processos do pool.
+
+    Retorna:
+        ProcessPoolExecutor: Pool de processos.
+    """
+    global _process_pool, _process_pool_workers
+
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_workers != jobs:
+            shutdown_process_pool()
+            _process_pool = ProcessPoolExecutor(max_workers=jobs)
+            _process_pool_workers = jobs
+        return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """
+    Encerra o pool de processos compartilhado, se existir.
+    """
+    global _process_pool, _process_pool_workers
+
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+        _process_pool_workers = 0
+
+
+def map_files(
+    func: Callable[..., Any], paths: list[str], jobs: int = 1, **kwargs
+) -> list[Any]:
+    """
+    Aplica func(path, **kwargs) a cada arquivo, em paralelo quando jobs > 1.
+
+    A ordem dos resultados é sempre a ordem de paths. Todos os arquivos são
+    processados mesmo que algum falhe; as falhas são reunidas e levantadas ao
+    final em um único FileProcessingError. O uso de CPU e memória das tarefas
+    executadas no pool é somado em collect_worker_usage, se ativo.
+
+    Parâmetros:
+        func (Callable): Função de nível de módulo (precisa ser serializável).
+        paths (list[str]): Caminhos dos arquivos.
+        jobs (int, opcional): Número de processos. 1 executa no próprio
+            processo; None ou <= 0 usa todos os núcleos.
+        **kwargs: Argumentos repassados a func.
+
+    Retorna:
+        list: Resultados de func, na mesma ordem de paths.
+    """
+    jobs = resolve_jobs(jobs)
+
+    results = []
+    errors = {}
+    if jobs == 1 or len(paths) <= 1:
+        for path in paths:
+            try:
+                results.append(func(path, **kwargs))
+            except Exception as error:
+                errors[path] = error
+    else:
+        pool = get_process_pool(jobs)
+        usage = getattr(_worker_usage, "current", None)
+        futures = [pool.submit(_measured_call, func, path, **kwargs) for path in paths]
+        for path, future in zip(paths, futures):
+            try:
+                result, cpu_time_s, rss = future.result()
+                results.append(result)
+                if usage is not None:
+                    _add_worker_usage(usage, cpu_time_s, rss)
+            except BrokenProcessPool as error:
+                # Processo morto: descarta o pool para a próxima chamada
+                shutdown_process_pool()
+                errors[path] = error
+            except Exception as error:
+                errors[path] = error
+
+    if errors:
+        raise FileProcessingError(errors)
+
+    return results
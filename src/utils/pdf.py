@@ -0,0 +1,230 @@
+"""
+Funções para leitura da camada de texto de arquivos PDF, sem JVM.
+
+Reproduz o modo "stream" do tabula com colunas fixas: cada caractere é
+atribuído à primeira coluna cuja fronteira fica à sua direita, caracteres
+da mesma linha e coluna são unidos (com espaço entre palavras) e o
+resultado é lido pelo pandas como o CSV gerado pelo tabula.
+"""
+
+import bisect
+import csv
+import io
+
+import pandas as pd
+
+# Tolerância vertical (pt) para considerar dois caracteres na mesma linha
+LINE_TOLERANCE = 1.0
+
+# Fração da largura do caractere a partir da qual um espaço é inserido
+WORD_SPACING_RATIO = 0.3
+
+
+def load_pdf_page_chars(
+    path: str, area: list[float] | None = None, max_pages: int = 0
+) -> list[list[tuple[float, float, float, str]]]:
+    """
+    Lê os caracteres da camada de texto de cada página do PDF.
+
+    Parâmetros:
+        path (str): Caminho completo do arquivo PDF.
+        area (list, opcional): Região [topo, esquerda, base, direita], em pontos,
+            medida a partir do canto superior esquerdo da página.
+        max_pages (int, opcional): Número máximo de páginas lidas (0 = todas).
+
+    Retorna:
+        list: Para cada página, lista de tuplas (topo, x0, x1, texto).
+    """
+    from pdfminer.converter import PDFPageAggregator
+    from pdfminer.layout import LTChar
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    resource_manager = PDFResourceManager()
+    device = PDFPageAggregator(resource_manager, laparams=None)
+    interpreter = PDFPageInterpreter(resource_manager, device)
+
+    pages = []
+    with open(path, "rb") as file:
+        for page in PDFPage.get_pages(file, maxpages=max_pages):
+            interpreter.process_page(page)
+            layout = device.get_result()
+
+            chars = []
+            for obj in layout:
+                if not isinstance(obj, LTChar):
+                    continue
+                top = layout.height - obj.y1
+                bottom = layout.height - obj.y0
+                if area is not None and not (
+                    top >= area[0]
+                    and obj.x0 >= area[1]
+                    and bottom <= area[2]
+                    and obj.x1 <= area[3] + 0.5
+                ):
+                    continue
+                chars.append((top, obj.x0, obj.x1, obj.get_text()))
+            pages.append(chars)
+
+    return pages
+
+
+def split_chars_into_lines(
+    chars: list[tuple[float, float, float, str]],
+) -> list[list[tuple[float, float, float, str]]]:
+    """
+    Agrupa os caracteres de uma página em linhas, ordenadas de cima para baixo
+    e, dentro de cada linha, da esquerda para a direita.
+
+    Parâmetros:
+        chars (list): Caracteres da página no formato (topo, x0, x1, texto).
+
+    Retorna:
+        list: Lista de linhas, cada uma com seus caracteres.
+    """
+    chars = sorted(chars, key=lambda char: (round(char[0], 1), char[1]))
+
+    lines = []
+    line_top = None
+    for char in chars:
+        if not lines or abs(char[0] - line_top) > LINE_TOLERANCE:
+            lines.append([])
+            line_top = char[0]
+        lines[-1].append(char)
+
+    for line in lines:
+        line.sort(key=lambda char: char[1])
+    return lines
+
+
+def join_chars(
+    chars: list[tuple[float, float, float, str]],
+) -> tuple[str, list[float]]:
+    """
+    Une os caracteres de uma linha (ou célula), inserindo um espaço entre
+    palavras separadas visualmente.
+
+    Parâmetros:
+        chars (list): Caracteres ordenados da esquerda para a direita.
+
+    Retorna:
+        tuple: Texto resultante e a posição x0 de cada caractere do texto.
+    """
+    text = []
+    positions = []
+    previous = None
+    for char in chars:
+        _, x0, x1, value = char
+        if previous is not None and value != " " and not text[-1].endswith(" "):
+            gap = x0 - previous[2]
+            width = min(previous[2] - previous[1], x1 - x0) or 1
+            if gap > WORD_SPACING_RATIO * width:
+                text.append(" ")
+                positions.append(previous[2])
+        text.append(value)
+        positions.extend([x0] * len(value))
+        previous = char
+    return "".join(text), positions
+
+
+def group_chars_into_rows(
+    chars: list[tuple[float, float, float, str]], columns: list[float]
+) -> list[list[str | None]]:
+    """
+    Agrupa os caracteres de uma página em linhas e as linhas em células.
+
+    Parâmetros:
+        chars (list): Caracteres da página no formato (topo, x0, x1, texto).
+        columns (list): Posições, em pontos, das fronteiras direitas das colunas.
+
+    Retorna:
+        list: Linhas da tabela, cada uma com o texto de cada coluna (ou None).
+    """
+    rows = []
+    for line in split_chars_into_lines(chars):
+        cells = [[] for _ in range(len(columns) + 1)]
+        for char in line:
+            cells[bisect.bisect_left(columns, char[1])].append(char)
+
+        row = [join_chars(cell)[0].strip() or None for cell in cells]
+        if any(row):
+            rows.append(row)
+
+    return rows
+
+
+def find_words_positions(
+    path: str, words: list[str], max_pages: int = 1
+) -> dict[str, float] | None:
+    """
+    Procura a primeira linha do PDF que contém todas as palavras informadas e
+    retorna a posição horizontal de cada uma.
+
+    Parâmetros:
+        path (str): Caminho completo do arquivo PDF.
+        words (list[str]): Palavras que devem estar na mesma linha.
+        max_pages (int, opcional): Número de páginas pesquisadas. Padrão: 1.
+
+    Retorna:
+        dict | None: Posição x0, em pontos, de cada palavra, ou None se nenhuma
+            linha contiver todas elas.
+    """
+    for chars in load_pdf_page_chars(path, max_pages=max_pages):
+        for line in split_chars_into_lines(chars):
+            text, positions = join_chars(line)
+            indexes = [text.find(word) for word in words]
+            if all(index >= 0 for index in indexes):
+                return {word: positions[i] for word, i in zip(words, indexes)}
+    return None
+
+
+def read_pdf_text_table(
+    path: str,
+    columns: list[float],
+    names: list[str],
+    area: list[float] | None = None,
+) -> pd.DataFrame:
+    """
+    Lê uma tabela de um PDF a partir das posições dos caracteres, equivalente a
+    tabula.read_pdf(stream=True, columns=..., multiple_tables=False).
+
+    Parâmetros:
+        path (str): Caminho completo do arquivo PDF.
+        columns (list): Posições, em pontos, das fronteiras das colunas.
+        names (list): Nomes das colunas do DataFrame.
+        area (list, opcional): Região [topo, esquerda, base, direita] a ser lida.
+
+    Retorna:
+        pd.DataFrame: Tabela com as linhas de todas as páginas.
+    """
+    columns = sorted(columns)
+
+    # Monta o CSV da mesma forma que o tabula para manter a inferência de tipos
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for chars in load_pdf_page_chars(path, area):
+        for row in group_chars_into_rows(chars, columns):
+            # Descarta as colunas vazias à direita da última coluna nomeada
+            writer.writerow(
+                ["" if cell is None else cell for cell in row[: len(names)]]
+            )
+    buffer.seek(0)
+
+    return pd.read_csv(buffer, header=None, names=names)
+
+
+def read_pdf_text_lines(path: str, area: list[float] | None = None) -> list[str]:
+    """
+    Lê as linhas de texto de todas as páginas de um PDF.
+
+    Parâmetros:
+        path (str): Caminho completo do arquivo PDF.
+        area (list, opcional): Região [topo, esquerda, base, direita] a ser lida.
+
+    Retorna:
+        list[str]: Linhas de texto na ordem de leitura.
+    """
+    lines = []
+    for chars in load_pdf_page_chars(path, area):
+        lines.extend(row[0] for row in group_chars_into_rows(chars, []))
+    return lines
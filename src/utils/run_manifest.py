@@ -0,0 +1,377 @@
+"""
+Manifesto de execução dos pipelines: tempo de relógio e de CPU, linhas de
+entrada e saída, bytes lidos e gravados e pico de memória de cada etapa,
+gravados em JSON para comparar execuções (ex.: fechamentos mensais).
+
+Uso da comparação (a partir da raiz do projeto):
+    python -m src.utils.run_manifest anterior.json atual.json [--threshold 1.2]
+"""
+
+import argparse
+import os
+import re
+import socket
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.utils.config import get_config
+from src.utils.io import load_json, save_json
+from src.utils.parallel import collect_worker_usage, max_rss_bytes, process_cpu_time
+
+# Mede o pico de memória de cada etapa com tracemalloc (CACS_TRACE_MEMORY=1).
+# Desligado por padrão: torna a extração dos PDFs cerca de 4x mais lenta. Sem
+# ele, registra-se apenas o pico de memória do processo ao fim de cada etapa.
+TRACE_MEMORY = get_config("CACS_TRACE_MEMORY", "0") == "1"
+
+# Registrado no manifesto quando alguma etapa correu ao mesmo tempo que outra
+OVERLAP_NOTE = (
+    "Etapas com overlapped=true correram ao mesmo tempo que outras (threads): "
+    "a parte de cpu_time_s do processo principal, rss_growth_bytes e "
+    "max_rss_bytes são do processo inteiro e incluem o trabalho das etapas "
+    "simultâneas, e peak_memory_bytes não é medido nelas."
+)
+
+# Etapas em andamento de cada manifesto (id -> registros), para identificar as
+# que correm ao mesmo tempo (ex.: os ramos de bank_statement_branch)
+_open_stages: dict[int, list[dict]] = {}
+_open_stages_lock = threading.Lock()
+
+# Métricas comparadas por diff_run_manifests
+MANIFEST_METRICS = [
+    "wall_time_s",
+    "cpu_time_s",
+    "rows_in",
+    "rows_out",
+    "bytes_read",
+    "bytes_written",
+    "peak_memory_bytes",
+    "rss_growth_bytes",
+    "max_rss_bytes",
+    "child_max_rss_bytes",
+]
+
+# Métricas de memória de cada etapa comparadas como custo. max_rss_bytes (pico
+# do processo até o fim da etapa) só cresce ao longo da execução e fica fora
+MEMORY_COST_METRICS = ["peak_memory_bytes", "rss_growth_bytes"]
+
+
+def new_run_manifest(pipeline: str, params: dict | None = None) -> dict:
+    """
+    Cria o manifesto de uma execução.
+
+    Parâmetros:
+        pipeline (str): Nome do pipeline.
+        params (dict, opcional): Parâmetros da execução.
+
+    Retorna:
+        dict: Manifesto, com a lista de etapas vazia.
+    """
+    started_at = datetime.now()
+    return {
+        "pipeline": pipeline,
+        "params": params or {},
+        "run_id": f"{started_at:%Y%m%dT%H%M%S%f}-{os.getpid()}",
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "host": socket.gethostname(),
+        "python": sys.version.split()[0],
+        "pandas": pd.__version__,
+        "stages": [],
+    }
+
+
+def process_max_rss() -> int | None:
+    """
+    Pico de memória residente (RSS) do processo até o momento, em bytes.
+    Retorna None onde não está disponível (Windows).
+    """
+    return max_rss_bytes()
+
+
+def files_size(paths: list[str]) -> int:
+    """
+    Soma o tamanho, em bytes, dos arquivos existentes (pastas são percorridas).
+    """
+    total = 0
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+        elif os.path.isfile(path):
+            total += os.path.getsize(path)
+    return total
+
+
+def parquet_rows(path: str) -> int | None:
+    """
+    Número de linhas de um arquivo Parquet, ou de todas as partes de um
+    conjunto particionado (pasta), lido dos metadados (sem ler os dados).
+    Retorna None para outros formatos.
+    """
+    if os.path.isdir(path):
+        parts = [
+            os.path.join(root, name)
+            for root, _, files in os.walk(path)
+            for name in files
+            if name.endswith(".parquet")
+        ]
+        if not parts:
+            return None
+        return sum(pq.ParquetFile(part).metadata.num_rows for part in parts)
+    if not (path.endswith(".parquet") and os.path.isfile(path)):
+        return None
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+@contextmanager
+def manifest_stage(manifest: dict, name: str):
+    """
+    Mede uma etapa e a registra no manifesto ao final (mesmo se falhar).
+
+    O bloco recebe o registro da etapa e pode preencher "rows_in",
+    "rows_out", "files_read" e "files_written" (listas de caminhos, somados
+    em "bytes_read" e "bytes_written"). "rss_growth_bytes" é quanto a etapa
+    elevou o pico de memória residente do processo (0 se ficou abaixo do pico
+    anterior) e "max_rss_bytes", esse pico ao fim da etapa.
+
+    "cpu_time_s" inclui o trabalho feito fora do processo: nos subprocessos
+    encerrados durante a etapa (ex.: a JVM do tabula) e nas tarefas do pool
+    de processos (src.utils.parallel.map_files, com jobs > 1).
+    "child_max_rss_bytes" é o maior pico de memória desses processos (nos do
+    pool, desde o início do processo, que atende várias etapas).
+
+    Com tracemalloc ligado (record_run com trace_memory), "peak_memory_bytes"
+    é o pico de memória alocada na etapa. Como o tracemalloc é global, esse
+    pico só é medido em etapas que não correm ao mesmo tempo que outras do
+    mesmo manifesto; as simultâneas recebem "overlapped": true e o
+    manifesto, a nota OVERLAP_NOTE.
+
+    Parâmetros:
+        manifest (dict): Manifesto de new_run_manifest.
+        name (str): Nome da etapa.
+
+    Retorna:
+        Iterator[dict]: Registro da etapa.
+    """
+    stage = {"name": name, "status": "ok", "files_read": [], "files_written": []}
+    with _open_stages_lock:
+        running = _open_stages.setdefault(id(manifest), [])
+        for other in running:
+            other["overlapped"] = True
+        if running:
+            stage["overlapped"] = True
+        running.append(stage)
+        trace_memory = tracemalloc.is_tracing() and len(running) == 1
+        if trace_memory:
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+
+    rss_before = process_max_rss()
+    children_rss_before = max_rss_bytes(children=True)
+    wall_start = time.perf_counter()
+    cpu_start = process_cpu_time()
+    try:
+        with collect_worker_usage() as workers:
+            yield stage
+    except BaseException as error:
+        stage["status"] = f"erro: {type(error).__name__}: {error}"
+        raise
+    finally:
+        stage["wall_time_s"] = round(time.perf_counter() - wall_start, 4)
+        stage["cpu_time_s"] = round(
+            process_cpu_time() - cpu_start + workers["cpu_time_s"], 4
+        )
+        with _open_stages_lock:
+            running = [
+                other
+                for other in _open_stages.get(id(manifest), [])
+                if other is not stage
+            ]
+            if running:
+                _open_stages[id(manifest)] = running
+            else:
+                _open_stages.pop(id(manifest), None)
+            if trace_memory and not stage.get("overlapped"):
+                stage["peak_memory_bytes"] = (
+                    tracemalloc.get_traced_memory()[1] - memory_before
+                )
+            if stage.get("overlapped"):
+                manifest["notes"] = OVERLAP_NOTE
+        stage["max_rss_bytes"] = process_max_rss()
+        if rss_before is not None:
+            stage["rss_growth_bytes"] = stage["max_rss_bytes"] - rss_before
+        # Subprocessos encerrados na etapa elevam o pico dos subprocessos
+        child_rss = [workers["max_rss_bytes"]]
+        children_rss = max_rss_bytes(children=True)
+        if children_rss is not None and children_rss > children_rss_before:
+            child_rss.append(children_rss)
+        child_rss = [value for value in child_rss if value is not None]
+        if child_rss:
+            stage["child_max_rss_bytes"] = max(child_rss)
+        stage["bytes_read"] = files_size(stage["files_read"])
+        stage["bytes_written"] = files_size(stage["files_written"])
+        manifest["stages"].append(stage)
+
+
+def _params_slug(params: dict) -> str:
+    """
+    Parte do nome do manifesto que identifica os parâmetros da execução
+    (ex.: "_year-2025_bi-4"). Entram inteiros e textos curtos, sem caminhos.
+    """
+    parts = []
+    for key, value in params.items():
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            continue
+        value = str(value)
+        if len(value) > 20 or "/" in value or "\\" in value:
+            continue
+        parts.append(re.sub(r"[^\w.-]", "", f"{key}-{value}"))
+    return "".join(f"_{part}" for part in parts)
+
+
+def save_run_manifest(manifest: dict, folder: str) -> str:
+    """
+    Finaliza o manifesto (totais e pico de memória do processo) e o grava em
+    <folder>/<pipeline>_<parâmetros>_<data-hora com microssegundos>-<pid>.json:
+    execuções seguidas, ou em paralelo, não se sobrescrevem.
+
+    Parâmetros:
+        manifest (dict): Manifesto da execução.
+        folder (str): Pasta dos manifestos.
+
+    Retorna:
+        str: Caminho do arquivo gravado.
+    """
+    manifest["finished_at"] = datetime.now().isoformat(timespec="seconds")
+    manifest["wall_time_s"] = round(
+        sum(stage.get("wall_time_s", 0) for stage in manifest["stages"]), 4
+    )
+    manifest["cpu_time_s"] = round(
+        sum(stage.get("cpu_time_s", 0) for stage in manifest["stages"]), 4
+    )
+    manifest["process_max_rss_bytes"] = process_max_rss()
+
+    run_id = manifest.get("run_id") or manifest["started_at"].replace(":", "")
+    file_name = f"{manifest['pipeline']}{_params_slug(manifest['params'])}_{run_id}"
+    return save_json(manifest, os.path.join(folder, f"{file_name}.json"))
+
+
+@contextmanager
+def record_run(manifest: dict, folder: str, trace_memory: bool = TRACE_MEMORY):
+    """
+    Grava o manifesto ao fim da execução, inclusive se ela falhar: o
+    "status" da execução fica "ok" ou "erro: <exceção>", e as etapas já
+    medidas (com a que falhou) são mantidas.
+
+    Com trace_memory, o tracemalloc é ligado uma única vez para a execução
+    inteira (e desligado ao fim), fora das etapas: manifest_stage apenas lê
+    o pico de cada etapa.
+
+    Parâmetros:
+        manifest (dict): Manifesto de new_run_manifest.
+        folder (str): Pasta dos manifestos.
+        trace_memory (bool, opcional): Se True, mede o pico de memória alocada
+            em cada etapa com tracemalloc (mais lento).
+
+    Retorna:
+        Iterator[dict]: O próprio manifesto.
+    """
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    manifest["status"] = "ok"
+    try:
+        yield manifest
+    except BaseException as error:
+        manifest["status"] = f"erro: {type(error).__name__}: {error}"
+        raise
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        save_run_manifest(manifest, folder)
+
+
+def diff_run_manifests(
+    old: dict | str,
+    new: dict | str,
+    threshold: float = 1.2,
+    min_delta_s: float = 0.1,
+    min_delta_bytes: int = 8 * 2**20,
+) -> pd.DataFrame:
+    """
+    Compara duas execuções etapa a etapa.
+
+    Parâmetros:
+        old (dict | str): Manifesto (ou caminho) da execução de referência.
+        new (dict | str): Manifesto (ou caminho) da execução comparada.
+        threshold (float, opcional): Razão novo/anterior de tempo ou memória a
+            partir da qual a etapa é marcada como regressão. Padrão: 1.2.
+        min_delta_s (float, opcional): Aumento mínimo de tempo (s) para marcar
+            regressão, evitando ruído em etapas rápidas. Padrão: 0.1.
+        min_delta_bytes (int, opcional): Aumento mínimo de memória (bytes)
+            para marcar regressão; uma etapa que antes não elevava a memória
+            é marcada se passar a elevá-la acima deste valor. Padrão: 8 MB.
+
+    Retorna:
+        pd.DataFrame: Uma linha por (etapa, métrica) com os valores anterior e
+            novo, a diferença, a razão e a coluna "REGRESSÃO".
+    """
+    old = load_json(old) if isinstance(old, str) else old
+    new = load_json(new) if isinstance(new, str) else new
+
+    def metrics(manifest: dict) -> pd.DataFrame:
+        stages = pd.DataFrame(manifest["stages"])
+        stages = stages.drop_duplicates("name", keep="last").set_index("name")
+        return stages.reindex(columns=MANIFEST_METRICS)
+
+    old_metrics = metrics(old).stack(future_stack=True).rename("ANTERIOR")
+    new_metrics = metrics(new).stack(future_stack=True).rename("NOVO")
+
+    diff = pd.concat([old_metrics, new_metrics], axis=1)
+    diff.index.names = ["ETAPA", "MÉTRICA"]
+    diff = diff.astype("float64")
+    diff["DIFERENÇA"] = diff["NOVO"] - diff["ANTERIOR"]
+    diff["RAZÃO"] = diff["NOVO"] / diff["ANTERIOR"].where(diff["ANTERIOR"] != 0)
+
+    metric = diff.index.get_level_values("MÉTRICA")
+    is_time = metric.isin(["wall_time_s", "cpu_time_s"])
+    is_memory = metric.isin(MEMORY_COST_METRICS)
+    diff["REGRESSÃO"] = (
+        is_time & (diff["RAZÃO"] > threshold) & (diff["DIFERENÇA"] > min_delta_s)
+    ) | (
+        is_memory
+        & ((diff["RAZÃO"] > threshold) | (diff["ANTERIOR"] == 0))
+        & (diff["DIFERENÇA"] > min_delta_bytes)
+    )
+    return diff
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compara dois manifestos de execução etapa a etapa."
+    )
+    parser.add_argument("old", help="Manifesto de referência (JSON).")
+    parser.add_argument("new", help="Manifesto comparado (JSON).")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument(
+        "--all", action="store_true", help="Mostra também as métricas sem regressão."
+    )
+    args = parser.parse_args()
+
+    diff = diff_run_manifests(args.old, args.new, args.threshold)
+    shown = diff if args.all else diff.loc[diff["REGRESSÃO"]]
+    with pd.option_context(
+        "display.width", 200, "display.max_rows", None, "display.max_columns", None
+    ):
+        print(shown if not shown.empty else "Nenhuma regressão encontrada.")
+    sys.exit(1 if diff["REGRESSÃO"].any() else 0)
+
+
+if __name__ == "__main__":
+    main()